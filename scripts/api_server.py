@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+"""
+Local HTTP API over the corpus, standard library only.
+
+The corpus is loaded once and indexed in memory; every response that does
+not depend on the request body is serialized, hashed for its ETag and
+compressed once, then served from memory:
+
+    GET  /frameworks                      frameworks and their jurisdictions
+    GET  /jurisdictions/{fw}/{country}    one jurisdiction document
+    GET  /jurisdictions/{fw}/{country}/history
+                                          its change history from git
+    GET  /categories?type=&tag=           categories matching every given
+                                          indexed field, each at most once
+                                          (framework, country, type,
+                                          subtype, tag(s), risk_level, ...)
+    POST /classify                        {"columns": [...], "framework": ..,
+                                           "country": .., "top": 3 (max 10)}
+
+Responses carry strong ETags (one per content encoding) and answer
+If-None-Match with 304. Bodies are gzip- or brotli-encoded (brotli only when
+the `brotli` package is installed) according to Accept-Encoding.
+Connections are kept alive and pipelined requests are answered in order.
+
+The HTTP/1.1 handling is a small asyncio.Protocol rather than a framework:
+requests are parsed straight out of the receive buffer and answered without
+leaving the event loop. --workers forks processes that share the listening
+socket and the loaded corpus (POSIX only).
+
+Dates come from the git timeline (git_timeline.py) when the server runs in a
+git checkout: /frameworks lists when each jurisdiction last changed and was
+first added, falling back to its last_updated, and /history answers 404
+without git.
+
+Usage:
+    python scripts/openpiimap.py serve --port 8080
+    curl -s 'localhost:8080/categories?type=special_category&framework=gdpr'
+    curl -s localhost:8080/jurisdictions/gdpr/france/history
+    curl -s -X POST localhost:8080/classify -d '{"columns": ["cust_email", "dob"]}'
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import signal
+import socket
+import time
+from email.utils import formatdate
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from column_classifier import ColumnClassifier
+from corpus import Corpus
+from corpus_index import INDEXED_FIELDS, normalize_key
+from git_timeline import Timeline
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 4 * 1024 * 1024
+MAX_BATCH = 10000
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 512
+KEEP_ALIVE_TIMEOUT = 15.0
+# Distinct /categories queries and /classify scopes kept in memory
+MAX_CACHED_RESPONSES = 4096
+MAX_CLASSIFIERS = 64
+# Largest "top" a /classify request may ask for
+MAX_TOP = 10
+
+# Query parameters of /categories that are spelled differently from the
+# index fields they select
+QUERY_ALIASES = {"tag": "tags", "category_tag": "category_tags"}
+
+REASONS = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large",
+    431: "Request Header Fields Too Large", 500: "Internal Server Error",
+    501: "Not Implemented",
+}
+
+
+def _encode(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class Response:
+    """A serialized response; compressed variants are built on first use and kept."""
+
+    __slots__ = ("status", "body", "etag", "allow", "_variants")
+
+    def __init__(self, status: int, body: bytes, cacheable: bool = True, allow: Optional[str] = None):
+        self.status = status
+        self.body = body
+        self.allow = allow
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"' if cacheable else None
+        self._variants: Dict[Optional[str], Tuple[bytes, bytes]] = {}
+
+    @classmethod
+    def json(cls, data: Any, status: int = 200, cacheable: bool = True, allow: Optional[str] = None) -> "Response":
+        return cls(status, _encode(data), cacheable, allow)
+
+    def variant(self, encoding: Optional[str]) -> Tuple[bytes, bytes]:
+        """Return (header block without Connection/Date, body) for a content encoding."""
+        cached = self._variants.get(encoding)
+        if cached is not None:
+            return cached
+        body = self.body
+        if encoding == "br":
+            body = brotli.compress(body, quality=9)
+        elif encoding == "gzip":
+            body = gzip.compress(body, compresslevel=6, mtime=0)
+        lines = [
+            f"HTTP/1.1 {self.status} {REASONS[self.status]}",
+            "Server: openpiimap",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            "Vary: Accept-Encoding",
+        ]
+        if encoding:
+            lines.append(f"Content-Encoding: {encoding}")
+        if self.etag:
+            lines.append(f"ETag: {self.variant_etag(encoding)}")
+            lines.append("Cache-Control: no-cache")
+        if self.allow:
+            lines.append(f"Allow: {self.allow}")
+        head = ("\r\n".join(lines) + "\r\n").encode("latin-1")
+        self._variants[encoding] = (head, body)
+        return head, body
+
+    def variant_etag(self, encoding: Optional[str]) -> Optional[str]:
+        """Strong ETag of one encoding; each representation gets its own."""
+        if self.etag is None or not encoding:
+            return self.etag
+        return self.etag[:-1] + "-" + encoding + '"'
+
+    def not_modified(self, encoding: Optional[str]) -> bytes:
+        """Header block of the 304 answer for this response."""
+        return (
+            "HTTP/1.1 304 Not Modified\r\nServer: openpiimap\r\nVary: Accept-Encoding\r\n"
+            f"ETag: {self.variant_etag(encoding)}\r\nCache-Control: no-cache\r\n"
+        ).encode("latin-1")
+
+    def matches(self, if_none_match: str) -> bool:
+        """True if an If-None-Match header names any variant of this response."""
+        if self.etag is None:
+            return False
+        base = self.etag[1:-1]
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            tag = tag.strip('"')
+            if tag == base or tag.rsplit("-", 1)[0] == base:
+                return True
+        return False
+
+
+def error(status: int, message: str, allow: Optional[str] = None) -> Response:
+    return Response.json({"error": message}, status=status, cacheable=False, allow=allow)
+
+
+_negotiated: Dict[str, Optional[str]] = {}
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Pick br, gzip or identity from an Accept-Encoding header."""
+    if not accept_encoding:
+        return None
+    # Clients send the same few headers over and over
+    if accept_encoding in _negotiated:
+        return _negotiated[accept_encoding]
+    if len(_negotiated) >= MAX_CACHED_RESPONSES:
+        _negotiated.clear()
+    _negotiated[accept_encoding] = encoding = _negotiate(accept_encoding)
+    return encoding
+
+
+def _negotiate(accept_encoding: str) -> Optional[str]:
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    wildcard = accepted.get("*", 0.0)
+    if brotli is not None and accepted.get("br", wildcard) > 0:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+class Api:
+    """Precomputed responses and request routing for the corpus API."""
+
+    def __init__(self, corpus: Corpus, timeline: Optional[Timeline] = None):
+        self.corpus = corpus
+        self._categories: Dict[frozenset, Response] = {}
+        self._classifiers: Dict[Tuple[str, str], ColumnClassifier] = {}
+
+        jurisdictions = [j for j in corpus if j.ok and j.slug != "country-index"]
+        frameworks: Dict[str, Dict[str, Any]] = {}
+        self.jurisdictions: Dict[Tuple[str, str], Response] = {}
+        self.histories: Dict[Tuple[str, str], Response] = {}
+        for jurisdiction in jurisdictions:
+            key = f"{jurisdiction.framework_dir}/{jurisdiction.slug}"
+            freshness = (timeline.freshness(key) if timeline else None) or {}
+            last_updated = str(jurisdiction.data.get("last_updated") or "") or None
+            item = frameworks.setdefault(jurisdiction.framework_dir, {
+                "framework": jurisdiction.framework,
+                "key": jurisdiction.framework_dir,
+                "jurisdictions": [],
+            })
+            item["jurisdictions"].append({
+                "country": jurisdiction.country,
+                "key": jurisdiction.slug,
+                "categories": len(jurisdiction.categories),
+                "lastChanged": freshness.get("last_changed") or last_updated,
+                "firstAdded": freshness.get("added"),
+                "href": f"/jurisdictions/{jurisdiction.framework_dir}/{jurisdiction.slug}",
+            })
+            response = Response.json(jurisdiction.data)
+            history = None
+            if freshness:
+                record = timeline.jurisdictions[key]
+                history = Response.json({
+                    "jurisdiction": key,
+                    **freshness,
+                    "categories": record["categories"],
+                    "history": record["history"][::-1],
+                })
+            for fw in (jurisdiction.framework_dir, jurisdiction.framework):
+                for country in (jurisdiction.slug, jurisdiction.country):
+                    route = (normalize_key(fw), normalize_key(country))
+                    self.jurisdictions.setdefault(route, response)
+                    if history is not None:
+                        self.histories.setdefault(route, history)
+
+        self.frameworks = Response.json({"frameworks": sorted(frameworks.values(), key=lambda f: f["key"])})
+        # Warm the index so the first /categories request doesn't build it
+        corpus.index
+
+    def handle(self, method: str, target: str, body: bytes) -> Response:
+        """Route one request to its response."""
+        parts = urlsplit(target)
+        path = unquote(parts.path).rstrip("/") or "/"
+
+        if path == "/classify":
+            if method != "POST":
+                return error(405, "Use POST", allow="POST")
+            return self.classify(body)
+        if method not in ("GET", "HEAD"):
+            return error(405, "Use GET", allow="GET, HEAD")
+        if path == "/frameworks":
+            return self.frameworks
+        if path == "/categories":
+            return self.categories(parts.query)
+        segments = path.split("/")
+        if len(segments) == 4 and segments[1] == "jurisdictions":
+            response = self.jurisdictions.get((normalize_key(segments[2]), normalize_key(segments[3])))
+            if response is not None:
+                return response
+            return error(404, f"No jurisdiction {segments[2]}/{segments[3]}")
+        if len(segments) == 5 and segments[1] == "jurisdictions" and segments[4] == "history":
+            response = self.histories.get((normalize_key(segments[2]), normalize_key(segments[3])))
+            if response is not None:
+                return response
+            return error(404, f"No git history for {segments[2]}/{segments[3]}")
+        return error(404, f"No route for {path}")
+
+    def categories(self, query: str) -> Response:
+        criteria = {}
+        for name, value in parse_qsl(query, keep_blank_values=False):
+            field = QUERY_ALIASES.get(name, name)
+            if field not in INDEXED_FIELDS:
+                return error(400, f"Unknown filter '{name}' (use {', '.join(INDEXED_FIELDS)} or tag)")
+            if field in criteria:
+                # Filters are ANDed with one value each; don't silently drop the rest
+                return error(400, f"Filter '{name}' given more than once")
+            criteria[field] = normalize_key(value)
+        key = frozenset(criteria.items())
+        response = self._categories.get(key)
+        if response is None:
+            entries = self.corpus.query(**criteria)
+            response = Response.json({
+                "count": len(entries),
+                "categories": [entry.to_dict() for entry in entries],
+            })
+            if len(self._categories) >= MAX_CACHED_RESPONSES:
+                self._categories.clear()
+            self._categories[key] = response
+        return response
+
+    def classifier(self, framework: Optional[str], country: Optional[str]) -> ColumnClassifier:
+        key = (normalize_key(framework or ""), normalize_key(country or ""))
+        classifier = self._classifiers.get(key)
+        if classifier is None:
+            if len(self._classifiers) >= MAX_CLASSIFIERS:
+                self._classifiers.clear()
+            classifier = self._classifiers[key] = ColumnClassifier(
+                self.corpus, framework=framework, country=country, top_k=MAX_TOP)
+        return classifier
+
+    def classify(self, body: bytes) -> Response:
+        try:
+            request = json.loads(body or b"null")
+        except ValueError as e:
+            return error(400, f"Invalid JSON: {e}")
+        if not isinstance(request, dict) or not isinstance(request.get("columns"), list):
+            return error(400, 'Expected {"columns": [...]}')
+        columns = request["columns"]
+        if len(columns) > MAX_BATCH:
+            return error(413, f"At most {MAX_BATCH} columns per request")
+        if not all(isinstance(c, str) for c in columns):
+            return error(400, "Column names must be strings")
+        top = request.get("top", 3)
+        if not isinstance(top, int) or isinstance(top, bool) or not 1 <= top <= MAX_TOP:
+            return error(400, f"top must be an integer from 1 to {MAX_TOP}")
+        for name in ("framework", "country"):
+            if not isinstance(request.get(name), (str, type(None))):
+                return error(400, f"{name} must be a string or null")
+
+        classifier = self.classifier(request.get("framework"), request.get("country"))
+        results = classifier.classify_many(columns)
+        return Response.json({
+            "results": [
+                {"column": column, "matches": [m.to_dict() for m in matches[:top]]}
+                for column, matches in zip(columns, results)
+            ]
+        }, cacheable=False)
+
+
+class _Clock:
+    """HTTP Date header, formatted at most once a second."""
+
+    second = -1
+    header = b""
+
+    @classmethod
+    def date(cls) -> bytes:
+        now = int(time.time())
+        if now != cls.second:
+            cls.second = now
+            cls.header = f"Date: {formatdate(now, usegmt=True)}\r\n".encode("latin-1")
+        return cls.header
+
+
+class HttpProtocol(asyncio.Protocol):
+    """Minimal HTTP/1.1 server protocol with keep-alive and pipelining."""
+
+    def __init__(self, api: Api):
+        self.api = api
+        self.transport = None
+        self.buffer = bytearray()
+        self.closing = False
+        self.idle = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self._touch()
+
+    def connection_lost(self, exc):
+        if self.idle is not None:
+            self.idle.cancel()
+
+    def _touch(self):
+        if self.idle is not None:
+            self.idle.cancel()
+        self.idle = asyncio.get_running_loop().call_later(KEEP_ALIVE_TIMEOUT, self._close)
+
+    def _close(self):
+        self.closing = True
+        if self.transport is not None:
+            self.transport.close()
+
+    def data_received(self, data):
+        if self.closing:
+            return
+        self.buffer += data
+        self._touch()
+        while not self.closing:
+            end = self.buffer.find(b"\r\n\r\n")
+            if end == -1:
+                if len(self.buffer) > MAX_HEADER_BYTES:
+                    self._respond_error(431, "Request headers too large")
+                return
+            if end > MAX_HEADER_BYTES:
+                self._respond_error(431, "Request headers too large")
+                return
+
+            lines = self.buffer[:end].decode("latin-1").split("\r\n")
+            request_line = lines[0].split(" ")
+            if len(request_line) != 3 or not request_line[2].startswith("HTTP/1."):
+                self._respond_error(400, "Malformed request line")
+                return
+            method, target, version = request_line
+            headers = {}
+            for line in lines[1:]:
+                name, sep, value = line.partition(":")
+                if not sep:
+                    self._respond_error(400, "Malformed header")
+                    return
+                headers[name.strip().lower()] = value.strip()
+
+            if "transfer-encoding" in headers:
+                self._respond_error(501, "Chunked request bodies are not supported")
+                return
+            try:
+                length = int(headers.get("content-length", "0"))
+            except ValueError:
+                self._respond_error(400, "Invalid Content-Length")
+                return
+            if length < 0:
+                self._respond_error(400, "Invalid Content-Length")
+                return
+            if length > MAX_BODY_BYTES:
+                self._respond_error(413, "Request body too large")
+                return
+            start = end + 4
+            if len(self.buffer) < start + length:
+                return
+            body = bytes(self.buffer[start:start + length])
+            del self.buffer[:start + length]
+
+            connection = headers.get("connection", "").lower()
+            keep_alive = "close" not in connection if version == "HTTP/1.1" else "keep-alive" in connection
+            try:
+                response = self.api.handle(method, target, body)
+            except Exception as e:  # noqa: BLE001 - a bad request must not kill the server
+                response = error(500, f"{type(e).__name__}: {e}")
+            self._write(method, headers, response, keep_alive)
+            if not keep_alive:
+                self._close()
+
+    def _write(self, method: str, headers: Dict[str, str], response: Response, keep_alive: bool):
+        encoding = negotiate(headers.get("accept-encoding", "")) if len(response.body) >= MIN_COMPRESS_BYTES else None
+        connection = b"Connection: keep-alive\r\n\r\n" if keep_alive else b"Connection: close\r\n\r\n"
+        if_none_match = headers.get("if-none-match")
+        if if_none_match and method in ("GET", "HEAD") and response.matches(if_none_match):
+            self.transport.write(response.not_modified(encoding) + _Clock.date() + connection)
+            return
+        head, body = response.variant(encoding)
+        if method == "HEAD":
+            self.transport.write(head + _Clock.date() + connection)
+        else:
+            self.transport.write(head + _Clock.date() + connection + body)
+
+    def _respond_error(self, status: int, message: str):
+        self._write("GET", {}, error(status, message), keep_alive=False)
+        self._close()
+
+
+async def _serve_socket(api: Api, sock: socket.socket):
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(lambda: HttpProtocol(api), sock=sock, backlog=1024)
+    async with server:
+        await server.serve_forever()
+
+
+def _interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def _run_worker(api: Api, sock: socket.socket):
+    try:
+        asyncio.run(_serve_socket(api, sock))
+    except KeyboardInterrupt:
+        pass
+
+
+def serve(api: Api, host: str = "127.0.0.1", port: int = 8080, workers: int = 1, ready=None):
+    """
+    Serve the API until interrupted.
+
+    Args:
+        api: Api built over a loaded corpus
+        host: Interface to listen on
+        port: TCP port (0 picks a free one)
+        workers: Processes sharing the listening socket; >1 needs os.fork
+        ready: Optional callback called with the bound (host, port)
+    """
+    sock = socket.create_server((host, port), backlog=1024, reuse_port=False)
+    sock.setblocking(False)
+    if ready is not None:
+        ready(sock.getsockname()[:2])
+
+    if workers > 1 and hasattr(os, "fork"):
+        children: List[int] = []
+        for _ in range(workers - 1):
+            pid = os.fork()
+            if pid == 0:
+                _run_worker(api, sock)
+                os._exit(0)
+            children.append(pid)
+        # Let SIGTERM unwind through the finally below so workers are reaped
+        signal.signal(signal.SIGTERM, _interrupt)
+        try:
+            _run_worker(api, sock)
+        finally:
+            for pid in children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                    os.waitpid(pid, 0)
+                except OSError:
+                    pass
+    else:
+        _run_worker(api, sock)
@@ -3,47 +3,65 @@
 Audit all type values used across YAML files
 """
 
-import os
-import yaml
-from pathlib import Path
 from collections import Counter, defaultdict
 
-def audit_types():
+from corpus import DATA_DIR, load_corpus
+
+class TypeUsage:
+    """Type usage statistics accumulated one jurisdiction at a time"""
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        self.type_counter = Counter()
+        self.type_by_framework = defaultdict(lambda: Counter())
+        self.files_by_type = defaultdict(list)
+
+    def add(self, jurisdiction):
+        """Count the types used by one jurisdiction file"""
+        # Skip country-index files
+        if jurisdiction.path.name == "country-index.yaml":
+            return
+        if not jurisdiction.ok or 'categories' not in jurisdiction.data:
+            return
+
+        framework = jurisdiction.get('framework', 'Unknown')
+        rel_path = jurisdiction.path.relative_to(self.data_dir)
+
+        for category in jurisdiction.categories:
+            if 'type' in category.raw:
+                type_val = category.type
+                self.type_counter[type_val] += 1
+                self.type_by_framework[framework][type_val] += 1
+
+                if str(rel_path) not in self.files_by_type[type_val]:
+                    self.files_by_type[type_val].append(str(rel_path))
+
+    def to_dict(self):
+        return {
+            "types": dict(self.type_counter.most_common()),
+            "by_framework": {
+                framework: dict(self.type_by_framework[framework].most_common())
+                for framework in sorted(self.type_by_framework)
+            },
+            "files": {
+                type_val: sorted(self.files_by_type[type_val])
+                for type_val in sorted(self.files_by_type)
+            },
+        }
+
+def audit_types(data_dir=DATA_DIR):
     """Scan all YAML files and collect type usage statistics"""
-    data_dir = Path(__file__).parent.parent / "data"
-    
-    type_counter = Counter()
-    type_by_framework = defaultdict(lambda: Counter())
-    files_by_type = defaultdict(list)
-    
     # Scan all YAML files
-    for yaml_file in data_dir.rglob("*.yaml"):
-        # Skip country-index files
-        if yaml_file.name == "country-index.yaml":
-            continue
-            
-        try:
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-                
-            if not data or 'categories' not in data:
-                continue
-                
-            framework = data.get('framework', 'Unknown')
-            
-            for category in data.get('categories', []):
-                if 'type' in category:
-                    type_val = category['type']
-                    type_counter[type_val] += 1
-                    type_by_framework[framework][type_val] += 1
-                    
-                    rel_path = yaml_file.relative_to(data_dir)
-                    if rel_path not in files_by_type[type_val]:
-                        files_by_type[type_val].append(str(rel_path))
-                        
-        except Exception as e:
-            print(f"Error reading {yaml_file}: {e}")
+    corpus = load_corpus(data_dir)
+    usage = TypeUsage(corpus.data_dir)
+    for jurisdiction in corpus:
+        if jurisdiction.error is not None and jurisdiction.path.name != "country-index.yaml":
+            print(f"Error reading {jurisdiction.path}: {jurisdiction.error}")
             continue
+        usage.add(jurisdiction)
+    type_counter = usage.type_counter
+    type_by_framework = usage.type_by_framework
+    files_by_type = usage.files_by_type
     
     # Print results
     print("=" * 80)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Load-test the local HTTP API (openpiimap.py serve).
+
+Opens --connections keep-alive connections to the server and sends a mix of
+requests over each as fast as the answers come back, for --duration
+seconds. Reports throughput, latency percentiles and status counts.
+
+With --spawn the server is started on a free local port first and stopped
+afterwards; otherwise --url must point at a running server.
+
+Usage:
+    # Start a server, hammer it for 10 seconds, stop it
+    python scripts/bench-api.py --spawn
+
+    # Against a running server, only conditional GETs
+    python scripts/bench-api.py --url http://127.0.0.1:8080 --mix frameworks --conditional
+
+Options:
+    --url URL           Server base URL (default: http://127.0.0.1:8080)
+    --spawn             Start a server for the run (--workers N processes)
+    --connections N     Concurrent keep-alive connections (default: 32)
+    --duration S        Seconds to run (default: 10)
+    --mix NAMES         Request kinds: frameworks, jurisdiction, categories, classify
+    --conditional       Send If-None-Match with the ETag of the first answer
+    --gzip              Send Accept-Encoding: gzip
+    --json PATH         Write the results to PATH as JSON
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlsplit
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+REQUESTS = {
+    "frameworks": ("GET", "/frameworks", None),
+    "jurisdiction": ("GET", "/jurisdictions/gdpr/france", None),
+    "categories": ("GET", "/categories?type=special_category&framework=gdpr", None),
+    "classify": ("POST", "/classify", {"columns": ["cust_email", "dob", "ssn_last4", "order_total"]}),
+}
+
+
+def build_request(method, path, payload, host, gzip):
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    lines = [f"{method} {path} HTTP/1.1", f"Host: {host}"]
+    if gzip:
+        lines.append("Accept-Encoding: gzip")
+    if body:
+        lines += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+    return ("\r\n".join(lines) + "\r\n").encode("latin-1"), body
+
+
+async def read_response(reader):
+    """Read one response; returns (status, headers)."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", "0"))
+    if length and status != 304:
+        await reader.readexactly(length)
+    return status, headers
+
+
+async def client(host, port, requests, deadline, conditional, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            name, (head, body) = requests[i % len(requests)]
+            i += 1
+            extra = f"If-None-Match: {etags[name]}\r\n".encode("latin-1") if name in etags else b""
+            start = time.perf_counter()
+            writer.write(head + extra + b"\r\n" + body)
+            status, headers = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+            if conditional and "etag" in headers:
+                etags[name] = headers["etag"]
+    finally:
+        writer.close()
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+async def run(host, port, args):
+    host_header = f"{host}:{port}"
+    requests = [
+        (name, build_request(*REQUESTS[name], host_header, args.gzip))
+        for name in args.mix
+    ]
+    latencies, statuses = [], Counter()
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*[
+        client(host, port, requests[c % len(requests):] + requests[:c % len(requests)],
+               deadline, args.conditional, latencies, statuses)
+        for c in range(args.connections)
+    ])
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "connections": args.connections,
+        "mix": args.mix,
+        "conditional": args.conditional,
+        "gzip": args.gzip,
+    }
+
+
+def spawn_server(workers):
+    """Start openpiimap.py serve on a free port; returns (process, port)."""
+    process = subprocess.Popen(
+        [sys.executable, str(SCRIPTS_DIR / "openpiimap.py"), "serve", "--port", "0", "--workers", str(workers)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    line = process.stdout.readline()
+    if "http://" not in line:
+        process.kill()
+        raise RuntimeError(f"Server did not start: {line.strip()}")
+    port = int(line.split("http://", 1)[1].split()[0].rsplit(":", 1)[1])
+    return process, port
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the OpenPIIMap HTTP API")
+    parser.add_argument('--url', default='http://127.0.0.1:8080', help="Server base URL")
+    parser.add_argument('--spawn', action='store_true', help="Start a server on a free port for the run")
+    parser.add_argument('--workers', type=int, default=1, help="Server processes with --spawn")
+    parser.add_argument('--connections', type=int, default=32, help="Concurrent keep-alive connections")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds to run")
+    parser.add_argument('--mix', nargs='+', choices=list(REQUESTS), default=list(REQUESTS), help="Request kinds")
+    parser.add_argument('--conditional', action='store_true', help="Revalidate with If-None-Match")
+    parser.add_argument('--gzip', action='store_true', help="Ask for gzip-encoded responses")
+    parser.add_argument('--json', metavar='PATH', help="Write the results to PATH as JSON")
+    args = parser.parse_args()
+
+    process = None
+    if args.spawn:
+        process, port = spawn_server(args.workers)
+        host = "127.0.0.1"
+    else:
+        url = urlsplit(args.url)
+        host, port = url.hostname or "127.0.0.1", url.port or 80
+
+    print(f"📊 {args.connections} connection(s) x {args.duration:g}s against http://{host}:{port} "
+          f"({', '.join(args.mix)})")
+    try:
+        results = asyncio.run(run(host, port, args))
+    except OSError as e:
+        print(f"❌ Could not reach the server: {e}")
+        return 1
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    latency = results["latency_ms"]
+    print(f"  requests  : {results['requests']:,} in {results['seconds']:.2f}s")
+    print(f"  throughput: {results['requests_per_second']:,.0f} req/s")
+    print(f"  latency   : p50 {latency['p50']:.2f}ms  p95 {latency['p95']:.2f}ms  "
+          f"p99 {latency['p99']:.2f}ms  max {latency['max']:.2f}ms")
+    print(f"  statuses  : {', '.join(f'{k}: {v:,}' for k, v in results['statuses'].items())}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"📁 Results written to {args.json}")
+
+    errors = sum(v for k, v in results["statuses"].items() if not k.startswith(("2", "3")))
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Benchmark the data pipeline on synthetic corpora of increasing size.
+
+For each --scales value a schema-valid corpus is generated once (see
+synthetic_corpus.py) into a work directory that mirrors the repository:
+a fresh copy of scripts/, the static parts of site/ and the synthetic data/.
+The real command-line scripts then run there in subprocesses, so results
+include interpreter start-up and imports exactly as CI pays for them.
+
+Benchmarks:
+    load               parse every YAML file (no parsed-document cache)
+    validate           validate-yamls.py, cold caches
+    lint               lint-yamls.py, cold caches
+    check              openpiimap.py check (schema, lint, paths, types)
+    indexes            generate-country-indexes.py
+    build              build_static_site.py from an empty site, cold caches
+    build-stream       the same with --stream (flat memory)
+    build-incremental  build_static_site.py after editing --incremental-files files
+    classify           openpiimap.py classify over 200 column names
+
+Each benchmark runs --repeat times; the median wall time and the child's
+peak RSS are reported. Results are written as JSON, and --baseline compares
+them with an earlier results file: a benchmark whose median is more than
+--threshold slower (and at least --min-delta seconds slower) is a
+regression, and the run exits with status 1.
+
+Usage:
+    # 100 and 1,000 files, 10-50 categories each
+    python scripts/bench-suite.py --json bench-results.json
+
+    # Large corpora, fewer benchmarks
+    python scripts/bench-suite.py --scales 10000 --categories 10 500 --only load validate build
+
+    # Compare against a saved run (exit 1 on regression)
+    python scripts/bench-suite.py --baseline bench-baseline.json --threshold 0.15
+
+    # Compare two saved runs without benchmarking
+    python scripts/bench-suite.py --compare bench-baseline.json bench-results.json
+
+Options:
+    --scales N [N ...]       Corpus sizes in files (default: 100 1000)
+    --categories MIN MAX     Categories per file (default: 10 50)
+    --seed N                 Corpus seed (default: 0)
+    --only NAME [NAME ...]   Run only these benchmarks
+    --repeat N               Runs per benchmark (default: 3)
+    --incremental-files N    Files edited before build-incremental (default: 1% of the corpus, at least 1)
+    --work-dir PATH          Where corpora and builds live (default: .openpiimap-cache/bench)
+    --json PATH              Write the results to PATH
+    --baseline PATH          Compare with an earlier results file
+    --threshold F            Allowed slowdown as a fraction (default: 0.15)
+    --min-delta S            Ignore slowdowns smaller than S seconds (default: 0.05)
+    --compare OLD NEW        Only compare two results files
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic_corpus import DEFAULT_CATEGORIES, generate_corpus
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPTS_DIR.parent
+
+RESULTS_VERSION = 1
+DEFAULT_SCALES = [100, 1000]
+DEFAULT_WORK_DIR = PROJECT_ROOT / ".openpiimap-cache" / "bench"
+# Generated outputs that are not part of the site skeleton
+SITE_OUTPUTS = {"countries", "json", "sw.js", "asset-manifest.json", ".build-manifest.json", ".build-rollups.json"}
+
+LOAD_CODE = "import sys; sys.path.insert(0, 'scripts'); from corpus import load_corpus; load_corpus(use_cache=False)"
+CLASSIFY_COLUMNS = [
+    f"{prefix}{column}"
+    for prefix in ("", "cust_", "emp_", "patient_", "src_")
+    for column in ("email", "email_address", "phone", "dob", "date_of_birth", "ssn", "ssn_last4", "first_name",
+                   "last_name", "full_name", "addr_line1", "zip", "ip_addr", "device_id", "iban", "card_number",
+                   "passport_no", "tax_id", "salary", "mrn", "diagnosis_code", "religion", "lat", "lon",
+                   "order_total", "created_at", "sku", "vehicle_plate", "policy_number", "browser_history",
+                   "employee_id", "school", "fingerprint_hash", "face_img_url", "ethnicity", "party_affiliation",
+                   "conviction_date", "cookie_id", "gps_point", "updated_by")
+]
+
+BENCHMARKS = ["load", "validate", "lint", "check", "indexes", "build", "build-stream", "build-incremental", "classify"]
+
+
+class Workspace:
+    """A repository-shaped directory holding one synthetic corpus."""
+
+    def __init__(self, root: Path, files: int, categories, seed: int):
+        self.root = root
+        self.files = files
+        self.categories = tuple(categories)
+        self.seed = seed
+        self.cache_dir = root / "cache"
+        self.corpus = None
+
+    @property
+    def data_dir(self) -> Path:
+        return self.root / "data"
+
+    def prepare(self):
+        """Generate the corpus if needed and refresh scripts/ and site/ from the repository."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        marker = self.root / "corpus.json"
+        params = {"files": self.files, "categories": list(self.categories), "seed": self.seed}
+        try:
+            stored = json.loads(marker.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            stored = {}
+        if stored.get("params") != params or not self.data_dir.exists():
+            print(f"🏗️  Generating {self.files:,} synthetic file(s) in {self.data_dir}")
+            stats = generate_corpus(self.data_dir, self.files, self.categories, self.seed)
+            marker.write_text(json.dumps({"params": params, "stats": stats}, indent=2) + "\n", encoding="utf-8")
+            stored = {"stats": stats}
+        self.corpus = stored["stats"]
+
+        # The current scripts, so the numbers describe this checkout
+        shutil.rmtree(self.root / "scripts", ignore_errors=True)
+        shutil.copytree(SCRIPTS_DIR, self.root / "scripts", ignore=shutil.ignore_patterns("__pycache__"))
+        self.reset_site()
+        (self.root / "columns.txt").write_text("\n".join(CLASSIFY_COLUMNS) + "\n", encoding="utf-8")
+
+    def reset_site(self):
+        """Static pages and assets only, as in a fresh checkout without generated outputs."""
+        site = self.root / "site"
+        shutil.rmtree(site, ignore_errors=True)
+        shutil.copytree(PROJECT_ROOT / "site", site,
+                        ignore=lambda d, names: SITE_OUTPUTS & set(names) if Path(d) == PROJECT_ROOT / "site" else [])
+
+    def clear_caches(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def env(self):
+        env = dict(os.environ)
+        env["OPENPIIMAP_CACHE_DIR"] = str(self.cache_dir)
+        env.pop("OPENPIIMAP_NO_CACHE", None)
+        return env
+
+
+def run_timed(command, workspace: Workspace):
+    """Run command in the workspace; returns (seconds, peak RSS in MB or None)."""
+    with tempfile.TemporaryFile() as stderr:
+        start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=workspace.root, env=workspace.env(),
+                                   stdout=subprocess.DEVNULL, stderr=stderr)
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss is in bytes on macOS and KB elsewhere
+            rss = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+        else:
+            process.wait()
+            rss = None
+        elapsed = time.perf_counter() - start
+        if process.returncode != 0:
+            stderr.seek(0)
+            message = stderr.read().decode("utf-8", "replace").strip().splitlines()[-5:]
+            raise RuntimeError(f"{' '.join(map(str, command))} exited with {process.returncode}: " + "\n".join(message))
+    return elapsed, rss
+
+
+def python(*args):
+    return [sys.executable, *args]
+
+
+def edit_files(workspace: Workspace, count: int, run: int):
+    """Change last_updated in `count` files so the next build has real work; returns the originals."""
+    paths = sorted(workspace.data_dir.glob("*/*.yaml"))
+    step = max(1, len(paths) // count)
+    originals = {}
+    for path in paths[::step][:count]:
+        text = path.read_text(encoding="utf-8")
+        originals[path] = text
+        lines = text.splitlines(keepends=True)
+        for i, line in enumerate(lines):
+            if line.startswith("last_updated:"):
+                lines[i] = f'last_updated: "2030-01-{run % 28 + 1:02d}"\n'
+                break
+        path.write_text("".join(lines), encoding="utf-8")
+    return originals
+
+
+def run_benchmark(name, workspace: Workspace, repeat: int, incremental_files: int):
+    """Time one benchmark; returns its result entry."""
+    runs, peaks = [], []
+
+    if name == "build-incremental":
+        # Start from a complete build with warm caches
+        workspace.reset_site()
+        run_timed(python("scripts/build_static_site.py"), workspace)
+
+    for run in range(repeat):
+        originals = {}
+        if name == "load":
+            command = python("-c", LOAD_CODE)
+        elif name == "validate":
+            workspace.clear_caches()
+            command = python("scripts/validate-yamls.py")
+        elif name == "lint":
+            workspace.clear_caches()
+            command = python("scripts/lint-yamls.py")
+        elif name == "check":
+            workspace.clear_caches()
+            command = python("scripts/openpiimap.py", "check")
+        elif name == "indexes":
+            command = python("scripts/generate-country-indexes.py")
+        elif name in ("build", "build-stream"):
+            workspace.clear_caches()
+            workspace.reset_site()
+            command = python("scripts/build_static_site.py", *(["--stream"] if name == "build-stream" else []))
+        elif name == "build-incremental":
+            originals = edit_files(workspace, incremental_files, run)
+            command = python("scripts/build_static_site.py")
+        elif name == "classify":
+            command = python("scripts/openpiimap.py", "classify", "--file", "columns.txt", "--format", "json")
+        else:
+            raise ValueError(f"unknown benchmark {name}")
+
+        try:
+            elapsed, rss = run_timed(command, workspace)
+        finally:
+            for path, text in originals.items():
+                path.write_text(text, encoding="utf-8")
+        runs.append(round(elapsed, 4))
+        if rss is not None:
+            peaks.append(rss)
+
+    entry = {
+        "median_seconds": round(statistics.median(runs), 4),
+        "min_seconds": min(runs),
+        "runs": runs,
+        "peak_rss_mb": round(max(peaks), 1) if peaks else None,
+    }
+    if name == "build-incremental":
+        entry["edited_files"] = incremental_files
+    return entry
+
+
+def compare(baseline, results, threshold: float, min_delta: float):
+    """
+    Compare two results documents.
+
+    Returns:
+        List of (scale, benchmark, old seconds, new seconds, ratio, regressed)
+    """
+    rows = []
+    for scale, current in results["results"].items():
+        previous = baseline.get("results", {}).get(scale)
+        if not previous:
+            continue
+        for name, entry in current["benchmarks"].items():
+            old = previous["benchmarks"].get(name)
+            if not old:
+                continue
+            before, after = old["median_seconds"], entry["median_seconds"]
+            ratio = after / before if before else float("inf")
+            regressed = ratio > 1 + threshold and after - before > min_delta
+            rows.append((scale, name, before, after, ratio, regressed))
+    return rows
+
+
+def print_comparison(rows, threshold: float):
+    print(f"\n📊 Against baseline (threshold +{threshold:.0%})")
+    print(f"  {'files':>7}  {'benchmark':<18} {'before':>9} {'after':>9} {'change':>8}")
+    for scale, name, before, after, ratio, regressed in rows:
+        marker = "❌" if regressed else "  "
+        print(f"  {int(scale):>7,}  {name:<18} {before:>8.3f}s {after:>8.3f}s {ratio - 1:>+7.1%} {marker}")
+    regressions = sum(1 for row in rows if row[-1])
+    if regressions:
+        print(f"❌ {regressions} regression(s)")
+    else:
+        print("✅ No regressions")
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        document = json.load(f)
+    if document.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path} is not a version {RESULTS_VERSION} results file")
+    return document
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OpenPIIMap on synthetic corpora")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES, help="Corpus sizes in files")
+    parser.add_argument('--categories', type=int, nargs=2, default=list(DEFAULT_CATEGORIES),
+                        metavar=('MIN', 'MAX'), help="Categories per file")
+    parser.add_argument('--seed', type=int, default=0, help="Corpus seed")
+    parser.add_argument('--only', nargs='+', choices=BENCHMARKS, metavar='NAME', help="Run only these benchmarks")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per benchmark (median is compared)")
+    parser.add_argument('--incremental-files', type=int, help="Files edited before build-incremental")
+    parser.add_argument('--work-dir', default=str(DEFAULT_WORK_DIR), help="Where corpora and builds live")
+    parser.add_argument('--json', metavar='PATH', help="Write the results to PATH")
+    parser.add_argument('--baseline', metavar='PATH', help="Compare with an earlier results file")
+    parser.add_argument('--threshold', type=float, default=0.15, help="Allowed slowdown as a fraction")
+    parser.add_argument('--min-delta', type=float, default=0.05, help="Ignore slowdowns below this many seconds")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="Only compare two results files")
+    args = parser.parse_args()
+
+    if args.compare:
+        try:
+            baseline, results = (load_results(p) for p in args.compare)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            return 2
+        rows = compare(baseline, results, args.threshold, args.min_delta)
+        return 1 if print_comparison(rows, args.threshold) else 0
+
+    baseline = None
+    if args.baseline:
+        try:
+            baseline = load_results(args.baseline)
+        except (OSError, ValueError) as e:
+            print(f"❌ {e}")
+            return 2
+
+    selected = [name for name in BENCHMARKS if not args.only or name in args.only]
+    results = {
+        "version": RESULTS_VERSION,
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "scales": args.scales,
+            "categories": args.categories,
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+
+    for files in args.scales:
+        root = Path(args.work_dir) / f"n{files}-c{args.categories[0]}-{args.categories[1]}-s{args.seed}"
+        workspace = Workspace(root, files, args.categories, args.seed)
+        workspace.prepare()
+        incremental = args.incremental_files or max(1, files // 100)
+        corpus = workspace.corpus
+        print(f"\n📁 {corpus['files']:,} file(s), {corpus['categories']:,} categories, "
+              f"{corpus['bytes'] / 1e6:.1f} MB")
+
+        benchmarks = {}
+        for name in selected:
+            try:
+                entry = run_benchmark(name, workspace, args.repeat, incremental)
+            except RuntimeError as e:
+                print(f"  ❌ {name}: {e}")
+                return 1
+            benchmarks[name] = entry
+            rss = f"{entry['peak_rss_mb']:>7.1f} MB" if entry['peak_rss_mb'] is not None else ""
+            print(f"  ⏱️  {name:<18} {entry['median_seconds']:>8.3f}s  (min {entry['min_seconds']:.3f}s)  {rss}")
+        results["results"][str(files)] = {"corpus": corpus, "benchmarks": benchmarks}
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\n📁 Results written to {args.json}")
+
+    if baseline is not None:
+        rows = compare(baseline, results, args.threshold, args.min_delta)
+        return 1 if print_comparison(rows, args.threshold) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark YAML parse time for the data/ corpus.
+
+Reads every jurisdiction YAML into memory, replicates the set N times and
+parses it with each available loader:
+
+- stock yaml.safe_load (pure-Python SafeLoader, converts dates)
+- NoDatesSafeLoader (pure-Python, the historical validate-yamls.py loader)
+- NoDatesCSafeLoader (libyaml, what corpus.parse_yaml uses when available)
+
+Only parsing is timed; file reads happen once up front.
+
+Usage:
+    # Parse the corpus replicated 100x (default)
+    python scripts/bench-yaml-loaders.py
+
+    # Smaller run
+    python scripts/bench-yaml-loaders.py --replicate 10
+
+Options:
+    --replicate N   How many copies of the corpus to parse (default: 100)
+    --repeat N      Timed runs per loader; the best one is reported (default: 1)
+"""
+
+import argparse
+import sys
+import time
+
+import yaml
+
+from corpus import DATA_DIR, FastLoader, LIBYAML_AVAILABLE, NoDatesSafeLoader, discover, parse_yaml
+
+
+def time_loader(documents, loader, repeat):
+    """Return the best wall time in seconds to parse every document with loader."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in documents:
+            if loader is None:
+                yaml.safe_load(text)
+            else:
+                parse_yaml(text, loader)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark YAML loaders on the data/ corpus")
+    parser.add_argument('--replicate', type=int, default=100, help="Copies of the corpus to parse")
+    parser.add_argument('--repeat', type=int, default=1, help="Timed runs per loader (best is reported)")
+    args = parser.parse_args()
+
+    paths = discover(DATA_DIR)
+    texts = [p.read_text(encoding="utf-8") for p in paths]
+    documents = texts * args.replicate
+    total_bytes = sum(len(t.encode("utf-8")) for t in texts) * args.replicate
+
+    print(f"📊 {len(paths)} files x {args.replicate} = {len(documents)} documents "
+          f"({total_bytes / 1024 / 1024:.1f} MB)")
+    print()
+
+    loaders = [
+        ("yaml.safe_load (pure Python)", None),
+        ("NoDatesSafeLoader (pure Python)", NoDatesSafeLoader),
+    ]
+    if LIBYAML_AVAILABLE:
+        loaders.append(("NoDatesCSafeLoader (libyaml)", FastLoader))
+    else:
+        print("⚠️  PyYAML was built without libyaml; only pure-Python loaders are available")
+        print()
+
+    baseline = None
+    for label, loader in loaders:
+        elapsed = time_loader(documents, loader, args.repeat)
+        baseline = baseline or elapsed
+        rate = len(documents) / elapsed if elapsed else 0
+        print(f"  {label:34s} : {elapsed:8.2f}s  {rate:8.0f} files/s  {baseline / elapsed:5.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
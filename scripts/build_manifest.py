@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Persisted build manifest for incremental static site builds.
+
+The manifest records a content hash for every input of the site build
+(jurisdiction YAMLs, Jinja templates, the rendered header and the build
+script itself) together with the outputs each input produced. On the next
+run only outputs whose inputs changed are regenerated, and outputs whose
+inputs disappeared are removed.
+
+Manifest Structure:
+    {
+      "version": 1,
+      "templates": {"country_template.html": "<sha256>", ...},
+      "entries": {
+        "gdpr/germany": {
+          "fingerprint": "<sha256 of all inputs>",
+          "outputs": ["json/gdpr/germany.json", "countries/gdpr-germany.html"],
+          "summary": {...}
+        }
+      }
+    }
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from output_writer import write_if_changed
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = ".build-manifest.json"
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the hex SHA-256 digest of raw bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """Return the hex SHA-256 digest of a UTF-8 string."""
+    return hash_bytes(text.encode("utf-8"))
+
+
+def hash_file(path) -> str:
+    """Return the hex SHA-256 digest of a file's contents."""
+    with open(path, "rb") as f:
+        return hash_bytes(f.read())
+
+
+def fingerprint(*parts: Any) -> str:
+    """Combine several hashes or JSON-serializable values into one digest."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hash_text(payload)
+
+
+def hash_templates(template_dir) -> Dict[str, str]:
+    """Hash every Jinja template in a directory, keyed by file name."""
+    template_dir = Path(template_dir)
+    return {
+        p.name: hash_file(p)
+        for p in sorted(template_dir.iterdir())
+        if p.is_file() and p.suffix == ".html"
+    }
+
+
+class BuildManifest:
+    """Content-hash manifest stored next to the generated site."""
+
+    def __init__(self, site_dir, entries: Optional[Dict[str, Dict[str, Any]]] = None,
+                 templates: Optional[Dict[str, str]] = None):
+        self.site_dir = Path(site_dir)
+        self.path = self.site_dir / MANIFEST_NAME
+        self.entries = entries or {}
+        self.templates = templates or {}
+        self.seen = set()
+
+    @classmethod
+    def load(cls, site_dir) -> "BuildManifest":
+        """
+        Load the manifest from site_dir, or start empty if it is missing,
+        unreadable or written by an incompatible version.
+        """
+        path = Path(site_dir) / MANIFEST_NAME
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return cls(site_dir)
+        if raw.get("version") != MANIFEST_VERSION:
+            return cls(site_dir)
+        return cls(site_dir, raw.get("entries", {}), raw.get("templates", {}))
+
+    def is_fresh(self, key: str, digest: str) -> bool:
+        """
+        Check whether an entry was built from the same inputs and all of its
+        outputs are still on disk.
+        """
+        entry = self.entries.get(key)
+        if not entry or entry.get("fingerprint") != digest:
+            return False
+        return all((self.site_dir / out).exists() for out in entry.get("outputs", []))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for key, if any."""
+        return self.entries.get(key)
+
+    def keep(self, key: str):
+        """Mark an unchanged entry as still present in this build."""
+        self.seen.add(key)
+
+    def record(self, key: str, digest: str, outputs: Iterable[str], summary: Any = None):
+        """Store the inputs digest and produced outputs for an entry."""
+        self.entries[key] = {
+            "fingerprint": digest,
+            "outputs": sorted(outputs),
+            "summary": summary,
+        }
+        self.seen.add(key)
+
+    def prune(self, remove: Optional[Callable[[Path], None]] = None) -> List[str]:
+        """
+        Remove entries not seen during this build and delete their outputs,
+        unless another live entry still produces the same file.
+
+        Args:
+            remove: Called to delete each output (default: os.remove)
+
+        Returns:
+            Relative paths of the deleted output files
+        """
+        live_outputs = {
+            out for key in self.seen for out in self.entries.get(key, {}).get("outputs", [])
+        }
+        removed = []
+        for key in sorted(set(self.entries) - self.seen):
+            for out in self.entries[key].get("outputs", []):
+                if out in live_outputs:
+                    continue
+                out_path = self.site_dir / out
+                if out_path.exists():
+                    (remove or os.remove)(out_path)
+                    removed.append(out)
+            del self.entries[key]
+        return removed
+
+    def save(self):
+        """Write the manifest atomically, leaving it untouched when nothing changed."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "templates": self.templates,
+            "entries": {key: self.entries[key] for key in sorted(self.entries)},
+        }
+        write_if_changed(self.path, json.dumps(data, indent=2, ensure_ascii=False) + "\n")
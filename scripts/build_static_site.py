@@ -1,9 +1,30 @@
+import argparse
 import os
-import yaml
-import json
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime
-from jinja2 import Environment, FileSystemLoader
-
+from pathlib import Path
+
+import corpus
+import git_timeline
+import rollups
+import site_indexes
+import site_packaging
+from build_manifest import BuildManifest, fingerprint, hash_file, hash_templates, hash_text
+from corpus import discover, load_file, open_cache
+from git_timeline import load_timeline
+from output_writer import StagedOutput, write_if_changed
+from profiling import DEFAULT_TRACE_PATH, profiled, profiler
+from rollups import RollupStore, contribution, with_freshness
+from site_indexes import (
+    ShardSpool, build_countries, build_frameworks, build_map_data, build_site_indexes, category_rows,
+)
+from site_packaging import (
+    ASSET_MANIFEST_NAME, SERVICE_WORKER_NAME, asset_manifest, dump_json, iter_json_list, minify_html,
+    precompress_tree, remove_precompressed, render_service_worker, write_site_zip,
+)
+from templating import get_environment, render_header
 
 
 # Paths
@@ -15,6 +36,23 @@ TEMPLATE_DIR = "scripts/templates"
 INDEX_PATH = os.path.join(SITE_DIR, "index.html")
 MAP_TEMPLATE_PATH = os.path.join(TEMPLATE_DIR, "map_template.html")
 MAP_OUTPUT_PATH = os.path.join(SITE_DIR, "map.html")
+DASHBOARD_PATH = os.path.join(SITE_DIR, "dashboard.html")
+BUNDLE_DIR = os.path.join(JSON_DIR, "bundles")
+SW_TEMPLATE_PATH = os.path.join(TEMPLATE_DIR, "sw_template.js")
+DASHBOARD_DATA_PATH = os.path.join(JSON_DIR, "dashboard_data.json")
+TIMELINE_PATH = os.path.join(JSON_DIR, "timeline.json")
+
+# Latest per-jurisdiction changes listed in timeline.json
+RECENT_CHANGES = 50
+
+# Source files whose changes invalidate every generated output
+BUILDER_FILES = [
+    __file__, corpus.__file__, site_indexes.__file__, site_packaging.__file__, rollups.__file__,
+    git_timeline.__file__,
+]
+
+# Staged writer of the running build, set by build_site() and in each worker
+_output = None
 
 # Helpers
 def make_json_safe(obj):
@@ -23,81 +61,49 @@ def make_json_safe(obj):
     return obj
 
 def render_header_template(active_page="", in_country_page=False):
-    """Render header template with optional active page and country page flag"""
-    header_template = env.get_template("header_template.html")
-    return header_template.render(active_page=active_page, in_country_page=in_country_page)
-
-def calculate_dashboard_statistics(countries_data, frameworks_data):
-    """Calculate statistics for dashboard generation"""
-    from collections import defaultdict
-    
-    # Basic counts
-    countries_count = len(countries_data)
-    frameworks_count = len(frameworks_data)
-    
-    # Calculate total categories
-    total_categories = 0
-    region_counts = defaultdict(int)
-    framework_counts = defaultdict(int)
-    
-    for country in countries_data:
-        total_categories += country.get('categories', 0)
-        region_counts[country.get('region', 'Other')] += 1
-        framework_counts[country.get('framework', 'Unknown')] += 1
-    
-    # Calculate averages and insights
-    avg_categories = round(total_categories / countries_count) if countries_count > 0 else 0
-    
-    # Find most comprehensive framework
-    framework_avg_categories = {}
-    for fw_name in framework_counts.keys():
-        fw_countries = [c for c in countries_data if c.get('framework') == fw_name]
-        if fw_countries:
-            avg_cats = sum(c.get('categories', 0) for c in fw_countries) / len(fw_countries)
-            framework_avg_categories[fw_name] = round(avg_cats)
-    
-    most_comprehensive_fw = max(framework_avg_categories.keys(), 
-                                key=lambda k: framework_avg_categories[k]) if framework_avg_categories else "GDPR"
-    most_comprehensive_avg = framework_avg_categories.get(most_comprehensive_fw, 15)
-    
-    # Best covered region
-    best_region = max(region_counts.keys(), key=lambda k: region_counts[k]) if region_counts else "Europe"
-    best_region_count = region_counts.get(best_region, 0)
-    
-    
-    latest_country = "Thailand"
-    latest_framework = "PDPA Thailand"
-    latest_categories = 20
-    
+    """Render header template with optional active page and country page flag (memoized)"""
+    return render_header(active_page, in_country_page, TEMPLATE_DIR)
+
+def calculate_dashboard_statistics(dashboard_data, countries_data, frameworks_data):
+    """Template variables of the dashboard, read from the precomputed rollups"""
+    totals = dashboard_data['totals']
+    recent = dashboard_data['recent']
+    insights = dashboard_data['insights']
+    latest = recent['latest'][0] if recent['latest'] else {}
+
     return {
-        'countries_count': countries_count,
-        'frameworks_count': frameworks_count,
-        'categories_count': total_categories,
-        'regions_count': len(region_counts),
-        'avg_categories_per_country': avg_categories,
-        'countries_added_recent': 2,  
-        'frameworks_added_recent': 2,  
-        'categories_added_recent': 38, 
-        'most_comprehensive_framework': most_comprehensive_fw,
-        'most_comprehensive_avg': most_comprehensive_avg,
-        'best_covered_region': best_region,
-        'best_region_count': best_region_count,
-        'latest_country': latest_country,
-        'latest_framework': latest_framework,
-        'latest_categories': latest_categories,
-        'last_updated': datetime.now().strftime("%Y-%m-%d"),
+        'countries_count': totals['jurisdictions'],
+        'frameworks_count': totals['frameworks'],
+        'categories_count': totals['categories'],
+        'regions_count': totals['regions'],
+        'avg_categories_per_country': totals['avg_categories'],
+        'recent_days': recent['days'],
+        'countries_updated_recent': recent['jurisdictions'],
+        'frameworks_updated_recent': recent['frameworks'],
+        'categories_updated_recent': recent['categories'],
+        'most_comprehensive_framework': insights['most_comprehensive_framework'] or '',
+        'most_comprehensive_avg': insights['most_comprehensive_avg'],
+        'best_covered_region': insights['best_covered_region'] or '',
+        'best_region_count': insights['best_region_count'],
+        'latest_country': latest.get('name', ''),
+        'latest_framework': latest.get('framework', ''),
+        'latest_categories': latest.get('categories', 0),
+        'latest_updated': latest.get('last_updated', ''),
+        'last_updated': totals['last_updated'],
         'countries_data': countries_data,
         'frameworks_data': frameworks_data,
-        'regions_data': dict(region_counts)
+        'rollups': dashboard_data['rollups'],
+        'growth': dashboard_data['growth'],
     }
 
-def generate_dashboard(countries_data, frameworks_data):
+@profiler.timed("dashboard.html")
+def generate_dashboard(countries_data, frameworks_data, dashboard_data, minify=False):
     """Generate dynamic dashboard page"""
     try:
         dashboard_template = env.get_template("dashboard_template.html")
         
-        # Calculate statistics
-        stats = calculate_dashboard_statistics(countries_data, frameworks_data)
+        # Statistics come precomputed from the rollups
+        stats = calculate_dashboard_statistics(dashboard_data, countries_data, frameworks_data)
         
         # Render header
         header_html = render_header_template(active_page="dashboard")
@@ -131,9 +137,7 @@ def generate_dashboard(countries_data, frameworks_data):
         dashboard_html = dashboard_template.render(**stats)
         
         # Write dashboard file
-        dashboard_path = os.path.join(SITE_DIR, "dashboard.html")
-        with open(dashboard_path, "w", encoding="utf-8") as f:
-            f.write(dashboard_html)
+        write_html(DASHBOARD_PATH, dashboard_html, minify)
             
         print(f"✅ Generated dynamic dashboard with {stats['countries_count']} countries")
         return True
@@ -143,110 +147,71 @@ def generate_dashboard(countries_data, frameworks_data):
         print("  Keeping existing dashboard.html")
         return False
 
+def write_output(path, text):
+    """Write a generated file through the build's staged writer"""
+    with profiler.phase("write", file=site_relpath(path)):
+        if _output is not None:
+            _output.write_text(path, text)
+        else:
+            write_if_changed(path, text)
+
+def write_html(path, html, minify=False):
+    """Write a generated page, minified when requested"""
+    if minify:
+        with profiler.phase("minify", file=site_relpath(path)):
+            html = minify_html(html)
+    write_output(path, html)
+
 def ensure_dirs():
     os.makedirs(JSON_DIR, exist_ok=True)
     os.makedirs(HTML_DIR, exist_ok=True)
     os.makedirs(TEMPLATE_DIR, exist_ok=True)
 
-# Setup environment
-ensure_dirs()
-env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
-
-# --- Data Collection ---
-# Find the list of countries, frameworks, and PII categories
-countries_list = set()
-frameworks_list = set()
-pii_categories = set()
-
-for framework_dir in os.listdir(DATA_DIR):
-    framework_path = os.path.join(DATA_DIR, framework_dir)
-    if os.path.isdir(framework_path):
-        frameworks_list.add(framework_dir)
-
-        for filename in os.listdir(framework_path):
-            if filename.endswith(".yaml"):
-                country_name = filename.replace(".yaml", "")
-                countries_list.add(country_name)
-
-                # Extract PII categories from YAML
-                yaml_path = os.path.join(framework_path, filename)
-                with open(yaml_path, "r", encoding="utf-8") as f:
-                    data = yaml.safe_load(f)
-                    if data and "categories" in data:
-                        for category in data["categories"]:
-                            if "name" in category:
-                                pii_categories.add(category["name"])
-
-country_count = len(countries_list)
-framework_count = len(frameworks_list)
-pii_category_count = len(pii_categories)
-
-print(f"Total countries found: {country_count}")
-print(f"Total frameworks found: {framework_count}")
-print(f"Total PII categories found: {pii_category_count}")
-
-# --- Generate Country Pages and JSON Files ---
-country_template = env.get_template("country_template.html")
-# Track generated pages and collect data
-generated_pages = []
-countries_data = []
-frameworks_data = []
-
-for framework in os.listdir(DATA_DIR):
-    framework_path = os.path.join(DATA_DIR, framework)
-    if not os.path.isdir(framework_path):
-        continue
-
-    # Collect frameworks data
-    framework_info = {
-        'id': framework,
-        'name': framework, 
-        'abbreviation': framework, 
-        'region': 'Unknown', 
-        'countries': []
+def site_relpath(path):
+    """Path of a generated file relative to SITE_DIR, as stored in the manifest"""
+    return Path(os.path.relpath(path, SITE_DIR)).as_posix()
+
+# Setup environment (shared, with an on-disk bytecode cache)
+env = get_environment(TEMPLATE_DIR)
+
+def generate_country_page(jurisdiction, country_template, header_html, lazy_json=False, minify=False):
+    """Write the JSON and HTML outputs for one jurisdiction file.
+
+    With lazy_json the page only references site/json/<fw>/<country>.json
+    and fetches it when the Technical Data tab opens, instead of inlining
+    the pretty-printed JSON twice. With minify the JSON is written compactly,
+    inlined once and pretty-printed in the browser, and the HTML is minified.
+
+    Returns the summary kept in the build manifest for the aggregate pages,
+    and the list of files written.
+    """
+    framework = jurisdiction.framework_dir
+    base_name = jurisdiction.slug
+    data = jurisdiction.data
+    html_filename = f"{framework}-{base_name}.html"
+
+    categories = category_summary(jurisdiction)
+
+    # Collect country data for dashboard
+    country_info = {
+        'name': data.get("country", base_name),
+        'framework': data.get("framework", framework),
+        'region': data.get("region", "Other"),
+        'categories': len(categories['categories']),
+        'last_updated': data.get("last_updated", ""),
+        'file': html_filename
     }
-    frameworks_data.append(framework_info)
-
-    for filename in os.listdir(framework_path):
-        if not filename.endswith(".yaml"):
-            continue
 
-        base_name = filename.replace(".yaml", "")
-        yaml_path = os.path.join(framework_path, filename)
+    # Write JSON
+    with profiler.phase("serialize", file=jurisdiction.rel_path):
+        json_text = dump_json(data, minify, default=make_json_safe)
+    json_path = os.path.join(JSON_DIR, framework, f"{base_name}.json")
+    write_output(json_path, json_text)
 
-        with open(yaml_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-
-        # Collect country data for dashboard
-        country_info = {
-            'name': data.get("country", base_name),
-            'framework': data.get("framework", framework),
-            'region': data.get("region", "Other"),
-            'categories': len(data.get("pii_categories", [])) if data.get("pii_categories") else 0,
-            'last_updated': data.get("last_updated", ""),
-            'file': f"{framework}-{base_name}.html"
-        }
-        countries_data.append(country_info)
-
-        # Add country to the corresponding framework
-        for fw in frameworks_data:
-            if fw['id'] == framework:
-                fw['countries'].append(country_info['name'])
-                break
-
-        # Write JSON
-        json_out_dir = os.path.join(JSON_DIR, framework)
-        os.makedirs(json_out_dir, exist_ok=True)
-        json_path = os.path.join(json_out_dir, f"{base_name}.json")
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, default=make_json_safe)
-
-        # Write HTML
-        html_filename = f"{framework}-{base_name}.html"
-        html_path = os.path.join(HTML_DIR, html_filename)
-
-        header_html = render_header_template(in_country_page=True)
+    # Write HTML
+    html_path = os.path.join(HTML_DIR, html_filename)
 
+    with profiler.phase("render", file=jurisdiction.rel_path, template="country_template.html"):
         html_content = country_template.render(
             country=data.get("country", base_name),
             framework=data.get("framework", framework),
@@ -259,38 +224,56 @@ for framework in os.listdir(DATA_DIR):
             authority=data.get("authority", ""),
             notes=data.get("notes", []),
             categories=data.get("categories", []),
-            json_data=json.dumps(data, indent=2, ensure_ascii=False, default=make_json_safe),
+            json_data=None if lazy_json else json_text,
+            json_size=len(json_text),
+            json_url=f"../json/{framework}/{base_name}.json",
+            lazy_json=lazy_json,
+            compact_json=minify,
             header=header_html
         )
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+    write_html(html_path, html_content, minify)
+
+    summary = {
+        'framework_dir': framework,
+        'slug': base_name,
+        'country_info': country_info,
+        'rollup': contribution(country_info, categories['categories']),
+        **categories,
+    }
+    return summary, [site_relpath(json_path), site_relpath(html_path)]
 
-        generated_pages.append(html_filename)
+def category_summary(jurisdiction):
+    """Category names and index rows of one jurisdiction, as kept in its build summary"""
+    return {
+        'category_names': sorted({c.name for c in jurisdiction.categories if "name" in c.raw}),
+        'categories': category_rows(jurisdiction),
+    }
 
-# --- Generate Index.html ---
-if os.path.exists(INDEX_PATH):
-    homepage_template = env.get_template("index_template.html")
+@profiler.timed("index.html")
+def generate_index(country_count, framework_count, generated_pages, minify=False):
+    """Generate index.html, preserving the custom homepage when present"""
+    if os.path.exists(INDEX_PATH):
+        homepage_template = env.get_template("index_template.html")
 
-    homepage_html = homepage_template.render(
-        country_count=country_count,
-        framework_count=framework_count
-    )
+        homepage_html = homepage_template.render(
+            country_count=country_count,
+            framework_count=framework_count
+        )
 
-    with open(INDEX_PATH, "w", encoding="utf-8") as f:
-        f.write(homepage_html)
+        write_html(INDEX_PATH, homepage_html, minify)
 
-    print("✅ Preserving custom Bootstrap homepage and updating counts")
-    print(f"   Generated {len(generated_pages)} country pages")
-    print(f"   Updated JSON data files")
+        print("✅ Preserving custom Bootstrap homepage and updating counts")
+        print(f"   Generated {len(generated_pages)} country pages")
+        print(f"   Updated JSON data files")
 
-else:
-    print("⚠️  No index.html found, generating basic version")
-    html_links = ""
-    for file in sorted(generated_pages):
-        label = file.replace(".html", "").replace("-", " ").title()
-        html_links += f'    <li><a href="countries/{file}">{label}</a></li>\n'
+    else:
+        print("⚠️  No index.html found, generating basic version")
+        html_links = ""
+        for file in sorted(generated_pages):
+            label = file.replace(".html", "").replace("-", " ").title()
+            html_links += f'    <li><a href="countries/{file}">{label}</a></li>\n'
 
-    index_html = """<!DOCTYPE html>
+        index_html = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -306,29 +289,550 @@ else:
 </body>
 </html>
 """
-    with open(INDEX_PATH, "w", encoding="utf-8") as f:
-        f.write(index_html)
+        write_html(INDEX_PATH, index_html, minify)
+
+@profiler.timed("map.html")
+def generate_map(country_count, framework_count, pii_category_count, minify=False):
+    """Generate map.html with dynamic counts"""
+    if os.path.exists(MAP_TEMPLATE_PATH):
+        map_template = env.get_template("map_template.html")
+
+        map_html = map_template.render(
+            country_count=country_count,
+            framework_count=framework_count,
+            pii_category_count=pii_category_count
+        )
 
-# --- Generate map.html ---
-if os.path.exists(MAP_TEMPLATE_PATH):
-    map_template = env.get_template("map_template.html")
+        write_html(MAP_OUTPUT_PATH, map_html, minify)
 
-    map_html = map_template.render(
-        country_count=country_count,
-        framework_count=framework_count,
-        pii_category_count=pii_category_count
+        print("✅ Generated map.html with dynamic counts")
+        return True
+    else:
+        print(f"⚠️  Warning: {MAP_TEMPLATE_PATH} not found. map.html was not generated dynamically.")
+        return False
+
+@profiler.timed("json-indexes")
+def write_json_indexes(index_files, previous=None, minify=False, spool=None):
+    """Write the derived JSON indexes under JSON_DIR.
+
+    A streamed build passes its ShardSpool, which writes the category
+    shards. Files written by the previous build that are no longer produced
+    (a tag that disappeared from every category) are removed. Returns the
+    outputs relative to SITE_DIR.
+    """
+    outputs = []
+    for rel_path, document in index_files.items():
+        path = os.path.join(JSON_DIR, rel_path)
+        write_output(path, dump_json(document, minify) + "\n")
+        outputs.append(site_relpath(path))
+    if spool is not None:
+        written = spool.write(lambda rel_path: _output.open_text(os.path.join(JSON_DIR, rel_path)))
+        outputs += [site_relpath(os.path.join(JSON_DIR, rel_path)) for rel_path in written]
+
+    for out in sorted(set((previous or {}).get("outputs", [])) - set(outputs)):
+        _output.remove(os.path.join(SITE_DIR, out))
+    return outputs
+
+@profiler.timed("bundles")
+def write_framework_bundles(summaries, manifest, force=False, minify=False, builder_hash=None):
+    """Write site/json/bundles/<fw>.json with every jurisdiction of a framework.
+
+    Bundles are streamed from the per-country JSON already written, one
+    country at a time, and a bundle is only rewritten when one of its
+    countries was rebuilt. Returns the number of bundles written.
+    """
+    by_framework = {}
+    for summary in summaries:
+        by_framework.setdefault(summary['framework_dir'], []).append(summary)
+
+    written = 0
+    for framework, members in sorted(by_framework.items()):
+        key = f"bundle:{framework}"
+        member_keys = [f"{framework}/{s['slug']}" for s in members]
+        digest = fingerprint([manifest.get(k)["fingerprint"] for k in member_keys], minify, builder_hash)
+        if not force and manifest.is_fresh(key, digest):
+            manifest.keep(key)
+            continue
+
+        # Reads this build's copy when the country was just regenerated
+        jurisdictions = (
+            _output.read_text(os.path.join(JSON_DIR, framework, f"{summary['slug']}.json")) for summary in members
+        )
+        head = {'id': framework, 'framework': members[0]['country_info']['framework']}
+        bundle_path = os.path.join(BUNDLE_DIR, f"{framework}.json")
+        with profiler.phase("write", file=site_relpath(bundle_path)), _output.open_text(bundle_path) as f:
+            f.writelines(iter_json_list(jurisdictions, minify, head, 'jurisdictions'))
+            f.write("\n")
+        manifest.record(key, digest, [site_relpath(bundle_path)])
+        written += 1
+    return written
+
+@profiler.timed("service-worker")
+def generate_service_worker():
+    """Write site/sw.js and site/asset-manifest.json from the finished site.
+
+    Runs after every other output is in place. Both files are only rewritten
+    when the manifest changed, so an unchanged site keeps the same worker and
+    browsers have nothing to update.
+    """
+    if not os.path.exists(SW_TEMPLATE_PATH):
+        print(f"⚠️  Warning: {SW_TEMPLATE_PATH} not found. sw.js was not generated.")
+        return None
+
+    manifest = asset_manifest(SITE_DIR)
+    with open(SW_TEMPLATE_PATH, "r", encoding="utf-8") as f:
+        worker = render_service_worker(f.read(), manifest)
+    changed = write_if_changed(os.path.join(SITE_DIR, SERVICE_WORKER_NAME), worker)
+    changed |= write_if_changed(os.path.join(SITE_DIR, ASSET_MANIFEST_NAME), dump_json(manifest) + "\n")
+    if changed:
+        print(f"✅ Generated {SERVICE_WORKER_NAME} for asset version {manifest['version']} "
+              f"({len(manifest['assets'])} file(s))")
+    return manifest
+
+# Per-process rendering state, set up once by _init_worker
+_worker_state = {}
+
+def _init_worker(header_html, page_options, staging_dir, profile=False):
+    """Load the country template once per worker process"""
+    global _output
+    if profile and not profiler.enabled:
+        profiler.enable()
+    if _output is None:
+        # Spawned workers write into the parent build's staging directory
+        _output = StagedOutput.attach(SITE_DIR, staging_dir)
+    _worker_state['template'] = env.get_template("country_template.html")
+    _worker_state['header'] = header_html
+    _worker_state['options'] = page_options
+    # Unchanged YAMLs (e.g. after a template edit) are read from the parsed cache
+    _worker_state['cache'] = open_cache()
+
+def _render_country_page(task):
+    """Parse and render one jurisdiction file; runs inside a worker"""
+    key, yaml_path, data_dir = task
+    jurisdiction = load_file(Path(yaml_path), Path(data_dir), _worker_state['cache'])
+    if not jurisdiction.ok:
+        error = f"{jurisdiction.rel_path}: {jurisdiction.error or 'not a mapping'}"
+        return key, None, None, error, profiler.drain() if profiler.enabled else None
+    summary, outputs = generate_country_page(
+        jurisdiction, _worker_state['template'], _worker_state['header'], **_worker_state['options']
+    )
+    # Spans of this task go back to the parent's profiler
+    return key, summary, outputs, None, profiler.drain() if profiler.enabled else None
+
+def _load_category_summary(task):
+    """Parse one unchanged jurisdiction file for the indexes of a streamed build; runs inside a worker"""
+    key, yaml_path, data_dir = task
+    jurisdiction = load_file(Path(yaml_path), Path(data_dir), _worker_state['cache'])
+    if not jurisdiction.ok:
+        error = f"{jurisdiction.rel_path}: {jurisdiction.error or 'not a mapping'}"
+        return key, None, None, error, profiler.drain() if profiler.enabled else None
+    return key, category_summary(jurisdiction), None, None, profiler.drain() if profiler.enabled else None
+
+def iter_country_results(work, header_html, page_options, jobs=1):
+    """Run (function, task) pairs serially or across a process pool, yielding results in order.
+
+    At most a few tasks per worker are in flight, so results never pile up
+    in memory ahead of the consumer.
+    """
+    initargs = (header_html, page_options, str(_output.staging_dir), profiler.enabled)
+    if jobs > 1 and len(work) > 1:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as pool:
+            pending = deque()
+            for func, task in work:
+                pending.append(pool.submit(func, task))
+                if len(pending) >= jobs * 4:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    else:
+        _init_worker(*initargs)
+        for func, task in work:
+            yield func(task)
+        if _worker_state['cache'] is not None:
+            _worker_state['cache'].save()
+
+@profiler.timed("country-pages")
+def stream_country_pages(entries, tasks, manifest, header_html, page_options, jobs=1, minify=False,
+                         force=False, builder_hash=None, freshness=None):
+    """Render stale country pages and update the JSON indexes one jurisdiction at a time.
+
+    Nothing proportional to the corpus is kept in memory: each page is
+    parsed, rendered, written and dropped, its categories go to a ShardSpool
+    on disk, and only a compact summary (names, counts, output file) per
+    jurisdiction is returned for the aggregate pages. When any input
+    changed, unchanged files are read back (from the parsed cache) for
+    their index rows as well.
+
+    Returns (compact summaries, country pages rebuilt, distinct category names).
+    """
+    indexes_digest = fingerprint([digest for _, digest, _ in entries], freshness, minify, builder_hash)
+    previous = manifest.get("json-indexes")
+    rebuild_indexes = force or not manifest.is_fresh("json-indexes", indexes_digest)
+
+    stale = {task[0]: task for task in tasks}
+    work = []
+    for key, _, yaml_path in entries:
+        if key in stale:
+            work.append((_render_country_page, stale[key]))
+        elif rebuild_indexes:
+            work.append((_load_category_summary, (key, str(yaml_path), str(Path(DATA_DIR).resolve()))))
+    results = iter_country_results(work, header_html, page_options, jobs)
+
+    summaries = []
+    category_names = set()
+    rebuilt_count = 0
+    with tempfile.TemporaryDirectory(prefix="openpiimap-spool-") as spool_dir:
+        spool = ShardSpool(spool_dir, minify)
+        for key, digest, _ in entries:
+            if key not in stale and not rebuild_indexes:
+                summaries.append(manifest.get(key)["summary"])
+                continue
+            _, summary, outputs, error, recorded = next(results)
+            profiler.extend(recorded)
+            if error:
+                print(f"⚠️  Skipping {error}")
+                if key in stale:
+                    continue
+                summary = {'categories': [], 'category_names': []}
+            rows = summary.pop('categories')
+            category_names.update(summary.pop('category_names'))
+            if key in stale:
+                summary['category_count'] = len(rows)
+                manifest.record(key, digest, outputs, summary)
+                rebuilt_count += 1
+            else:
+                summary = manifest.get(key)["summary"]
+            spool.add(summary, rows)
+            summaries.append(summary)
+
+        if rebuild_indexes:
+            index_files = {
+                "countries.json": build_countries(summaries, freshness),
+                "frameworks.json": build_frameworks(summaries),
+                "map_data.json": build_map_data(summaries, len(category_names), freshness),
+            }
+            outputs = write_json_indexes(index_files, previous, minify, spool)
+            manifest.record("json-indexes", indexes_digest, outputs, {'category_count': len(category_names)})
+            print(f"✅ Generated {len(outputs)} derived JSON index file(s) in '{JSON_DIR}'")
+        else:
+            manifest.keep("json-indexes")
+            return summaries, rebuilt_count, previous["summary"]["category_count"]
+    return summaries, rebuilt_count, len(category_names)
+
+@profiler.timed("country-pages")
+def render_country_pages(tasks, header_html, page_options, jobs=1):
+    """Render country pages serially or across a process pool.
+
+    Pages are written into the staging directory of the running build.
+    Returns a dict mapping each task key to (summary, outputs, error).
+    """
+    initargs = (header_html, page_options, str(_output.staging_dir), profiler.enabled)
+    if jobs > 1 and len(tasks) > 1:
+        chunksize = max(1, len(tasks) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as pool:
+            results = list(pool.map(_render_country_page, tasks, chunksize=chunksize))
+    else:
+        _init_worker(*initargs)
+        results = [_render_country_page(task) for task in tasks]
+        if _worker_state['cache'] is not None:
+            _worker_state['cache'].save()
+    for *_, recorded in results:
+        profiler.extend(recorded)
+    return {key: (summary, outputs, error) for key, summary, outputs, error, _ in results}
+
+def generate_site(manifest, rollup_store, force=False, jobs=1, lazy_json=False, minify=False, stream=False,
+                  timeline=None):
+    """Write every page and JSON file whose inputs changed into the staged output
+
+    With stream, jurisdictions are processed one at a time and only compact
+    summaries are kept (see stream_country_pages). rollup_store is brought up
+    to date from the jurisdictions that changed. timeline (see git_timeline)
+    dates the indexes, the dashboard and timeline.json from git history;
+    without it they use each file's last_updated.
+
+    Returns the per-jurisdiction summaries and the number of country pages
+    rebuilt.
+    """
+    templates = hash_templates(TEMPLATE_DIR)
+    manifest.templates = templates
+    builder_hash = fingerprint(*[hash_file(p) for p in BUILDER_FILES])
+
+    # --- Generate Country Pages and JSON Files ---
+    country_header = render_header_template(in_country_page=True)
+    page_options = {'lazy_json': lazy_json, 'minify': minify}
+    # Streamed builds keep compact summaries, so switching modes rebuilds every page
+    page_deps = fingerprint(
+        templates.get("country_template.html"), hash_text(country_header), page_options, builder_hash, stream
     )
 
-    with open(MAP_OUTPUT_PATH, "w", encoding="utf-8") as f:
-        f.write(map_html)
+    entries = []
+    tasks = []
+    data_dir = Path(DATA_DIR).resolve()
 
-    print("✅ Generated map.html with dynamic counts")
-else:
-    print(f"⚠️  Warning: {MAP_TEMPLATE_PATH} not found. map.html was not generated dynamically.")
+    for yaml_path in discover(data_dir):
+        rel_parts = yaml_path.relative_to(data_dir).parts
+        if len(rel_parts) != 2:
+            continue
+
+        key = f"{rel_parts[0]}/{yaml_path.stem}"
+        digest = fingerprint(hash_file(yaml_path), page_deps)
+        entries.append((key, digest, yaml_path))
 
-print("✅ Static site successfully generated in 'site/'")
+        if not force and manifest.is_fresh(key, digest):
+            manifest.keep(key)
+        else:
+            # Only changed files are parsed
+            tasks.append((key, str(yaml_path), str(data_dir)))
 
+    # Git dates change without the files changing, so they are inputs of their own
+    freshness = {key: timeline.freshness(key) if timeline else None for key, _, _ in entries}
 
-generate_dashboard(countries_data, frameworks_data)
+    if stream:
+        summaries, rebuilt_count, pii_category_count = stream_country_pages(
+            entries, tasks, manifest, country_header, page_options, jobs, minify, force, builder_hash, freshness
+        )
+    else:
+        results = render_country_pages(tasks, country_header, page_options, jobs)
+
+        # Merge in discovery order so serial and parallel builds are identical
+        summaries = []
+        rebuilt_count = 0
+        for key, digest, _ in entries:
+            if key not in results:
+                summaries.append(manifest.get(key)["summary"])
+                continue
+            summary, outputs, error = results[key]
+            if error:
+                print(f"⚠️  Skipping {error}")
+                continue
+            manifest.record(key, digest, outputs, summary)
+            summaries.append(summary)
+            rebuilt_count += 1
+        pii_category_count = len({name for s in summaries for name in s['category_names']})
+
+    # --- Aggregate Data ---
+    countries_list = {s['slug'] for s in summaries}
+    frameworks_list = {s['framework_dir'] for s in summaries}
+
+    country_count = len(countries_list)
+    framework_count = len(frameworks_list)
+
+    print(f"Total countries found: {country_count}")
+    print(f"Total frameworks found: {framework_count}")
+    print(f"Total PII categories found: {pii_category_count}")
+
+    generated_pages = [s['country_info']['file'] for s in summaries]
+    countries_data = [s['country_info'] for s in summaries]
+    frameworks_data = []
+    for framework in sorted(frameworks_list):
+        frameworks_data.append({
+            'id': framework,
+            'name': framework,
+            'abbreviation': framework,
+            'region': 'Unknown',
+            'countries': [s['country_info']['name'] for s in summaries if s['framework_dir'] == framework]
+        })
+
+    # --- Generate Index.html ---
+    index_digest = fingerprint(
+        templates.get("index_template.html"), os.path.exists(INDEX_PATH),
+        country_count, framework_count, sorted(generated_pages), minify, builder_hash
+    )
+    if force or not manifest.is_fresh("index.html", index_digest):
+        generate_index(country_count, framework_count, generated_pages, minify)
+        manifest.record("index.html", index_digest, [site_relpath(INDEX_PATH)])
+    else:
+        manifest.keep("index.html")
+
+    # --- Generate map.html ---
+    map_digest = fingerprint(
+        templates.get("map_template.html"),
+        country_count, framework_count, pii_category_count, minify, builder_hash
+    )
+    if force or not manifest.is_fresh("map.html", map_digest):
+        if generate_map(country_count, framework_count, pii_category_count, minify):
+            manifest.record("map.html", map_digest, [site_relpath(MAP_OUTPUT_PATH)])
+    else:
+        manifest.keep("map.html")
+
+    # --- Generate derived JSON indexes (already written by a streamed build) ---
+    if not stream:
+        with profiler.step("site-indexes"):
+            index_files = build_site_indexes(summaries, freshness)
+        indexes_digest = fingerprint(index_files, minify, builder_hash)
+        if force or not manifest.is_fresh("json-indexes", indexes_digest):
+            outputs = write_json_indexes(index_files, manifest.get("json-indexes"), minify)
+            manifest.record("json-indexes", indexes_digest, outputs)
+            print(f"✅ Generated {len(outputs)} derived JSON index file(s) in '{JSON_DIR}'")
+        else:
+            manifest.keep("json-indexes")
+
+    # --- Generate per-framework bundles ---
+    bundles_written = write_framework_bundles(summaries, manifest, force, minify, builder_hash)
+    if bundles_written:
+        print(f"✅ Generated {bundles_written} framework bundle(s) in '{BUNDLE_DIR}'")
+
+    print("✅ Static site successfully generated in 'site/'")
+
+    # --- Update the rollups from the changed files, write dashboard_data.json ---
+    with profiler.step("rollups"):
+        by_key = {f"{s['framework_dir']}/{s['slug']}": s for s in summaries}
+        current = {key: fingerprint(digest, freshness[key]) for key, digest, _ in entries if key in by_key}
+        changes = rollup_store.sync(current, lambda key: with_freshness(by_key[key]['rollup'], freshness[key]))
+        dashboard_data = rollup_store.dashboard_document()
+    if changes['added'] or changes['updated'] or changes['removed']:
+        print(f"📊 Updated rollups: {changes['added']} added, {changes['updated']} changed, "
+              f"{changes['removed']} removed, {changes['unchanged']} unchanged")
+    dashboard_data_digest = fingerprint(dashboard_data, minify, builder_hash)
+    if force or not manifest.is_fresh("dashboard-data", dashboard_data_digest):
+        write_output(DASHBOARD_DATA_PATH, dump_json(dashboard_data, minify) + "\n")
+        manifest.record("dashboard-data", dashboard_data_digest, [site_relpath(DASHBOARD_DATA_PATH)])
+    else:
+        manifest.keep("dashboard-data")
+
+    # --- Generate timeline.json from git history ---
+    if timeline is not None:
+        timeline_data = {
+            "head": timeline.head,
+            "jurisdictions": {key: freshness[key] for key in sorted(freshness) if freshness[key]},
+            "recent": timeline.recent_changes(RECENT_CHANGES),
+        }
+        timeline_digest = fingerprint(timeline_data, minify, builder_hash)
+        if force or not manifest.is_fresh("timeline", timeline_digest):
+            write_output(TIMELINE_PATH, dump_json(timeline_data, minify) + "\n")
+            manifest.record("timeline", timeline_digest, [site_relpath(TIMELINE_PATH)])
+        else:
+            manifest.keep("timeline")
+
+    # --- Generate dashboard.html ---
+    dashboard_digest = fingerprint(
+        templates.get("dashboard_template.html"), templates.get("header_template.html"),
+        countries_data, frameworks_data, dashboard_data, minify, builder_hash
+    )
+    if force or not manifest.is_fresh("dashboard.html", dashboard_digest):
+        if generate_dashboard(countries_data, frameworks_data, dashboard_data, minify):
+            manifest.record("dashboard.html", dashboard_digest, [site_relpath(DASHBOARD_PATH)])
+    else:
+        manifest.keep("dashboard.html")
+
+    return summaries, rebuilt_count
+
+def build_site(force=False, jobs=1, lazy_json=False, minify=False, precompress=False, zip_path=None,
+               stream=False):
+    """Build the static site, regenerating only outputs whose inputs changed
+
+    Outputs are staged and only files whose bytes changed are moved into
+    site/, so unchanged files keep their mtimes and a failed build leaves the
+    previous site in place.
+
+    minify writes compact JSON and minified HTML, precompress writes .gz/.br
+    siblings for static hosting, and zip_path packs the finished site into a
+    reproducible archive. stream keeps memory flat for very large corpora.
+    """
+    global _output
+    ensure_dirs()
+    manifest = BuildManifest.load(SITE_DIR)
+    rollup_store = RollupStore.load(SITE_DIR)
+
+    timeline = load_timeline(Path(DATA_DIR).resolve())
+    if timeline is None:
+        print("⚠️  Not a git checkout, dates come from last_updated")
+    else:
+        print(f"📜 Git history of {len(timeline.jurisdictions)} jurisdiction(s) up to {timeline.head[:12]}")
+
+    with StagedOutput(SITE_DIR) as _output:
+        summaries, rebuilt_count = generate_site(
+            manifest, rollup_store, force, jobs, lazy_json, minify, stream, timeline
+        )
 
-print("✅ Static site successfully generated in 'site/'")
\ No newline at end of file
+        # Outputs of deleted inputs
+        removed = manifest.prune(remove=_output.remove)
+        for out in removed:
+            print(f"🗑️  Removed stale output: {out}")
+        with profiler.step("commit"):
+            stats = _output.commit()
+    _output = None
+    manifest.save()
+    rollup_store.save()
+
+    print(f"📁 Wrote {stats['written']} changed file(s), {stats['unchanged']} regenerated file(s) were identical")
+
+    print(f"♻️  Rebuilt {rebuilt_count} of {len(summaries)} country pages, removed {len(removed)} stale file(s)")
+
+    # --- Service worker, over the final set of files ---
+    generate_service_worker()
+
+    # --- Precompressed siblings for static hosting ---
+    if precompress:
+        with profiler.step("precompress"):
+            written, kept, dropped = precompress_tree(SITE_DIR)
+        encodings = "gzip + brotli" if site_packaging.brotli is not None else "gzip (install brotli for .br)"
+        print(f"🗜️  Precompressed {written} file(s) with {encodings}, {kept} unchanged, {dropped} stale removed")
+    else:
+        # Siblings left by an earlier --precompress build would be stale
+        dropped = remove_precompressed(SITE_DIR)
+        if dropped:
+            print(f"🗑️  Removed {dropped} precompressed file(s) from an earlier build")
+
+    if zip_path:
+        with profiler.step("zip"):
+            count = write_site_zip(SITE_DIR, zip_path)
+        print(f"📦 Packed {count} file(s) into {zip_path}")
+
+    print("✅ Static site successfully generated in 'site/'")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the OpenPIIMap static site from data/")
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help="Rebuild every output, ignoring the build manifest"
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help="Render country pages across N worker processes (0 = one per CPU)"
+    )
+    parser.add_argument(
+        '--lazy-json',
+        action='store_true',
+        help="Reference site/json/ from country pages instead of inlining the JSON"
+    )
+    parser.add_argument(
+        '--minify',
+        action='store_true',
+        help="Write compact JSON and minified HTML"
+    )
+    parser.add_argument(
+        '--precompress',
+        action='store_true',
+        help="Write .gz (and .br, with the brotli package) next to every text file"
+    )
+    parser.add_argument(
+        '--zip',
+        nargs='?',
+        const='site.zip',
+        metavar='PATH',
+        help="Pack the built site into a reproducible zip (default: site.zip)"
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help="Process one jurisdiction at a time with flat memory, for very large corpora"
+    )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const=DEFAULT_TRACE_PATH,
+        metavar='PATH',
+        help=f"Print per-phase timings and peak RSS, and write a Chrome trace (default: {DEFAULT_TRACE_PATH})"
+    )
+    args = parser.parse_args(argv)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    with profiled(args.profile):
+        build_site(force=args.force, jobs=jobs, lazy_json=args.lazy_json,
+                   minify=args.minify, precompress=args.precompress, zip_path=args.zip, stream=args.stream)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Single-pass corpus checks for `openpiimap check`.
+
+The corpus is loaded once and every jurisdiction is handed to each selected
+pass in turn, so schema validation, lint, country-index path checks and the
+type audit share one traversal and one set of parsed documents. Each pass
+reports Finding objects; run_checks() gathers them into one JSON-friendly
+report.
+
+Passes:
+    schema  - JSON schema validation (validate-yamls.py)
+    lint    - field order, tags and citation lint (lint-yamls.py)
+    paths   - country-index.json path references (validate-paths.py)
+    types   - type usage statistics (audit-types.py)
+
+Adding a pass means subclassing CheckPass and registering it in PASSES.
+
+Report Structure:
+    {
+      "files": 412,
+      "passes": ["schema", "lint", "paths", "types"],
+      "summary": {"errors": 1, "warnings": 158, "by_check": {...}},
+      "findings": [
+        {"check": "lint", "severity": "warning", "path": "data/gdpr/germany.yaml",
+         "location": "category 3", "message": "missing or empty tags"}
+      ],
+      "stats": {"types": {...}}
+    }
+"""
+
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from corpus import Corpus, Jurisdiction
+from profiling import profiler
+from script_loader import load_script
+
+SEVERITY_MARKERS = {"warning": "⚠️", "error": "❌"}
+
+
+@dataclass
+class Finding:
+    """One problem reported by a check pass."""
+
+    check: str
+    severity: str
+    path: str
+    message: str
+    location: Optional[str] = None
+
+
+class CheckPass:
+    """
+    Base class for check passes.
+
+    start() is called before the traversal, check_jurisdiction() once per
+    corpus file and finish() once after the whole corpus has been seen.
+    Passes that gather statistics rather than findings return them from
+    stats().
+    """
+
+    name = ""
+    description = ""
+
+    def start(self, corpus: Corpus):
+        pass
+
+    def check_jurisdiction(self, jurisdiction: Jurisdiction) -> List[Finding]:
+        return []
+
+    def finish(self, corpus: Corpus) -> List[Finding]:
+        return []
+
+    def stats(self) -> Optional[Dict[str, Any]]:
+        return None
+
+
+class SchemaPass(CheckPass):
+    name = "schema"
+    description = "JSON schema validation"
+
+    def __init__(self):
+        self.validate = load_script('validate-yamls').validate_jurisdiction
+
+    def check_jurisdiction(self, jurisdiction):
+        _, errors = self.validate(jurisdiction)
+        return [
+            Finding(self.name, "error", jurisdiction.rel_path, error["message"], error["path"] or None)
+            for error in errors
+        ]
+
+
+class LintPass(CheckPass):
+    name = "lint"
+    description = "Field order, tag and citation lint"
+
+    def __init__(self):
+        self.lint = load_script('lint-yamls')
+
+    def check_jurisdiction(self, jurisdiction):
+        return [
+            Finding(self.name, severity, jurisdiction.rel_path, message, location)
+            for location, severity, message in self.lint.find_lint_issues(jurisdiction.data)
+        ]
+
+
+class PathsPass(CheckPass):
+    name = "paths"
+    description = "Country index path references"
+
+    def finish(self, corpus):
+        validate_paths = load_script('validate-paths')
+        findings = []
+        for framework_dir, path, issue in validate_paths.validate_country_index_paths(corpus.data_dir):
+            index_path = f"data/{framework_dir}/country-index.json"
+            findings.append(Finding(self.name, "error", index_path, issue, path))
+        return findings
+
+
+class TypesPass(CheckPass):
+    name = "types"
+    description = "Type usage audit"
+
+    def start(self, corpus):
+        self.usage = load_script('audit-types').TypeUsage(corpus.data_dir)
+
+    def check_jurisdiction(self, jurisdiction):
+        self.usage.add(jurisdiction)
+        return []
+
+    def stats(self):
+        return self.usage.to_dict()
+
+
+PASSES = {
+    SchemaPass.name: SchemaPass,
+    LintPass.name: LintPass,
+    PathsPass.name: PathsPass,
+    TypesPass.name: TypesPass,
+}
+
+
+def run_checks(corpus: Corpus, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Run the selected passes over the corpus in a single traversal.
+
+    Files that fail to parse are reported once under the "parse" check and
+    not handed to any pass.
+
+    Args:
+        corpus: Loaded corpus to check
+        names: Pass names to run, in PASSES order; defaults to all of them
+
+    Returns:
+        Report dictionary (see module docstring)
+    """
+    selected = [name for name in PASSES if names is None or name in names]
+    passes = [PASSES[name]() for name in selected]
+    findings: List[Finding] = []
+
+    for check in passes:
+        check.start(corpus)
+
+    for jurisdiction in corpus:
+        if jurisdiction.error is not None:
+            findings.append(Finding("parse", "error", jurisdiction.rel_path, jurisdiction.error))
+            continue
+        if not jurisdiction.ok:
+            findings.append(Finding("parse", "error", jurisdiction.rel_path, "Document is not a mapping"))
+            continue
+        with profiler.phase("validate", file=jurisdiction.rel_path):
+            for check in passes:
+                findings.extend(check.check_jurisdiction(jurisdiction))
+
+    for check in passes:
+        with profiler.step(f"finish:{check.name}"):
+            findings.extend(check.finish(corpus))
+
+    severities = Counter(f.severity for f in findings)
+    by_check = {
+        name: dict(Counter(f.severity for f in findings if f.check == name))
+        for name in ["parse"] + selected
+    }
+    stats = {}
+    for check in passes:
+        pass_stats = check.stats()
+        if pass_stats is not None:
+            stats[check.name] = pass_stats
+
+    return {
+        "files": len(corpus),
+        "passes": selected,
+        "summary": {
+            "errors": severities.get("error", 0),
+            "warnings": severities.get("warning", 0),
+            "by_check": by_check,
+        },
+        "findings": [asdict(f) for f in findings],
+        "stats": stats,
+    }
+
+
+def print_summary(report: Dict[str, Any], verbose: bool = False):
+    """Print a human-readable summary of a check report."""
+    summary = report["summary"]
+    print(f"🔍 Checked {report['files']} file(s) with {', '.join(report['passes'])}")
+    print()
+
+    for name, counts in summary["by_check"].items():
+        errors = counts.get("error", 0)
+        warnings = counts.get("warning", 0)
+        if name == "parse" and not errors:
+            continue
+        marker = "❌" if errors else ("⚠️" if warnings else "✅")
+        print(f"  {marker} {name:8s} : {errors:4d} error(s) {warnings:4d} warning(s)")
+
+    findings = report["findings"]
+    if not verbose:
+        findings = [f for f in findings if f["severity"] == "error"]
+    if findings:
+        print()
+        for f in findings:
+            where = f"{f['path']} - {f['location']}" if f["location"] else f["path"]
+            print(f"{SEVERITY_MARKERS[f['severity']]} [{f['check']}] {where}: {f['message']}")
+
+    print()
+    if summary["errors"]:
+        print(f"❌ {summary['errors']} error(s), {summary['warnings']} warning(s)")
+    else:
+        print(f"✅ No errors, {summary['warnings']} warning(s)")
@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Classify warehouse column names against the PII categories in data/.
+
+Every category name, its subtype and a table of synonyms/abbreviations are
+compiled into an inverted index from normalized tokens to category
+"concepts". Categories whose names normalize to the same tokens across
+jurisdictions (e.g. "Phone Number" and "Telephone Numbers") share one
+concept, which carries the jurisdiction-specific type, required_masking and
+risk_level of each definition.
+
+Column names are normalized the same way:
+
+    cust_email   -> email              (qualifiers like customer/user are dropped)
+    dob          -> date birth
+    ssnLast4     -> social security number last
+    first_name   -> full name          (two-word abbreviations are looked up joined)
+    emailaddress -> email address      (split using the index vocabulary)
+
+Scoring favours concepts that explain most of the column's known tokens
+and whose own name is mostly covered by the column, weighted by how rare
+each token is in the corpus. A concept only matches when the column covers
+one of its distinctive name tokens or synonyms. Generic heads such as id,
+number, status, code or type name half the corpus, and a noun that ends
+the names of unrelated concepts in the selected index ("address" in Email
+Address and IP Address) is generic too, so customer_id, order_number,
+status or home_address alone don't match those concepts. A concept whose
+name is all generic (Address) needs every word of it.
+
+Per-concept weight vectors are built once with the index, and the work per
+column is memoized at three levels (each bounded by MAX_CACHED_COLUMNS):
+the tokens of each name chunk (cust, emailAddress, ssnLast4), the matches
+of each token set (cust_email_2 and user_email score once), and the
+matches of each column name. Unseen names made of known chunks therefore
+cost a split and a few dict lookups, and repeated names a single lookup.
+
+Usage:
+    from corpus import load_corpus
+    from column_classifier import ColumnClassifier
+
+    classifier = ColumnClassifier(load_corpus(), framework="GDPR")
+    for match in classifier.classify("cust_email"):
+        print(match.name, match.score, match.type, match.required_masking)
+
+    results = classifier.classify_many(["dob", "ssn_last4", "order_total"])
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from corpus import parse_yaml
+
+# Words that carry no meaning for classification
+STOPWORDS = {
+    "a", "an", "and", "or", "of", "the", "for", "by", "in", "to", "on", "at",
+    "e", "g", "eg", "ie", "when", "with", "except", "than", "any", "other",
+    "all", "data", "information", "info", "details", "held", "under",
+}
+
+# Single-token spellings folded together on both the corpus and column side
+TOKEN_ALIASES = {
+    "telephone": "phone", "tel": "phone", "cell": "phone", "mobile": "phone",
+    "licence": "license", "driving": "driver",
+    "ethnicity": "ethnic", "racial": "race",
+    "religious": "religion", "belief": "religion",
+    "mail": "email",
+    "id": "identifier", "ident": "identifier", "identification": "identifier", "identity": "identifier",
+    "num": "number", "no": "number", "nbr": "number", "nr": "number",
+    "addr": "address", "acct": "account", "cust": "customer", "emp": "employee",
+    "geolocation": "location", "geo": "location", "gps": "location",
+    "lat": "location", "latitude": "location", "lng": "location", "lon": "location", "longitude": "location",
+    "medical": "health", "diagnosis": "health", "diagnose": "health",
+    "salary": "payroll", "wage": "payroll",
+    "photo": "image", "picture": "image",
+}
+
+# Column-side abbreviations and compounds expanded into several words.
+# Extra entries can be passed to ColumnClassifier(synonyms=...).
+DEFAULT_SYNONYMS = {
+    "dob": "date of birth",
+    "birthdate": "date of birth",
+    "birthday": "date of birth",
+    "ssn": "social security number",
+    "sin": "social insurance number",
+    "nino": "national insurance number",
+    "ipaddr": "ip address",
+    "ipv4": "ip address",
+    "ipv6": "ip address",
+    "dl": "driver license number",
+    "cc": "credit card",
+    "ccn": "credit card number",
+    "pan": "credit card number",
+    "mrn": "medical record number",
+    "fname": "full name",
+    "lname": "full name",
+    "firstname": "full name",
+    "lastname": "full name",
+    "givenname": "full name",
+    "middlename": "full name",
+    "familyname": "full name",
+    "surname": "full name",
+    "fullname": "full name",
+    "zip": "postal address",
+    "zipcode": "postal address",
+    "postcode": "postal address",
+    "street": "address",
+    "iban": "bank account number",
+    "msisdn": "phone number",
+    "imei": "device identifier",
+    "udid": "device identifier",
+    "idfa": "device identifier",
+    "cookie": "cookie identifier",
+}
+
+# Column-side qualifiers that say whose value it is, or how it is stored,
+# rather than what it is (cust_email, hashed_ssn)
+COLUMN_QUALIFIERS = {
+    "customer", "user", "client", "member", "primary", "secondary", "current",
+    "previous", "prev", "hashed", "hash", "masked", "encrypted", "enc", "raw",
+    "normalized", "norm", "is", "has",
+}
+
+# Heads shared by unrelated concepts ("National ID", "Account Numbers",
+# "Marital Status"); a column made of these alone says nothing about PII.
+# Nouns shared the same way within an index are added per classifier.
+GENERIC_WORDS = ("id", "identifier", "number", "status", "code", "type")
+
+# Entries per memo (column names, name chunks, token sets) of a classifier
+MAX_CACHED_COLUMNS = 65536
+
+# Relative weight of the places a concept token can come from
+HEAD_WEIGHT = 1.0
+SYNONYM_WEIGHT = 1.0
+DETAIL_WEIGHT = 0.5
+SUBTYPE_WEIGHT = 0.3
+
+RISK_ORDER = {None: 0, "low": 1, "medium": 2, "high": 3, "critical": 4}
+
+_SPLIT_RE = re.compile(r"[\W_]+")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+_PAREN_RE = re.compile(r"\(([^)]*)\)")
+# Longest vocabulary word tried when splitting run-together tokens
+_MAX_SEGMENT = 16
+
+
+def stem(token: str) -> str:
+    """Fold simple English plurals: addresses -> address, identifiers -> identifier."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 4 and token.endswith("sses"):
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def split_words(text: str) -> List[str]:
+    """Split snake_case, kebab-case, camelCase and free text into lowercase words."""
+    words = []
+    for chunk in _SPLIT_RE.split(text):
+        if not chunk:
+            continue
+        if chunk.isascii():
+            words.extend(part.lower() for part in _CAMEL_RE.findall(chunk))
+        else:
+            words.append(chunk.casefold())
+    return words
+
+
+def normalize_words(words: Iterable[str]) -> List[str]:
+    """Stem, alias and drop stopwords and bare digits."""
+    tokens = []
+    for word in words:
+        if word.isdigit() or word in STOPWORDS:
+            continue
+        word = stem(word)
+        tokens.append(TOKEN_ALIASES.get(word, word))
+    return tokens
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized tokens for a category name or free text."""
+    return normalize_words(split_words(text))
+
+
+@dataclass
+class Definition:
+    """One jurisdiction's definition of a concept."""
+
+    country: str
+    framework: str
+    name: str
+    type: str
+    subtype: Optional[str]
+    required_masking: bool
+    risk_level: Optional[str]
+
+
+@dataclass
+class Concept:
+    """Categories from any number of jurisdictions that share a normalized name."""
+
+    name: str
+    head: Tuple[str, ...]
+    weights: Dict[str, float] = field(default_factory=dict)
+    definitions: List[Definition] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class Match:
+    """A ranked classification of one column name."""
+
+    name: str
+    score: float
+    type: str
+    subtype: Optional[str]
+    required_masking: bool
+    risk_level: Optional[str]
+    definitions: Tuple[Definition, ...]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "score": self.score,
+            "type": self.type,
+            "subtype": self.subtype,
+            "required_masking": self.required_masking,
+            "risk_level": self.risk_level,
+            # The fields above summarize; each jurisdiction's own definition may differ
+            "jurisdictions": [asdict(d) for d in self.definitions],
+        }
+
+
+def load_synonyms(path) -> Dict[str, str]:
+    """Read extra `abbreviation: expansion` pairs from a YAML mapping."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = parse_yaml(f) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a mapping of abbreviation to expansion")
+    return {str(k).lower(): str(v) for k, v in data.items()}
+
+
+class ColumnClassifier:
+    """Inverted index from normalized tokens to PII concepts."""
+
+    def __init__(self, corpus, framework: Optional[str] = None, country: Optional[str] = None,
+                 synonyms: Optional[Dict[str, str]] = None, top_k: int = 3, min_score: float = 0.35):
+        """
+        Args:
+            corpus: Loaded Corpus
+            framework: Only use categories from this framework (case-insensitive)
+            country: Only use categories from this country (case-insensitive)
+            synonyms: Extra column-side abbreviations, e.g. {"msisdn": "phone number"}
+            top_k: Matches returned per column
+            min_score: Matches scoring below this (0..1) are dropped
+        """
+        self.top_k = top_k
+        self.min_score = min_score
+        self.synonyms = {k: tokenize(v) for k, v in {**DEFAULT_SYNONYMS, **(synonyms or {})}.items()}
+        self._cache: Dict[str, Tuple[Match, ...]] = {}
+        self._scored: Dict[frozenset, Tuple[Match, ...]] = {}
+        self._chunks: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {}
+        self._matches: Dict[Tuple[int, float], Match] = {}
+
+        entries = corpus.query(**{k: v for k, v in (("framework", framework), ("country", country)) if v})
+        self.concepts = self._build_concepts(entries)
+        self._build_index()
+
+    def _build_concepts(self, entries) -> List[Concept]:
+        concepts: Dict[Tuple[str, ...], Concept] = {}
+        labels: Dict[Tuple[str, ...], Counter] = defaultdict(Counter)
+        for entry in entries:
+            category = entry.category
+            if not category.name:
+                continue
+            head_text = _PAREN_RE.sub(" ", category.name)
+            head = tuple(dict.fromkeys(tokenize(head_text)))
+            if not head:
+                continue
+            key = tuple(sorted(head))
+            concept = concepts.get(key)
+            if concept is None:
+                concept = concepts[key] = Concept(name="", head=head)
+                for token in head:
+                    concept.weights[token] = HEAD_WEIGHT
+            labels[key][head_text.strip()] += 1
+
+            details = " ".join(_PAREN_RE.findall(category.name))
+            for token in tokenize(details):
+                concept.weights.setdefault(token, DETAIL_WEIGHT)
+            for token in tokenize(category.subtype or ""):
+                concept.weights.setdefault(token, SUBTYPE_WEIGHT)
+
+            concept.definitions.append(Definition(
+                country=entry.jurisdiction.country,
+                framework=entry.jurisdiction.framework,
+                name=category.name,
+                type=category.type,
+                subtype=category.subtype,
+                required_masking=category.required_masking,
+                risk_level=category.risk_level,
+            ))
+
+        for key, concept in concepts.items():
+            concept.name = labels[key].most_common(1)[0][0]
+            # A synonym whose expansion is exactly this concept's name also
+            # names the concept (e.g. "dob" for Date of Birth)
+            for abbreviation, expansion in self.synonyms.items():
+                if expansion and tuple(sorted(set(expansion))) == key:
+                    concept.weights.setdefault(abbreviation, SYNONYM_WEIGHT)
+        return sorted(concepts.values(), key=lambda c: (-len(c.definitions), c.name))
+
+    def _build_index(self):
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for concept_id, concept in enumerate(self.concepts):
+            for token in concept.weights:
+                postings[token].append(concept_id)
+        total = max(len(self.concepts), 1)
+        self.idf = {token: math.log(1 + total / len(ids)) for token, ids in postings.items()}
+        generic = set(tokenize(" ".join(GENERIC_WORDS)))
+        # A noun that ends the names of concepts with unrelated modifiers
+        # (Email Address, IP Address) is as generic as the fixed words
+        modifiers: Dict[str, List[frozenset]] = defaultdict(list)
+        for concept in self.concepts:
+            specific = [t for t in concept.head if t not in generic]
+            if len(specific) > 1:
+                modifiers[specific[-1]].append(frozenset(specific[:-1]))
+        generic.update(
+            noun for noun, sets in modifiers.items()
+            if any(a.isdisjoint(b) for i, a in enumerate(sets) for b in sets[i + 1:])
+        )
+        # A column must cover one distinctive token (a specific name token or
+        # a synonym), or all required tokens when the name is all generic
+        self.distinctive: List[frozenset] = []
+        self.required: List[frozenset] = []
+        for concept in self.concepts:
+            specific = {t for t in concept.head if t not in generic}
+            synonyms = {t for t, w in concept.weights.items() if w == HEAD_WEIGHT and t not in concept.head}
+            self.distinctive.append(frozenset(specific | synonyms))
+            self.required.append(frozenset() if specific else frozenset(concept.head))
+        self.postings = {token: tuple(ids) for token, ids in postings.items()}
+        self.head_idf = [sum(self.idf[t] for t in concept.head) for concept in self.concepts]
+        # Per concept: idf-weighted token vector and the idf of its head-weight tokens
+        self.vectors = [
+            {t: self.idf[t] * w for t, w in concept.weights.items()} for concept in self.concepts
+        ]
+        self.head_vectors = [
+            {t: self.idf[t] for t, w in concept.weights.items() if w == HEAD_WEIGHT} for concept in self.concepts
+        ]
+        # Only concepts whose distinctive or required tokens the column has are scored
+        candidates: Dict[str, List[int]] = defaultdict(list)
+        for concept_id, tokens in enumerate(self.distinctive):
+            for token in tokens | self.required[concept_id]:
+                candidates[token].append(concept_id)
+        self.candidates = {token: tuple(ids) for token, ids in candidates.items()}
+        self.vocabulary = set(self.postings) | set(self.synonyms) | set(TOKEN_ALIASES)
+        self._summaries = [self._summarize(concept) for concept in self.concepts]
+
+    @staticmethod
+    def _summarize(concept: Concept) -> Tuple[str, Optional[str], bool, Optional[str]]:
+        """Most common type/subtype, any-masking and highest risk across definitions."""
+        definitions = concept.definitions
+        type_ = Counter(d.type for d in definitions).most_common(1)[0][0]
+        subtypes = Counter(d.subtype for d in definitions if d.subtype)
+        subtype = subtypes.most_common(1)[0][0] if subtypes else None
+        masking = any(d.required_masking for d in definitions)
+        risk = max((d.risk_level for d in definitions), key=lambda r: RISK_ORDER.get(r, 0))
+        return type_, subtype, masking, risk
+
+    def _segment(self, word: str) -> List[str]:
+        """Split a run-together word (emailaddress) into vocabulary words, if possible."""
+        if word in self.vocabulary or len(word) < 6:
+            return [word]
+        # best[i] = fewest vocabulary words covering word[:i]
+        best: List[Optional[List[str]]] = [None] * (len(word) + 1)
+        best[0] = []
+        for end in range(1, len(word) + 1):
+            for start in range(max(0, end - _MAX_SEGMENT), end):
+                piece = word[start:end]
+                if best[start] is not None and len(piece) > 1 and stem(piece) in self.vocabulary:
+                    candidate = best[start] + [piece]
+                    if best[end] is None or len(candidate) < len(best[end]):
+                        best[end] = candidate
+        return best[-1] or [word]
+
+    def _chunk(self, chunk: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Memoized words and tokens of one name chunk (ssnLast4, emailaddress)."""
+        cached = self._chunks.get(chunk)
+        if cached is None:
+            if chunk.isdigit():
+                # Sequence suffixes (email_2, order_20240101) carry no tokens
+                return (chunk,), ()
+            words = tuple(segment for word in split_words(chunk) for segment in self._segment(word))
+            if len(self._chunks) >= MAX_CACHED_COLUMNS:
+                self._chunks.clear()
+            cached = self._chunks[chunk] = (words, tuple(self._word_tokens(words)))
+        return cached
+
+    def _segment_tokens(self, word: str) -> Tuple[str, ...]:
+        expansion = self.synonyms.get(word)
+        if expansion is not None:
+            return (*expansion, word)
+        if TOKEN_ALIASES.get(word, word) in COLUMN_QUALIFIERS:
+            return ()
+        return tuple(normalize_words([word]))
+
+    def _word_tokens(self, words: Sequence[str]) -> List[str]:
+        """Tokens of consecutive words, looking two-word abbreviations up joined."""
+        tokens = []
+        i = 0
+        while i < len(words):
+            joined = words[i] + words[i + 1] if i + 1 < len(words) else None
+            if joined in self.synonyms:
+                tokens.extend(self._segment_tokens(joined))
+                i += 2
+            else:
+                tokens.extend(self._segment_tokens(words[i]))
+                i += 1
+        return tokens
+
+    def _tokens(self, column: str) -> Sequence[str]:
+        """Tokens of a column name, possibly repeated."""
+        cache = self._chunks
+        synonyms = self.synonyms
+        tokens = []
+        previous = None
+        for chunk in _SPLIT_RE.split(column):
+            if not chunk:
+                continue
+            words, chunk_tokens = cache.get(chunk) or self._chunk(chunk)
+            if previous is not None and previous + words[0] in synonyms:
+                # An abbreviation spans two chunks (first_name): join word by word
+                words = [word for chunk in _SPLIT_RE.split(column) if chunk for word in self._chunk(chunk)[0]]
+                return self._word_tokens(words)
+            previous = words[-1]
+            tokens += chunk_tokens
+        return tokens
+
+    def column_tokens(self, column: str) -> List[str]:
+        """Normalized, abbreviation-expanded tokens of a column name."""
+        return list(dict.fromkeys(self._tokens(column)))
+
+    def classify(self, column: str) -> Tuple[Match, ...]:
+        """
+        Return the best matching concepts for one column name, best first.
+
+        Returns:
+            Up to top_k matches scoring at least min_score
+        """
+        cached = self._cache.get(column)
+        if cached is not None:
+            return cached
+
+        # Names differing only in qualifiers, digits or order share one scoring
+        tokens = frozenset(self._tokens(column))
+        matches = self._scored.get(tokens)
+        if matches is None:
+            matches = self._score(tokens)
+            if len(self._scored) >= MAX_CACHED_COLUMNS:
+                self._scored.clear()
+            self._scored[tokens] = matches
+
+        if len(self._cache) >= MAX_CACHED_COLUMNS:
+            self._cache.clear()
+        self._cache[column] = matches
+        return matches
+
+    def _score(self, column_tokens: frozenset) -> Tuple[Match, ...]:
+        """Ranked matches for the tokens of a column name."""
+        idf = self.idf
+        tokens = sorted(t for t in column_tokens if t in idf)
+        matches: Tuple[Match, ...] = ()
+        concept_ids = set()
+        for token in tokens:
+            concept_ids.update(self.candidates.get(token, ()))
+        if concept_ids:
+            column_idf = sum(idf[t] for t in tokens)
+            token_set = set(tokens)
+            scored = []
+            for concept_id in concept_ids:
+                if self.distinctive[concept_id].isdisjoint(token_set):
+                    required = self.required[concept_id]
+                    if not required or not required <= token_set:
+                        continue
+                vector = self.vectors[concept_id]
+                head_vector = self.head_vectors[concept_id]
+                value = sum(vector[t] for t in tokens if t in vector)
+                head_hits = sum(head_vector[t] for t in tokens if t in head_vector)
+                head_coverage = min(1.0, head_hits / self.head_idf[concept_id])
+                score = (value / column_idf) * (0.5 + 0.5 * head_coverage)
+                if score >= self.min_score:
+                    scored.append((round(score, 3), concept_id))
+            scored.sort(key=lambda s: (-s[0], -len(self.concepts[s[1]].definitions), s[1]))
+            matches = tuple(self._match(concept_id, score) for score, concept_id in scored[:self.top_k])
+        return matches
+
+    def _match(self, concept_id: int, score: float) -> Match:
+        match = self._matches.get((concept_id, score))
+        if match is None:
+            concept = self.concepts[concept_id]
+            type_, subtype, masking, risk = self._summaries[concept_id]
+            match = Match(concept.name, score, type_, subtype, masking, risk, tuple(concept.definitions))
+            # Scores are rounded, so this stays small
+            self._matches[(concept_id, score)] = match
+        return match
+
+    def classify_many(self, columns: Sequence[str]) -> List[Tuple[Match, ...]]:
+        """Classify a batch of column names; each distinct name is scored once."""
+        classify = self.classify
+        return [classify(column) for column in columns]
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Shared corpus loader for the OpenPIIMap scripts.
+
+Every jurisdiction YAML under data/ is parsed exactly once per process into
+typed in-memory objects (Jurisdiction, Category, Citation). The build,
+validation, lint, audit and index-generation scripts all read from the same
+Corpus instead of walking and re-parsing the tree on their own.
+
+Files are ordered deterministically by their path relative to data/, so
+every consumer sees the same jurisdiction order regardless of filesystem.
+
+Usage:
+    from corpus import load_corpus
+
+    corpus = load_corpus()
+    for jurisdiction in corpus:
+        print(jurisdiction.rel_path, len(jurisdiction.categories))
+
+Timestamps such as `last_updated: 2025-06-26` are kept as plain strings
+(the same semantics validate-yamls.py has always used), so parsed documents
+are JSON-safe and match the schema without post-processing. Parsing uses
+libyaml's CSafeLoader when PyYAML was built with it, and falls back to the
+pure-Python SafeLoader otherwise; both resolve scalars identically.
+
+Corpus.query() and Corpus.index give dictionary lookups over every category
+by country, framework, type, subtype, tags, risk level and cited regulation
+(see corpus_index.py).
+
+Parsed documents are also persisted in .openpiimap-cache/ (see
+corpus_cache.py), so files that have not changed since the previous run are
+not parsed again. Set OPENPIIMAP_NO_CACHE=1 to disable this.
+"""
+
+import hashlib
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+from yaml.dumper import SafeDumper
+from yaml.loader import SafeLoader
+
+from corpus_cache import ParsedCorpusCache, cache_enabled
+from corpus_index import CorpusIndex, Entry
+from profiling import profiler
+
+# Paths
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = PROJECT_ROOT / "data"
+# Scratch space for build caches, overridable so CI can persist it between runs
+CACHE_DIR = Path(os.environ.get("OPENPIIMAP_CACHE_DIR", PROJECT_ROOT / ".openpiimap-cache"))
+
+YAML_SUFFIXES = (".yaml", ".yml")
+
+TIMESTAMP_TAG = "tag:yaml.org,2002:timestamp"
+
+
+def _without_timestamps(resolvers: Dict[str, list]) -> Dict[str, list]:
+    """Return a copy of an implicit resolver table without the timestamp rule."""
+    return {
+        first_letter: [(tag, regexp) for tag, regexp in entries if tag != TIMESTAMP_TAG]
+        for first_letter, entries in resolvers.items()
+    }
+
+
+class NoDatesSafeLoader(SafeLoader):
+    """SafeLoader that leaves ISO dates as strings."""
+
+
+class NoDatesSafeDumper(SafeDumper):
+    """SafeDumper that writes ISO date strings back unquoted."""
+
+
+# Assign fresh tables so the stock SafeLoader/SafeDumper are left untouched
+NoDatesSafeLoader.yaml_implicit_resolvers = _without_timestamps(SafeLoader.yaml_implicit_resolvers)
+NoDatesSafeDumper.yaml_implicit_resolvers = _without_timestamps(SafeDumper.yaml_implicit_resolvers)
+
+try:
+    from yaml import CSafeLoader
+except ImportError:
+    # PyYAML built without libyaml
+    CSafeLoader = None
+
+if CSafeLoader is not None:
+    class NoDatesCSafeLoader(CSafeLoader):
+        """libyaml-backed CSafeLoader that leaves ISO dates as strings."""
+
+    NoDatesCSafeLoader.yaml_implicit_resolvers = _without_timestamps(CSafeLoader.yaml_implicit_resolvers)
+    FastLoader = NoDatesCSafeLoader
+else:
+    FastLoader = NoDatesSafeLoader
+
+LIBYAML_AVAILABLE = FastLoader is not NoDatesSafeLoader
+
+
+def parse_yaml(stream, loader=None) -> Any:
+    """
+    Parse a YAML document from a string or file object without date conversion.
+
+    Args:
+        stream: YAML text or an open file
+        loader: Loader class to use; defaults to the libyaml loader when available
+
+    Returns:
+        The parsed document
+    """
+    return yaml.load(stream, Loader=loader or FastLoader)
+
+
+def dump_yaml(data: Any, stream=None, **kwargs) -> Optional[str]:
+    """Serialize data back to YAML, keeping date-like strings unquoted."""
+    kwargs.setdefault("sort_keys", False)
+    kwargs.setdefault("allow_unicode", True)
+    return yaml.dump(data, stream, Dumper=NoDatesSafeDumper, **kwargs)
+
+
+@dataclass
+class Citation:
+    """A single legal citation attached to a category."""
+
+    regulation: Optional[str] = None
+    national_law: Optional[str] = None
+    authority: Optional[str] = None
+    article: Optional[str] = None
+    section: Optional[str] = None
+    url: Optional[str] = None
+    description: Optional[str] = None
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_dict(cls, raw: Any) -> "Citation":
+        if not isinstance(raw, dict):
+            return cls(raw={})
+        return cls(
+            regulation=raw.get("regulation"),
+            national_law=raw.get("national_law"),
+            authority=raw.get("authority"),
+            article=raw.get("article"),
+            section=raw.get("section"),
+            url=raw.get("url"),
+            description=raw.get("description"),
+            raw=raw,
+        )
+
+    @property
+    def source(self) -> Optional[str]:
+        """The regulation, national law or authority this citation points at."""
+        return self.regulation or self.national_law or self.authority
+
+
+def _list_field(raw: Dict[str, Any], key: str) -> List[Any]:
+    """A list field of a category; malformed values are left to the schema check."""
+    value = raw.get(key)
+    return list(value) if isinstance(value, list) else []
+
+
+@dataclass
+class Category:
+    """A PII/PHI category defined by a jurisdiction file."""
+
+    name: str
+    type: str
+    subtype: Optional[str] = None
+    required_masking: bool = False
+    tags: List[str] = field(default_factory=list)
+    category_tags: List[str] = field(default_factory=list)
+    risk_level: Optional[str] = None
+    citations: List[Citation] = field(default_factory=list)
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_dict(cls, raw: Any) -> "Category":
+        if not isinstance(raw, dict):
+            return cls(name="", type="", raw={})
+        citations = raw.get("citations") or []
+        return cls(
+            name=raw.get("name", ""),
+            type=raw.get("type", ""),
+            subtype=raw.get("subtype"),
+            required_masking=bool(raw.get("required_masking", False)),
+            tags=_list_field(raw, "tags"),
+            category_tags=_list_field(raw, "category_tags"),
+            risk_level=raw.get("risk_level"),
+            citations=[Citation.from_dict(c) for c in citations] if isinstance(citations, list) else [],
+            raw=raw,
+        )
+
+
+@dataclass
+class Jurisdiction:
+    """One parsed jurisdiction file, e.g. data/gdpr/germany.yaml."""
+
+    path: Path
+    framework_dir: str
+    slug: str
+    data: Any = None
+    error: Optional[str] = None
+    digest: Optional[str] = None
+    categories: List[Category] = field(default_factory=list)
+
+    @property
+    def rel_path(self) -> str:
+        """Path relative to the project root, e.g. data/gdpr/germany.yaml."""
+        try:
+            return self.path.relative_to(PROJECT_ROOT).as_posix()
+        except ValueError:
+            return self.path.as_posix()
+
+    @property
+    def ok(self) -> bool:
+        """True when the file parsed into a mapping."""
+        return self.error is None and isinstance(self.data, dict)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Read a top-level field from the parsed document."""
+        if isinstance(self.data, dict):
+            return self.data.get(key, default)
+        return default
+
+    @property
+    def country(self) -> str:
+        return self.get("country", self.slug)
+
+    @property
+    def framework(self) -> str:
+        return self.get("framework", self.framework_dir)
+
+    @property
+    def region(self) -> str:
+        return self.get("region", "")
+
+
+class Corpus:
+    """All jurisdiction files under a data directory, in deterministic order."""
+
+    def __init__(self, data_dir: Path, jurisdictions: List[Jurisdiction]):
+        self.data_dir = data_dir
+        self.jurisdictions = jurisdictions
+        self._index = None
+
+    def __iter__(self) -> Iterator[Jurisdiction]:
+        return iter(self.jurisdictions)
+
+    def __len__(self) -> int:
+        return len(self.jurisdictions)
+
+    @property
+    def errors(self) -> List[Jurisdiction]:
+        """Jurisdictions whose YAML failed to parse."""
+        return [j for j in self.jurisdictions if j.error is not None]
+
+    def frameworks(self) -> List[str]:
+        """Sorted framework directory names that contain at least one file."""
+        return sorted({j.framework_dir for j in self.jurisdictions if j.framework_dir})
+
+    def by_framework(self, framework_dir: str) -> List[Jurisdiction]:
+        """Jurisdictions stored under data/<framework_dir>/."""
+        return [j for j in self.jurisdictions if j.framework_dir == framework_dir]
+
+    @property
+    def index(self) -> CorpusIndex:
+        """Hash indexes over every category, built on first use."""
+        if self._index is None:
+            self._index = CorpusIndex(j for j in self.jurisdictions if j.ok)
+        return self._index
+
+    def query(self, **criteria: Any) -> Tuple[Entry, ...]:
+        """
+        Return the categories matching every given field.
+
+        Example:
+            corpus.query(framework="GDPR", type="special_category", subtype="biometric")
+        """
+        return self.index.query(**criteria)
+
+
+def discover(data_dir: Path = DATA_DIR) -> List[Path]:
+    """
+    Find every jurisdiction YAML under a data directory.
+
+    Args:
+        data_dir: Root data directory
+
+    Returns:
+        Paths sorted by their POSIX path relative to data_dir
+    """
+    data_dir = Path(data_dir)
+    with profiler.phase("discovery"):
+        paths = [p for p in data_dir.rglob("*") if p.suffix in YAML_SUFFIXES and p.is_file()]
+        return sorted(paths, key=lambda p: p.relative_to(data_dir).as_posix())
+
+
+def _parse_bytes(raw: bytes) -> Any:
+    return parse_yaml(raw.decode("utf-8"))
+
+
+def open_cache() -> Optional[ParsedCorpusCache]:
+    """Return the on-disk parsed-document cache, or None when disabled."""
+    if not cache_enabled():
+        return None
+    return ParsedCorpusCache(CACHE_DIR)
+
+
+def load_file(path: Path, data_dir: Path = DATA_DIR,
+              cache: Optional[ParsedCorpusCache] = None) -> Jurisdiction:
+    """
+    Parse a single jurisdiction file.
+
+    YAML errors are recorded on the returned Jurisdiction instead of raised,
+    so callers can report them in their own format. With a cache, unchanged
+    files are read back from it instead of being parsed.
+    """
+    path = Path(path)
+    rel_parts = path.relative_to(data_dir).parts
+    framework_dir = rel_parts[0] if len(rel_parts) > 1 else ""
+    jurisdiction = Jurisdiction(path=path, framework_dir=framework_dir, slug=path.stem)
+
+    try:
+        with profiler.phase("parse", file=jurisdiction.rel_path, cached=cache is not None):
+            if cache is not None:
+                jurisdiction.data, jurisdiction.digest = cache.load(path, _parse_bytes)
+            else:
+                with open(path, "rb") as f:
+                    raw = f.read()
+                jurisdiction.digest = hashlib.sha256(raw).hexdigest()
+                jurisdiction.data = _parse_bytes(raw)
+    except (yaml.YAMLError, UnicodeDecodeError) as e:
+        jurisdiction.error = str(e)
+        return jurisdiction
+
+    if isinstance(jurisdiction.data, dict):
+        categories = jurisdiction.data.get("categories") or []
+        if isinstance(categories, list):
+            jurisdiction.categories = [Category.from_dict(c) for c in categories]
+    return jurisdiction
+
+
+_loaded_corpora: Dict[Path, Corpus] = {}
+
+
+def load_corpus(data_dir: Path = DATA_DIR, refresh: bool = False, use_cache: bool = True) -> Corpus:
+    """
+    Load every jurisdiction under data_dir, parsing each file once per process.
+
+    Args:
+        data_dir: Root data directory
+        refresh: Re-read the files even if this directory was already loaded
+        use_cache: Reuse parsed documents from the on-disk cache for files
+                   that have not changed since the last run
+
+    Returns:
+        The shared Corpus for data_dir
+    """
+    data_dir = Path(data_dir).resolve()
+    if refresh or data_dir not in _loaded_corpora:
+        cache = open_cache() if use_cache else None
+        jurisdictions = [load_file(p, data_dir, cache) for p in discover(data_dir)]
+        if cache is not None:
+            cache.save()
+        _loaded_corpora[data_dir] = Corpus(data_dir, jurisdictions)
+    return _loaded_corpora[data_dir]
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache of parsed jurisdiction YAMLs.
+
+Parsed documents are stored in marshal format, content-addressed by the
+SHA-256 of the YAML bytes, under .openpiimap-cache/corpus-py<major><minor>/
+(marshal is specific to the Python version). An index maps each source
+file to the mtime, size and hash it had when it was last parsed:
+
+- mtime and size unchanged  -> the cached document is used without reading
+                               the YAML at all
+- mtime or size changed     -> the file is read and hashed; if an object
+                               with that hash exists it is reused (e.g. after
+                               a checkout that only touched timestamps)
+- otherwise                 -> the file is parsed and the result stored
+
+Objects are evicted least-recently-used first once their total size exceeds
+the cap (256 MB by default, OPENPIIMAP_CACHE_MAX_MB to override). Use times
+are only refreshed once they are LAST_USED_RESOLUTION old, so repeated warm
+runs leave index.json untouched. Set
+OPENPIIMAP_NO_CACHE=1 to bypass the cache entirely.
+
+Cache Structure:
+    .openpiimap-cache/corpus-py311/
+      index.json
+      objects/<sha256>.marshal
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = int(os.environ.get("OPENPIIMAP_CACHE_MAX_MB", "256")) * 1024 * 1024
+# Seconds a cache hit may leave an object's last_used unchanged (LRU order is coarse)
+LAST_USED_RESOLUTION = 3600
+
+
+def cache_enabled() -> bool:
+    """False when OPENPIIMAP_NO_CACHE is set to a non-empty value."""
+    return not os.environ.get("OPENPIIMAP_NO_CACHE")
+
+
+class ParsedCorpusCache:
+    """Content-addressed store of parsed YAML documents with an LRU size cap."""
+
+    def __init__(self, cache_dir, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(cache_dir) / f"corpus-py{sys.version_info[0]}{sys.version_info[1]}"
+        self.objects_dir = self.root / "objects"
+        self.index_path = self.root / "index.json"
+        self.max_bytes = max_bytes
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return
+        if raw.get("version") != CACHE_VERSION:
+            return
+        self.files = raw.get("files", {})
+        self.objects = raw.get("objects", {})
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / f"{digest}.marshal"
+
+    def _read_object(self, digest: str) -> Optional[Any]:
+        """Return the cached document for digest, or None if it is missing or unreadable."""
+        if digest not in self.objects:
+            return None
+        try:
+            with open(self._object_path(digest), "rb") as f:
+                data = marshal.loads(f.read())
+        except (OSError, EOFError, ValueError, TypeError):
+            self.objects.pop(digest, None)
+            self._dirty = True
+            return None
+        now = time.time()
+        if now - self.objects[digest]["last_used"] >= LAST_USED_RESOLUTION:
+            self.objects[digest]["last_used"] = now
+            self._dirty = True
+        return data
+
+    def _write_object(self, digest: str, data: Any):
+        try:
+            payload = marshal.dumps(data)
+        except ValueError:
+            # Not representable in marshal format; just don't cache it
+            return
+        os.makedirs(self.objects_dir, exist_ok=True)
+        path = self._object_path(digest)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_path, path)
+        self.objects[digest] = {"size": len(payload), "last_used": time.time()}
+        self._dirty = True
+
+    def load(self, path: Path, parse: Callable[[bytes], Any]) -> Tuple[Any, str]:
+        """
+        Return the parsed document for path, parsing only on a cache miss.
+
+        Args:
+            path: YAML file to load
+            parse: Function turning the raw file bytes into a document;
+                   exceptions it raises propagate and nothing is cached
+
+        Returns:
+            Tuple of (parsed document, SHA-256 of the file contents)
+        """
+        key = str(Path(path).resolve())
+        st = os.stat(path)
+        entry = self.files.get(key)
+
+        if entry and entry["mtime_ns"] == st.st_mtime_ns and entry["size"] == st.st_size:
+            data = self._read_object(entry["sha256"])
+            if data is not None:
+                self.hits += 1
+                return data, entry["sha256"]
+
+        with open(path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw).hexdigest()
+        self.files[key] = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest}
+        self._dirty = True
+
+        data = self._read_object(digest)
+        if data is not None:
+            self.hits += 1
+            return data, digest
+
+        self.misses += 1
+        data = parse(raw)
+        self._write_object(digest, data)
+        return data, digest
+
+    def evict(self):
+        """Drop least-recently-used objects until the cache fits in max_bytes."""
+        total = sum(obj["size"] for obj in self.objects.values())
+        if total <= self.max_bytes:
+            return
+        for digest in sorted(self.objects, key=lambda d: self.objects[d]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= self.objects.pop(digest)["size"]
+            try:
+                os.remove(self._object_path(digest))
+            except OSError:
+                pass
+        live = set(self.objects)
+        self.files = {k: v for k, v in self.files.items() if v["sha256"] in live}
+        self._dirty = True
+
+    def save(self):
+        """Apply the size cap and write the index atomically if anything changed."""
+        if not self._dirty:
+            return
+        self.evict()
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.index_path.with_name(f"index.json.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "files": self.files, "objects": self.objects}, f)
+        os.replace(tmp_path, self.index_path)
+        self._dirty = False
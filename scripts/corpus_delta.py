@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Semantic delta between two versions of the corpus.
+
+Mirrors of site/json/ re-download and re-diff every jurisdiction on each
+release. compute_delta() compares two snapshots, each a git revision or a
+data directory, and records what changed in the documents, not in the
+bytes:
+
+- jurisdictions added (with their document), removed or modified
+- top-level fields that changed (last_updated, version, notes, ...)
+- categories added (in full), removed or modified, matched by name, with the
+  old and new value of every field that changed: type, required_masking,
+  risk_level, citations, retention or any other
+- the new category order, when the changes alone don't imply it
+
+apply_delta() replays a delta onto the "from" documents and returns
+documents equal to the "to" ones, so a consumer can catch up with a few
+hundred bytes instead of the full files.
+
+Only files whose contents differ are parsed. Every file is identified by its
+git blob id: `git ls-tree` lists them for a revision, and a directory is
+hashed the same way. Comparing a revision with the working tree therefore
+parses only the edited files, and the blobs of a revision are read by a
+single `git cat-file --batch`. A file whose YAML changed without changing
+its document (comments, formatting) is counted as reformatted and left out.
+
+write_feed() publishes a delta to a directory that consumers poll:
+
+    <feed>/feed.json                  entries, most recently published first
+    <feed>/deltas/<from>-<to>.json    one compact delta per entry
+
+Snapshots are named by a content id, a hash over every file's blob id. A
+consumer that knows the id of its data follows the entries from that id,
+whatever revision or directory produced the data.
+
+Usage:
+    python scripts/openpiimap.py delta v1.2.0                 # v1.2.0 -> data/
+    python scripts/openpiimap.py delta v1.2.0 HEAD --json delta.json
+    python scripts/openpiimap.py delta HEAD~1 HEAD --feed site/json/feed
+    python scripts/openpiimap.py delta /tmp/old-checkout data
+
+Delta Structure:
+    {
+      "version": 1,
+      "from": {"ref": "v1.2.0", "commit": "<sha>", "id": "<sha1>", "jurisdictions": 58},
+      "to": {"ref": "working tree", "commit": null, "id": "<sha1>", "jurisdictions": 59},
+      "summary": {
+        "jurisdictions": {"added": 1, "removed": 0, "modified": 1, "reformatted": 0},
+        "categories": {"added": 16, "removed": 0, "modified": 1},
+        "fields": {"risk_level": 1}
+      },
+      "changes": [
+        {"jurisdiction": "gdpr/france", "status": "modified", "json": "json/gdpr/france.json",
+         "fields": {"last_updated": {"old": "2025-06-26", "new": "2025-09-01"}},
+         "categories": {
+           "added": [{"name": "Voice Recording", "type": "PII", ...}],
+           "removed": [],
+           "modified": [{"name": "Email Address", "changes": {"risk_level": {"old": "medium", "new": "high"}}}]
+         }}
+      ]
+    }
+
+A field that is missing on one side has no "old" (or "new") key. Categories
+with the same name are told apart as "Name", "Name #2", ...
+"""
+
+import copy
+import hashlib
+import json
+import subprocess
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import yaml
+
+from corpus import DATA_DIR, YAML_SUFFIXES, discover, parse_yaml
+from git_timeline import repository, run_git
+from output_writer import write_if_changed
+from profiling import profiler
+from site_packaging import dump_json
+
+DELTA_VERSION = 1
+
+# Category fields listed first in the summary; every field is diffed
+KEY_FIELDS = ("type", "required_masking", "risk_level", "citations", "retention")
+
+FEED_NAME = "feed.json"
+FEED_DELTA_DIR = "deltas"
+
+_MISSING = object()
+
+
+def blob_id(raw: bytes) -> str:
+    """The git blob id of a file's contents."""
+    return hashlib.sha1(b"blob %d\0" % len(raw) + raw).hexdigest()
+
+
+class Snapshot:
+    """The jurisdiction files of one corpus version, by key ("gdpr/france")."""
+
+    def __init__(self, ref: str, blobs: Dict[str, str], read: Callable[[List[str]], Dict[str, bytes]],
+                 commit: Optional[str] = None):
+        """
+        Args:
+            ref: What the snapshot was taken from, for display
+            blobs: Blob id of every file, by key
+            read: Returns the contents of the given keys
+            commit: The commit of a git snapshot
+        """
+        self.ref = ref
+        self.blobs = blobs
+        self.read = read
+        self.commit = commit
+
+    @property
+    def id(self) -> str:
+        """Content id, the same for any two snapshots holding the same files."""
+        listing = "".join(f"{key}\t{blob}\n" for key, blob in sorted(self.blobs.items()))
+        return hashlib.sha1(listing.encode("utf-8")).hexdigest()
+
+    def describe(self) -> Dict[str, Any]:
+        return {"ref": self.ref, "commit": self.commit, "id": self.id, "jurisdictions": len(self.blobs)}
+
+
+def _key(rel_path: str) -> Optional[str]:
+    path = Path(rel_path)
+    if path.suffix not in YAML_SUFFIXES:
+        return None
+    return path.with_suffix("").as_posix()
+
+
+def directory_snapshot(data_dir: Path = DATA_DIR, ref: Optional[str] = None) -> Snapshot:
+    """Snapshot of the YAML files under a data directory."""
+    data_dir = Path(data_dir)
+    paths = {}
+    blobs = {}
+    for path in discover(data_dir):
+        key = _key(path.relative_to(data_dir).as_posix())
+        paths[key] = path
+        blobs[key] = blob_id(path.read_bytes())
+    return Snapshot(ref or str(data_dir), blobs, lambda keys: {key: paths[key].read_bytes() for key in keys})
+
+
+def _read_blobs(repo: Path, blobs: Iterable[str]) -> Dict[str, bytes]:
+    """Contents of the given blobs, from one `git cat-file --batch`."""
+    blobs = list(dict.fromkeys(blobs))
+    if not blobs:
+        return {}
+    output = run_git(repo, "cat-file", "--batch", input="".join(f"{blob}\n" for blob in blobs).encode()).stdout
+    contents = {}
+    pos = 0
+    for _ in blobs:
+        # "<blob> blob <size>\n<contents>\n"
+        end = output.index(b"\n", pos)
+        blob, _, size = output[pos:end].decode().split(" ")
+        contents[blob] = output[end + 1:end + 1 + int(size)]
+        pos = end + 1 + int(size) + 1
+    return contents
+
+
+def git_snapshot(revision: str, data_dir: Path = DATA_DIR) -> Snapshot:
+    """
+    Snapshot of data_dir as of a git revision.
+
+    Raises:
+        ValueError: data_dir is not in a git checkout, or revision names no commit
+    """
+    located = repository(Path(data_dir))
+    if located is None:
+        raise ValueError(f"{data_dir} is not in a git checkout, so '{revision}' can't be read")
+    repo, prefix, _ = located
+    resolved = run_git(repo, "rev-parse", "--verify", "--quiet", f"{revision}^{{commit}}", check=False)
+    if resolved.returncode != 0:
+        raise ValueError(f"'{revision}' is neither a directory nor a git revision")
+    commit = resolved.stdout.decode().strip()
+
+    try:
+        listing = run_git(repo, "ls-tree", "-r", "-z", "--full-tree", commit, *([prefix] if prefix else []))
+    except subprocess.CalledProcessError as e:
+        raise ValueError(e.stderr.decode("utf-8", "replace").strip()) from e
+    blobs = {}
+    for record in listing.stdout.decode("utf-8").split("\0"):
+        if not record:
+            continue
+        meta, path = record.split("\t", 1)
+        _, kind, blob = meta.split(" ")
+        key = _key(path[len(prefix):]) if kind == "blob" and path.startswith(prefix) else None
+        if key is not None:
+            blobs[key] = blob
+
+    def read(keys: List[str]) -> Dict[str, bytes]:
+        contents = _read_blobs(repo, (blobs[key] for key in keys))
+        return {key: contents[blobs[key]] for key in keys}
+
+    return Snapshot(revision, blobs, read, commit)
+
+
+def load_snapshot(spec: str, data_dir: Path = DATA_DIR) -> Snapshot:
+    """
+    Snapshot of a directory, or of data_dir at a git revision.
+
+    A directory may be a data directory or a checkout containing data/; a
+    spec naming an existing directory is never read as a revision.
+    """
+    path = Path(spec)
+    if path.is_dir():
+        if (path / "data").is_dir():
+            path = path / "data"
+        return directory_snapshot(path, spec)
+    return git_snapshot(spec, data_dir)
+
+
+def _canonical(value: Any) -> str:
+    # Unlike ==, tells true from 1 and "1" from 1
+    return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _field_changes(old: Dict[str, Any], new: Dict[str, Any], skip: Iterable[str] = ()) -> Dict[str, Dict[str, Any]]:
+    """{field: {"old": ..., "new": ...}} for every field whose value differs."""
+    changes = {}
+    for field in [*new, *(key for key in old if key not in new)]:
+        if field in skip:
+            continue
+        before, after = old.get(field, _MISSING), new.get(field, _MISSING)
+        if before is not _MISSING and after is not _MISSING and _canonical(before) == _canonical(after):
+            continue
+        change = {}
+        if before is not _MISSING:
+            change["old"] = before
+        if after is not _MISSING:
+            change["new"] = after
+        changes[str(field)] = change
+    return changes
+
+
+def _apply_fields(document: Dict[str, Any], changes: Dict[str, Dict[str, Any]]):
+    for field, change in changes.items():
+        if "new" in change:
+            document[field] = copy.deepcopy(change["new"])
+        else:
+            document.pop(field, None)
+
+
+def _labelled(categories: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Categories by name, with " #2", " #3", ... for repeated names."""
+    labelled = {}
+    for category in categories:
+        name = str(category.get("name", ""))
+        label, n = name, 2
+        while label in labelled:
+            label, n = f"{name} #{n}", n + 1
+        labelled[label] = category
+    return labelled
+
+
+def _category_list(document: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    categories = document.get("categories")
+    if isinstance(categories, list) and all(isinstance(c, dict) for c in categories):
+        return categories
+    return None
+
+
+def apply_change(document: Any, change: Dict[str, Any]) -> Any:
+    """
+    Apply one entry of a delta's "changes" to the old document of its jurisdiction.
+
+    Returns:
+        The new document, or None when the jurisdiction was removed
+    """
+    if change["status"] == "removed":
+        return None
+    if change["status"] == "added":
+        return copy.deepcopy(change["document"])
+    if "error" in change:
+        raise ValueError(f"{change['jurisdiction']}: {change['error']}")
+
+    document = copy.deepcopy(document)
+    _apply_fields(document, change.get("fields", {}))
+    if "categories" in change or "order" in change:
+        categories = _labelled(document["categories"])
+        diff = change.get("categories", {})
+        for label in diff.get("removed", []):
+            del categories[label]
+        for item in diff.get("modified", []):
+            _apply_fields(categories[item["name"]], item["changes"])
+        categories = _labelled([*categories.values(), *copy.deepcopy(diff.get("added", []))])
+        document["categories"] = [categories[label] for label in change.get("order", categories)]
+    return document
+
+
+def diff_documents(old: Dict[str, Any], new: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Field and category changes from one version of a jurisdiction document to the next.
+
+    Returns:
+        {"fields", "categories", "order"} (each only when it has changes), or
+        None when the documents are equal
+    """
+    old_categories, new_categories = _category_list(old), _category_list(new)
+    if old_categories is None or new_categories is None:
+        # Not a list of categories on one side: carry it as a plain field
+        fields = _field_changes(old, new)
+        return {"fields": fields} if fields else None
+
+    change = {}
+    fields = _field_changes(old, new, skip=("categories",))
+    if fields:
+        change["fields"] = fields
+
+    before, after = _labelled(old_categories), _labelled(new_categories)
+    modified = []
+    for label in after:
+        if label in before:
+            changes = _field_changes(before[label], after[label])
+            if changes:
+                modified.append({"name": label, "changes": changes})
+    added = [label for label in after if label not in before]
+    removed = [label for label in before if label not in after]
+    if added or removed or modified:
+        change["categories"] = {
+            "added": [after[label] for label in added],
+            "removed": removed,
+            "modified": modified,
+        }
+    if list(after) != [label for label in before if label in after] + added:
+        change["order"] = list(after)
+    if not change:
+        return None
+
+    # Repeated names can shift labels in ways the replay can't follow; send the list whole then
+    if _canonical(apply_change(old, {"status": "modified", "jurisdiction": "", **change})) != _canonical(new):
+        change.pop("categories", None)
+        change.pop("order", None)
+        change.setdefault("fields", {})["categories"] = {"old": old_categories, "new": new_categories}
+    return change
+
+
+def _parse(raw: bytes) -> Any:
+    try:
+        return parse_yaml(raw.decode("utf-8")), None
+    except (yaml.YAMLError, UnicodeDecodeError) as e:
+        return None, str(e)
+
+
+def _categories_of(document: Any) -> int:
+    if not isinstance(document, dict):
+        return 0
+    return len(_category_list(document) or [])
+
+
+def compute_delta(old: Snapshot, new: Snapshot) -> Dict[str, Any]:
+    """The semantic delta from snapshot old to snapshot new (see the module docstring)."""
+    with profiler.phase("delta", "step"):
+        changed = sorted(
+            key for key in old.blobs.keys() | new.blobs.keys() if old.blobs.get(key) != new.blobs.get(key)
+        )
+        old_raw = old.read([key for key in changed if key in old.blobs])
+        new_raw = new.read([key for key in changed if key in new.blobs])
+
+        jurisdictions = Counter({"added": 0, "removed": 0, "modified": 0, "reformatted": 0})
+        categories = Counter({"added": 0, "removed": 0, "modified": 0})
+        fields = Counter()
+        changes = []
+        for key in changed:
+            with profiler.phase("diff", file=key):
+                entry = {"jurisdiction": key}
+                if key.count("/") == 1:
+                    entry["json"] = f"json/{key}.json"
+                before, before_error = _parse(old_raw[key]) if key in old_raw else (None, None)
+                after, after_error = _parse(new_raw[key]) if key in new_raw else (None, None)
+
+                if key not in old_raw:
+                    entry.update(status="added", document=after)
+                    categories["added"] += _categories_of(after)
+                elif key not in new_raw:
+                    entry.update(status="removed")
+                    categories["removed"] += _categories_of(before)
+                elif before_error or after_error or not isinstance(before, dict) or not isinstance(after, dict):
+                    entry.update(status="modified", error=after_error or before_error or "not a mapping")
+                else:
+                    diff = diff_documents(before, after)
+                    if diff is None:
+                        jurisdictions["reformatted"] += 1
+                        continue
+                    entry.update(status="modified", **diff)
+                    diff_categories = diff.get("categories", {})
+                    categories["added"] += len(diff_categories.get("added", []))
+                    categories["removed"] += len(diff_categories.get("removed", []))
+                    categories["modified"] += len(diff_categories.get("modified", []))
+                    for item in diff_categories.get("modified", []):
+                        fields.update(item["changes"].keys())
+                jurisdictions[entry["status"]] += 1
+                changes.append(entry)
+
+        return {
+            "version": DELTA_VERSION,
+            "from": old.describe(),
+            "to": new.describe(),
+            "summary": {
+                "jurisdictions": dict(jurisdictions),
+                "categories": dict(categories),
+                "fields": {
+                    field: fields[field]
+                    for field in sorted(fields, key=lambda f: (KEY_FIELDS.index(f) if f in KEY_FIELDS else len(KEY_FIELDS), f))
+                },
+            },
+            "changes": changes,
+        }
+
+
+def apply_delta(documents: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replay a delta onto the documents of its "from" snapshot.
+
+    Args:
+        documents: Parsed documents by key
+
+    Returns:
+        The documents of the "to" snapshot
+
+    Raises:
+        ValueError: A change could not be diffed (a file failed to parse)
+    """
+    documents = dict(documents)
+    for change in delta["changes"]:
+        document = apply_change(documents.get(change["jurisdiction"]), change)
+        if document is None:
+            documents.pop(change["jurisdiction"], None)
+        else:
+            documents[change["jurisdiction"]] = document
+    return documents
+
+
+def write_feed(delta: Dict[str, Any], feed_dir: Path) -> Dict[str, Any]:
+    """
+    Publish a delta to a feed directory and list it first in feed.json.
+
+    Publishing the same from/to pair again replaces its entry.
+
+    Returns:
+        The feed.json entry of the delta
+    """
+    feed_dir = Path(feed_dir)
+    name = f"{delta['from']['id'][:12]}-{delta['to']['id'][:12]}.json"
+    data = (dump_json(delta, minify=True) + "\n").encode("utf-8")
+    write_if_changed(feed_dir / FEED_DELTA_DIR / name, data)
+
+    entry = {
+        "from": delta["from"]["id"],
+        "to": delta["to"]["id"],
+        "from_ref": delta["from"]["ref"],
+        "to_ref": delta["to"]["ref"],
+        "path": f"{FEED_DELTA_DIR}/{name}",
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "summary": delta["summary"],
+    }
+    try:
+        with open(feed_dir / FEED_NAME, "r", encoding="utf-8") as f:
+            entries = json.load(f)["entries"]
+    except (OSError, ValueError, KeyError, TypeError):
+        entries = []
+    entries = [entry] + [e for e in entries if (e.get("from"), e.get("to")) != (entry["from"], entry["to"])]
+    write_if_changed(feed_dir / FEED_NAME, dump_json({"version": DELTA_VERSION, "entries": entries}) + "\n")
+    return entry
+
+
+def _label(change: Dict[str, Any]) -> str:
+    parts = []
+    diff = change.get("categories", {})
+    parts += [f"+{category.get('name', '')}" for category in diff.get("added", [])]
+    parts += [f"-{name}" for name in diff.get("removed", [])]
+    parts += [f"~{item['name']} ({', '.join(item['changes'])})" for item in diff.get("modified", [])]
+    if change.get("fields"):
+        parts.append(f"fields: {', '.join(change['fields'])}")
+    if "order" in change:
+        parts.append("reordered")
+    return "; ".join(parts)
+
+
+def print_delta(delta: Dict[str, Any], verbose: bool = False, limit: int = 20):
+    """Print a human summary of a delta, listing up to limit jurisdictions (all with verbose)."""
+    summary = delta["summary"]
+    jurisdictions, categories = summary["jurisdictions"], summary["categories"]
+    changed = jurisdictions["added"] + jurisdictions["removed"] + jurisdictions["modified"]
+    print(f"🔍 {delta['from']['ref']} → {delta['to']['ref']}: {changed} jurisdiction(s) changed "
+          f"({jurisdictions['added']} added, {jurisdictions['removed']} removed, {jurisdictions['modified']} modified), "
+          f"categories +{categories['added']} -{categories['removed']} ~{categories['modified']}")
+    if jurisdictions["reformatted"]:
+        print(f"   {jurisdictions['reformatted']} file(s) only reformatted")
+    if summary["fields"]:
+        print("   Fields changed: " + ", ".join(f"{field} ×{count}" for field, count in summary["fields"].items()))
+
+    shown = delta["changes"] if verbose else delta["changes"][:limit]
+    for change in shown:
+        if change["status"] == "added":
+            print(f"  ➕ {change['jurisdiction']} ({_categories_of(change['document'])} categories)")
+        elif change["status"] == "removed":
+            print(f"  ➖ {change['jurisdiction']}")
+        elif "error" in change:
+            print(f"  ❌ {change['jurisdiction']}: {change['error']}")
+        else:
+            print(f"  ✏️  {change['jurisdiction']}: {_label(change)}")
+    if len(shown) < len(delta["changes"]):
+        print(f"  ... and {len(delta['changes']) - len(shown)} more (--verbose lists all)")
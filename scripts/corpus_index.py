@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+In-memory hash indexes over the categories of a loaded corpus.
+
+Every category of every jurisdiction becomes an Entry. Entries are indexed
+by country, framework, type, subtype, tags, category_tags, risk_level and
+cited regulation, so a lookup is a dictionary hit instead of a walk over
+data/. Queries on several fields intersect the matching sets (smallest
+first) and the result is memoized, so repeating a query - the common case
+for services that classify on every event - costs one dictionary lookup.
+
+Keys are matched case-insensitively: framework="gdpr" and framework="GDPR"
+are the same query. Frameworks are indexed under both their data/ directory
+name and their `framework` value, countries under both `country` and the
+file slug. values() counts each entry once per query key, so frameworks are
+counted by directory name (as Corpus.frameworks() lists them) and "PII" and
+"pii" tags together.
+
+Usage:
+    from corpus import load_corpus
+
+    corpus = load_corpus()
+    for entry in corpus.query(framework="GDPR", type="special_category", subtype="biometric"):
+        print(entry.jurisdiction.country, entry.category.name)
+
+    corpus.index.values("risk_level")   # {'high': 4, 'critical': 2}
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple
+
+# Fields that can be passed to CorpusIndex.query()
+INDEXED_FIELDS = (
+    "country", "framework", "type", "subtype", "tags",
+    "category_tags", "risk_level", "regulation",
+)
+
+# Fields indexed under several spellings of one value; values() counts the first
+ALIASED_FIELDS = ("country", "framework")
+
+# Memoized query results are dropped once this many distinct queries were seen
+MAX_CACHED_QUERIES = 4096
+
+
+@dataclass(frozen=True, eq=False)
+class Entry:
+    """One category as defined by one jurisdiction."""
+
+    jurisdiction: Any
+    category: Any
+
+    @property
+    def country(self) -> str:
+        return self.jurisdiction.country
+
+    @property
+    def framework(self) -> str:
+        return self.jurisdiction.framework
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly view of the entry."""
+        return {
+            "country": self.jurisdiction.country,
+            "framework": self.jurisdiction.framework,
+            "file": self.jurisdiction.rel_path,
+            "name": self.category.name,
+            "type": self.category.type,
+            "subtype": self.category.subtype,
+            "required_masking": self.category.required_masking,
+            "risk_level": self.category.risk_level,
+            "tags": list(self.category.tags),
+            "category_tags": list(self.category.category_tags),
+        }
+
+
+def normalize_key(value: Any) -> str:
+    """Case-insensitive index key for a field value."""
+    return str(value).strip().casefold()
+
+
+def _entry_keys(entry: Entry) -> Dict[str, Iterable[Any]]:
+    """Raw values an entry is indexed under, per field."""
+    jurisdiction, category = entry.jurisdiction, entry.category
+    return {
+        "country": (jurisdiction.country, jurisdiction.slug),
+        "framework": (jurisdiction.framework_dir, jurisdiction.framework),
+        "type": (category.type,),
+        "subtype": (category.subtype,),
+        "tags": category.tags,
+        "category_tags": category.category_tags,
+        "risk_level": (category.risk_level,),
+        "regulation": (citation.source for citation in category.citations),
+    }
+
+
+class CorpusIndex:
+    """Hash indexes from field values to the entries that carry them."""
+
+    def __init__(self, jurisdictions: Iterable[Any]):
+        self.entries: List[Entry] = [
+            Entry(jurisdiction, category)
+            for jurisdiction in jurisdictions
+            for category in jurisdiction.categories
+        ]
+        self._queries: Dict[FrozenSet[Tuple[str, Any]], Tuple[Entry, ...]] = {}
+
+        postings = {field: defaultdict(set) for field in INDEXED_FIELDS}
+        counts = {field: defaultdict(int) for field in INDEXED_FIELDS}
+        labels: Dict[str, Dict[str, Any]] = {field: {} for field in INDEXED_FIELDS}
+        for entry_id, entry in enumerate(self.entries):
+            for field, values in _entry_keys(entry).items():
+                display = {}
+                for value in values:
+                    if value not in (None, ""):
+                        display.setdefault(normalize_key(value), value)
+                for key in display:
+                    postings[field][key].add(entry_id)
+                # Counted per query key, shown in the first spelling seen
+                counted = list(display.items())
+                for key, value in counted[:1] if field in ALIASED_FIELDS else counted:
+                    counts[field][key] += 1
+                    labels[field].setdefault(key, value)
+
+        self._postings: Dict[str, Dict[str, FrozenSet[int]]] = {
+            field: {key: frozenset(ids) for key, ids in keys.items()}
+            for field, keys in postings.items()
+        }
+        self._counts: Dict[str, Dict[str, int]] = {
+            field: {labels[field][key]: count for key, count in keys.items()}
+            for field, keys in counts.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def query(self, **criteria: Any) -> Tuple[Entry, ...]:
+        """
+        Return entries matching every given field, in corpus order.
+
+        Args:
+            **criteria: Field name (see INDEXED_FIELDS) to value, e.g.
+                        framework="GDPR", subtype="biometric"
+
+        Returns:
+            Matching entries; all entries when no criteria are given
+
+        Raises:
+            ValueError: If a field is not indexed, or a value is not a single
+                        string or number
+        """
+        # Repeated queries are answered straight from the memo, keyed by the
+        # criteria exactly as given
+        try:
+            raw_key = frozenset(criteria.items())
+        except TypeError:
+            raw_key = None
+        else:
+            result = self._queries.get(raw_key)
+            if result is not None:
+                return result
+
+        unknown = set(criteria) - set(INDEXED_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+        invalid = [field for field, value in criteria.items() if not isinstance(value, (str, int, float))]
+        if invalid:
+            raise ValueError(f"Field(s) {', '.join(sorted(invalid))} take a single string or number")
+
+        keys = [(field, normalize_key(value)) for field, value in criteria.items()]
+        if not keys:
+            result = tuple(self.entries)
+        else:
+            sets = sorted((self._postings[field].get(key, frozenset()) for field, key in keys), key=len)
+            ids = sets[0].intersection(*sets[1:])
+            result = tuple(self.entries[i] for i in sorted(ids))
+
+        if len(self._queries) >= MAX_CACHED_QUERIES:
+            self._queries.clear()
+        self._queries[raw_key] = result
+        return result
+
+    def values(self, field: str) -> Dict[str, int]:
+        """Return each value of an indexed field with its number of entries."""
+        if field not in self._counts:
+            raise ValueError(f"Unknown field: {field}")
+        return dict(sorted(self._counts[field].items(), key=lambda kv: str(kv[0])))
@@ -0,0 +1,512 @@
+#!/usr/bin/env python3
+"""
+Scan CSV/JSONL datasets for the PII categories of one jurisdiction.
+
+The file is memory-mapped and split into chunks that start and end on line
+boundaries, so workers in a process pool can each map the same file and
+stream their own byte range without anything being copied between
+processes. Memory stays bounded by the chunk being read plus per-column
+counters, whatever the size of the file.
+
+Each column (CSV header, or JSONL key - nested objects become dotted keys,
+list items `key[]`) is classified twice:
+
+    by name   - column_classifier.ColumnClassifier over the jurisdiction
+    by value  - value_detector.ValueDetector over the sampled rows
+
+and the report lists the categories of the jurisdiction found either way.
+A value pattern is attributed to the jurisdiction category with a matching
+subtype; where several (or none) match, the pattern's label ("ip address")
+is classified like a column name to pick one.
+
+--sample-rate trades accuracy for speed: unsampled lines are skipped before
+they are decoded. Sampling is seeded per chunk, so a scan is repeatable.
+Within a chunk at most --max-values values per column are checked; once
+every CSV column has that many the rest of the chunk is only counted.
+
+Chunks are split on newlines, so quoted CSV fields containing line breaks
+are only parsed correctly when they don't straddle a chunk boundary (and,
+with --sample-rate, when every line of the record is sampled).
+
+Usage:
+    python scripts/openpiimap.py scan customers.csv --jurisdiction data/gdpr/france.yaml
+    python scripts/openpiimap.py scan events.jsonl --jurisdiction hipaa/usa --sample-rate 0.1 -j 8
+"""
+
+import csv
+import json
+import mmap
+import os
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from column_classifier import ColumnClassifier
+from corpus import Corpus, Jurisdiction
+from value_detector import PATTERNS, PatternDef, ValueDetector
+
+FORMATS = {
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+
+DEFAULT_CHUNK_SIZE = 32 * 1024 * 1024
+
+# A column is reported as holding a category when at least this share of
+# its non-empty sampled values match the category's value pattern
+DEFAULT_MIN_HIT_RATE = 0.05
+
+# Values checked per column and chunk; a column that already has this many
+# in a chunk is only counted for the rest of it (0 = check every value)
+DEFAULT_MAX_VALUES = 5000
+
+# Column-name matches scoring below this are not reported. Higher than the
+# classify command's default: a scan report should only claim a category
+# when the name is clearly about it ("ssn" alone only shares "number" with
+# Phone Number when the jurisdiction has no social security category)
+DEFAULT_MIN_SCORE = 0.75
+
+# Distinct values whose detections are remembered per worker; repeated
+# values (countries, status codes, ...) are only scanned once
+MAX_CACHED_VALUES = 65536
+
+# What each value pattern is called when it has to be matched to a
+# category by name; national identifiers not listed here use ID_LABEL
+PATTERN_LABELS = {
+    "email": "email address",
+    "phone": "phone number",
+    "ipv4": "ip address",
+    "ipv6": "ip address",
+    "mac_address": "device identifier",
+    "coordinates": "location",
+    "iban": "bank account number",
+    "credit_card": "credit card number",
+    "us_ssn": "social security number",
+    "fr_nir": "social security number",
+    "uk_nino": "national insurance number",
+    "it_codice_fiscale": "tax identifier",
+}
+ID_LABEL = "national identifier number"
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+_worker_state: Dict[str, Any] = {}
+
+
+def detect_format(path: Path) -> str:
+    """Guess csv, tsv or jsonl from the file suffix."""
+    fmt = FORMATS.get(path.suffix.lower())
+    if fmt is None:
+        raise ValueError(f"Can't tell the format of {path} (use --format csv, tsv or jsonl)")
+    return fmt
+
+
+def _slugify(text: str) -> str:
+    return _SLUG_RE.sub("-", text.casefold()).strip("-")
+
+
+def resolve_jurisdiction(corpus: Corpus, spec: str) -> Jurisdiction:
+    """
+    Find a jurisdiction by file path or framework/country key.
+
+    Accepts data/gdpr/france.yaml, gdpr/france or gdpr/France; the country
+    part may be the file slug or the slugified country name
+    (hipaa/united-states finds data/hipaa/usa.yaml).
+
+    Raises:
+        ValueError: If nothing or more than one jurisdiction matches
+    """
+    key = spec.strip().replace("\\", "/")
+    if key.startswith("data/"):
+        key = key[len("data/"):]
+    for suffix in (".yaml", ".yml"):
+        if key.endswith(suffix):
+            key = key[:-len(suffix)]
+    framework, _, country = key.rpartition("/")
+    country = _slugify(country)
+
+    matches = [
+        j for j in corpus
+        if j.ok and j.slug != "country-index"
+        and (not framework or framework.casefold() in (j.framework_dir.casefold(), j.framework.casefold()))
+        and country in (j.slug, _slugify(j.country))
+    ]
+    if not matches:
+        raise ValueError(f"No jurisdiction matches '{spec}'")
+    if len(matches) > 1:
+        options = ", ".join(j.rel_path for j in matches)
+        raise ValueError(f"'{spec}' is ambiguous ({options}); use framework/country")
+    return matches[0]
+
+
+def line_chunks(mm, start: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """Split mm[start:] into byte ranges of about chunk_size that end on a newline."""
+    size = len(mm)
+    chunks = []
+    while start < size:
+        end = start + chunk_size
+        if end >= size:
+            end = size
+        else:
+            newline = mm.find(b"\n", end)
+            end = size if newline == -1 else newline + 1
+        chunks.append((start, end))
+        start = end
+    return chunks
+
+
+def _flatten(value: Any, prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    """Yield (dotted key, scalar) pairs of a parsed JSON value."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(item, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(value, list):
+        for item in value:
+            yield from _flatten(item, f"{prefix}[]")
+    else:
+        yield prefix, value
+
+
+def _init_worker(path, fmt, header, countries, sample_rate, seed, max_values):
+    _worker_state.update(
+        path=path, fmt=fmt, header=header, sample_rate=sample_rate, seed=seed,
+        max_values=max_values, detector=ValueDetector(countries=countries), cache={},
+    )
+
+
+def _detect(value: str) -> Tuple[str, ...]:
+    """Names of the patterns found in value, memoized per worker."""
+    cache = _worker_state["cache"]
+    found = cache.get(value)
+    if found is None:
+        found = tuple(dict.fromkeys(d.pattern for d in _worker_state["detector"].detect(value)))
+        if len(cache) >= MAX_CACHED_VALUES:
+            cache.clear()
+        cache[value] = found
+    return found
+
+
+def _sampled_lines(mm, start: int, end: int, counts: Dict[str, int], rng: Optional[random.Random],
+                   rate: float) -> Iterator[str]:
+    """
+    Yield the decoded sampled lines of mm[start:end], blank lines included.
+
+    Lines that are not sampled - and every line once counts["saturated"] is
+    set - are counted as rows here unless blank; the caller counts the rows
+    it parses from the lines yielded.
+    """
+    mm.seek(start)
+    readline = mm.readline
+    while mm.tell() < end:
+        line = readline()
+        if counts["saturated"] or (rng is not None and rng.random() >= rate):
+            if line.strip():
+                counts["rows"] += 1
+            continue
+        yield line.decode("utf-8", errors="replace")
+
+
+def _scan_chunk(task: Tuple[int, int, int]) -> Dict[str, Any]:
+    """Scan one byte range; returns row counts and per-column counters."""
+    index, start, end = task
+    state = _worker_state
+    rate = state["sample_rate"]
+    rng = random.Random(state["seed"] * 1_000_003 + index) if rate < 1.0 else None
+    max_values = state["max_values"]
+    counts = {"rows": 0, "sampled": 0, "invalid": 0, "saturated": False}
+    non_empty: Counter = Counter()
+    checked: Counter = Counter()
+    hits: Dict[str, Counter] = defaultdict(Counter)
+    saturated = set()
+
+    def record(column: str, value: Any):
+        if value is None or isinstance(value, bool):
+            return
+        text = value if isinstance(value, str) else str(value)
+        if not text.strip():
+            return
+        non_empty[column] += 1
+        if column in saturated:
+            return
+        checked[column] += 1
+        for pattern in _detect(text):
+            hits[column][pattern] += 1
+        if max_values and checked[column] >= max_values:
+            saturated.add(column)
+
+    with open(state["path"], "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = _sampled_lines(mm, start, end, counts, rng, rate)
+        if state["fmt"] == "jsonl":
+            for line in lines:
+                if not line.strip():
+                    continue
+                counts["rows"] += 1
+                counts["sampled"] += 1
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    counts["invalid"] += 1
+                    continue
+                if not isinstance(row, dict):
+                    counts["invalid"] += 1
+                    continue
+                for column, value in _flatten(row):
+                    record(column, value)
+        else:
+            header = state["header"]
+            delimiter = "\t" if state["fmt"] == "tsv" else ","
+            # Blank lines go to the parser too: they may be part of a quoted
+            # field. Only rows that parse to nothing are skipped
+            for row in csv.reader(lines, delimiter=delimiter):
+                if not row:
+                    continue
+                counts["rows"] += 1
+                counts["sampled"] += 1
+                if len(row) > len(header):
+                    counts["invalid"] += 1
+                for column, value in zip(header, row):
+                    record(column, value)
+                # Every column has enough values for this chunk: the rest
+                # of it is only counted
+                if header and len(saturated) >= len(header):
+                    counts["saturated"] = True
+
+    return {
+        "rows": counts["rows"],
+        "sampled": counts["sampled"],
+        "invalid": counts["invalid"],
+        "non_empty": dict(non_empty),
+        "checked": dict(checked),
+        "hits": {column: dict(c) for column, c in hits.items()},
+    }
+
+
+def _read_header(mm, fmt: str) -> Tuple[List[str], int]:
+    """Return the CSV/TSV header and the offset of the first data row."""
+    newline = mm.find(b"\n")
+    end = len(mm) if newline == -1 else newline + 1
+    line = mm[:end].decode("utf-8-sig", errors="replace")
+    delimiter = "\t" if fmt == "tsv" else ","
+    header = next(csv.reader([line], delimiter=delimiter), [])
+    return [name.strip() for name in header], end
+
+
+class CategoryMapper:
+    """Maps column names and value patterns to one jurisdiction's categories."""
+
+    def __init__(self, corpus: Corpus, jurisdiction: Jurisdiction, min_score: float = DEFAULT_MIN_SCORE):
+        self.jurisdiction = jurisdiction
+        self.entries = corpus.query(framework=jurisdiction.framework_dir, country=jurisdiction.slug)
+        self.by_name = {entry.category.name: entry for entry in self.entries}
+        self.min_score = min_score
+        # Pattern labels are matched with the classifier's usual threshold;
+        # column names must reach min_score
+        self.classifier = ColumnClassifier(corpus, framework=jurisdiction.framework_dir, country=jurisdiction.slug)
+        self._patterns = {pattern.name: pattern for pattern in PATTERNS}
+
+    def _entry(self, match) -> Optional[Any]:
+        for definition in match.definitions:
+            entry = self.by_name.get(definition.name)
+            if entry is not None:
+                return entry
+        return None
+
+    def for_column(self, column: str) -> Optional[Tuple[Any, float]]:
+        """Best category for a column name, with its score."""
+        for match in self.classifier.classify(column):
+            if match.score < self.min_score:
+                break
+            entry = self._entry(match)
+            if entry is not None:
+                return entry, match.score
+        return None
+
+    def for_pattern(self, name: str) -> Optional[Any]:
+        """Category a value pattern is reported under, or None if the jurisdiction has none."""
+        pattern: Optional[PatternDef] = self._patterns.get(name)
+        if pattern is None:
+            return None
+        candidates = [e for e in self.entries if e.category.subtype in pattern.subtypes]
+        if len(candidates) == 1:
+            return candidates[0]
+        matches = self.classifier.classify(PATTERN_LABELS.get(name, ID_LABEL))
+        ranked = [(self._entry(m), m.score) for m in matches]
+        ranked = [(entry, score) for entry, score in ranked if entry is not None]
+        for entry, _ in ranked:
+            if entry in candidates:
+                return entry
+        if candidates:
+            return candidates[0]
+        # No category of the pattern's subtypes: only a close label match counts,
+        # otherwise the jurisdiction doesn't cover this kind of value
+        for entry, score in ranked:
+            if score >= self.min_score:
+                return entry
+        return None
+
+
+def scan_file(path: Path, corpus: Corpus, jurisdiction: Jurisdiction, fmt: Optional[str] = None,
+              sample_rate: float = 1.0, jobs: int = 0, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              min_hit_rate: float = DEFAULT_MIN_HIT_RATE, max_values: int = DEFAULT_MAX_VALUES,
+              min_score: float = DEFAULT_MIN_SCORE, seed: int = 0) -> Dict[str, Any]:
+    """
+    Scan a CSV/TSV/JSONL file and report the jurisdiction's categories found in it.
+
+    Args:
+        path: Dataset to scan
+        corpus: Loaded Corpus
+        jurisdiction: Jurisdiction whose categories are reported
+        fmt: csv, tsv or jsonl; guessed from the suffix when omitted
+        sample_rate: Share of rows whose values are checked (0 < rate <= 1)
+        jobs: Worker processes (0 = one per CPU); 1 scans in this process
+        chunk_size: Approximate bytes per work unit
+        min_hit_rate: Share of checked values that must match a pattern
+                      before the column counts as holding its category
+        max_values: Values checked per column and chunk (0 = all sampled values)
+        min_score: Lowest column-name classifier score reported as a match
+        seed: Sampling seed
+
+    Returns:
+        Report dictionary (see print_report for the fields)
+    """
+    if not 0 < sample_rate <= 1:
+        raise ValueError("sample_rate must be in (0, 1]")
+    path = Path(path)
+    fmt = fmt or detect_format(path)
+    jobs = jobs or os.cpu_count() or 1
+    started = time.perf_counter()
+
+    size = path.stat().st_size
+    header: List[str] = []
+    chunks: List[Tuple[int, int]] = []
+    if size:
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            if fmt in ("csv", "tsv"):
+                header, start = _read_header(mm, fmt)
+            chunks = line_chunks(mm, start, max(1, chunk_size))
+    tasks = [(i, start, end) for i, (start, end) in enumerate(chunks)]
+
+    initargs = (str(path), fmt, header, [jurisdiction.country], sample_rate, seed, max_values)
+    if jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(tasks)), initializer=_init_worker,
+                                 initargs=initargs) as pool:
+            results = list(pool.map(_scan_chunk, tasks))
+    else:
+        _init_worker(*initargs)
+        results = [_scan_chunk(task) for task in tasks]
+
+    rows = sum(r["rows"] for r in results)
+    sampled = sum(r["sampled"] for r in results)
+    invalid = sum(r["invalid"] for r in results)
+    non_empty: Counter = Counter()
+    checked: Counter = Counter()
+    hits: Dict[str, Counter] = defaultdict(Counter)
+    for result in results:
+        non_empty.update(result["non_empty"])
+        checked.update(result["checked"])
+        for column, counter in result["hits"].items():
+            hits[column].update(counter)
+    elapsed = time.perf_counter() - started
+
+    mapper = CategoryMapper(corpus, jurisdiction, min_score=min_score)
+    columns = list(dict.fromkeys(list(header) + sorted(set(non_empty) - set(header))))
+    found: Dict[str, Dict[str, Any]] = {}
+
+    def category(entry, column: str, evidence: str):
+        item = found.setdefault(entry.category.name, {
+            **{k: v for k, v in entry.to_dict().items() if k in ("name", "type", "subtype", "required_masking", "risk_level")},
+            "columns": [],
+            "evidence": [],
+        })
+        if column not in item["columns"]:
+            item["columns"].append(column)
+        if evidence not in item["evidence"]:
+            item["evidence"].append(evidence)
+
+    column_reports = []
+    for column in columns:
+        report = {"column": column, "non_empty": non_empty.get(column, 0), "checked": checked.get(column, 0),
+                  "name_match": None, "values": []}
+        name_match = mapper.for_column(column)
+        if name_match is not None:
+            entry, score = name_match
+            report["name_match"] = {"category": entry.category.name, "score": score}
+            category(entry, column, "name")
+        for pattern, count in sorted(hits.get(column, {}).items(), key=lambda kv: (-kv[1], kv[0])):
+            rate = count / checked[column] if checked[column] else 0.0
+            entry = mapper.for_pattern(pattern)
+            report["values"].append({
+                "pattern": pattern,
+                "category": entry.category.name if entry is not None else None,
+                "hits": count,
+                "hit_rate": round(rate, 4),
+            })
+            if entry is not None and rate >= min_hit_rate:
+                category(entry, column, "values")
+        column_reports.append(report)
+
+    order = {entry.category.name: i for i, entry in enumerate(mapper.entries)}
+    return {
+        "file": str(path),
+        "format": fmt,
+        "bytes": size,
+        "jurisdiction": {
+            "file": jurisdiction.rel_path,
+            "framework": jurisdiction.framework,
+            "country": jurisdiction.country,
+        },
+        "rows": rows,
+        "sampled_rows": sampled,
+        "invalid_rows": invalid,
+        "sample_rate": sample_rate,
+        "chunks": len(tasks),
+        "jobs": min(jobs, max(1, len(tasks))),
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed) if elapsed > 0 else None,
+        "columns": column_reports,
+        "categories": sorted(found.values(), key=lambda c: order.get(c["name"], len(order))),
+    }
+
+
+def print_report(report: Dict[str, Any], verbose: bool = False):
+    """Print a human-readable summary of a scan report."""
+    jurisdiction = report["jurisdiction"]
+    sampled = f", {report['sampled_rows']:,} sampled" if report["sample_rate"] < 1 else ""
+    print(f"🔍 Scanned {report['file']} ({report['format']}, {report['rows']:,} rows{sampled}) "
+          f"against {jurisdiction['framework']} / {jurisdiction['country']}")
+    if report["invalid_rows"]:
+        print(f"⚠️  {report['invalid_rows']:,} malformed row(s)")
+    print()
+
+    for column in report["columns"]:
+        parts = []
+        if column["name_match"]:
+            parts.append(f"name: {column['name_match']['category']} ({column['name_match']['score']:.2f})")
+        for value in column["values"]:
+            if verbose or value["category"]:
+                label = value["category"] or "not covered"
+                parts.append(f"values: {value['pattern']} {value['hit_rate']:.0%} -> {label}")
+        if parts or verbose:
+            print(f"  {column['column']}: {'; '.join(parts) or 'no PII found'}")
+
+    print()
+    categories = report["categories"]
+    if categories:
+        print(f"⚠️  {len(categories)} {jurisdiction['framework']} categor{'y' if len(categories) == 1 else 'ies'} present:")
+        for item in categories:
+            masking = "masking required" if item["required_masking"] else "no masking"
+            print(f"  - {item['name']} [{item['type']}, {masking}] in {', '.join(item['columns'])} "
+                  f"(by {' + '.join(item['evidence'])})")
+    else:
+        print(f"✅ No {jurisdiction['framework']} categories found")
+
+    rate = report["rows_per_second"]
+    throughput = f"{rate:,} rows/s" if rate is not None else "n/a"
+    print(f"\n⏱️  {report['seconds']:.2f}s, {throughput} over {report['chunks']} chunk(s), {report['jobs']} worker(s)")
@@ -1,8 +1,10 @@
 import os
-import yaml
 import json
 from datetime import date, datetime
 
+from corpus import parse_yaml
+from output_writer import write_if_changed
+
 # Paths
 SOURCE_ROOT = "./data"                      # Your original data folder
 OUTPUT_ROOT = "./site/json"                # Output folder for JSON files
@@ -15,7 +17,7 @@ def make_json_safe(obj):
         return obj.isoformat()
     return obj
 
-for framework in os.listdir(SOURCE_ROOT):
+for framework in sorted(os.listdir(SOURCE_ROOT)):
     framework_path = os.path.join(SOURCE_ROOT, framework)
     if not os.path.isdir(framework_path):
         continue
@@ -23,7 +25,7 @@ for framework in os.listdir(SOURCE_ROOT):
     output_framework_path = os.path.join(OUTPUT_ROOT, framework)
     os.makedirs(output_framework_path, exist_ok=True)
 
-    for filename in os.listdir(framework_path):
+    for filename in sorted(os.listdir(framework_path)):
         if not filename.endswith(".yaml"):
             continue
 
@@ -31,9 +33,8 @@ for framework in os.listdir(SOURCE_ROOT):
         output_path = os.path.join(output_framework_path, filename.replace(".yaml", ".json"))
 
         with open(input_path, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+            data = parse_yaml(f)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, default=make_json_safe)
+        write_if_changed(output_path, json.dumps(data, indent=2, ensure_ascii=False, default=make_json_safe))
 
 print("All YAML files converted to JSON under 'site/json'")
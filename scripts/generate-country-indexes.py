@@ -22,10 +22,14 @@ Usage:
     # Verify existing indexes match generated ones
     python scripts/generate-country-indexes.py --verify
 
+    # Time discovery, parsing and writing per framework
+    python scripts/generate-country-indexes.py --profile
+
 Options:
     --dry-run          Show what would be generated without writing files
     --framework NAME   Only generate index for specific framework directory
     --verify           Verify existing indexes match generated ones
+    --profile [PATH]   Print per-phase timings and write a Chrome trace
 
 Output Structure:
     {
@@ -42,29 +46,37 @@ Output Structure:
       ]
     }
 
+"last_updated" is the newest last_updated of the framework's YAML files, so
+regenerating unchanged data leaves every index byte-identical.
+
 Author: OpenPIIMap Team
 Date: November 20, 2025
 """
 
-import os
 import sys
 import json
-import yaml
 import argparse
 from pathlib import Path
-from datetime import datetime
 from typing import Dict, List, Any
-from collections import defaultdict
 
+from corpus import Jurisdiction, load_corpus
+from output_writer import write_if_changed
+from profiling import DEFAULT_TRACE_PATH, profiled, profiler
 
-def load_yaml_file(file_path: Path) -> Dict[str, Any]:
-    """Load and parse a YAML file."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
-    except Exception as e:
-        print(f"❌ Error loading {file_path}: {e}")
-        return None
+
+def load_framework_jurisdictions(framework_dir: Path) -> List[Jurisdiction]:
+    """Return the parsed YAML files of a framework directory from the shared corpus."""
+    corpus = load_corpus(framework_dir.parent)
+    jurisdictions = []
+    for jurisdiction in corpus.by_framework(framework_dir.name):
+        # Only direct children, matching the historical *.yaml / *.yml glob
+        if jurisdiction.path.parent != corpus.data_dir / framework_dir.name:
+            continue
+        if jurisdiction.error is not None:
+            print(f"❌ Error loading {jurisdiction.path}: {jurisdiction.error}")
+            continue
+        jurisdictions.append(jurisdiction)
+    return jurisdictions
 
 
 def generate_slug(country_name: str, filename: str) -> str:
@@ -83,17 +95,18 @@ def generate_slug(country_name: str, filename: str) -> str:
     return slug
 
 
-def extract_metadata_from_yaml(yaml_path: Path) -> Dict[str, Any]:
+def extract_metadata_from_yaml(jurisdiction: Jurisdiction) -> Dict[str, Any]:
     """
-    Extract relevant metadata from a YAML file for country index.
+    Extract relevant metadata from a parsed YAML file for country index.
     
     Args:
-        yaml_path: Path to the YAML file
+        jurisdiction: Parsed YAML file from the corpus
     
     Returns:
         Dictionary with country metadata or None if invalid
     """
-    data = load_yaml_file(yaml_path)
+    data = jurisdiction.data
+    yaml_path = jurisdiction.path
     if not data:
         return None
     
@@ -141,7 +154,8 @@ def extract_metadata_from_yaml(yaml_path: Path) -> Dict[str, Any]:
         "slug": slug,
         "path": path_str,
         "status": status,
-        "category_count": category_count
+        "category_count": category_count,
+        "last_updated": str(data.get('last_updated') or '')
     }
 
 
@@ -157,11 +171,9 @@ def scan_framework_directory(framework_dir: Path) -> List[Dict[str, Any]]:
     """
     countries = []
     
-    # Find all YAML files in the directory (excluding country-index.json)
-    yaml_files = list(framework_dir.glob("*.yaml")) + list(framework_dir.glob("*.yml"))
-    
-    for yaml_file in yaml_files:
-        metadata = extract_metadata_from_yaml(yaml_file)
+    # All YAML files in the directory (excluding country-index.json)
+    for jurisdiction in load_framework_jurisdictions(framework_dir):
+        metadata = extract_metadata_from_yaml(jurisdiction)
         if metadata:
             countries.append(metadata)
     
@@ -248,23 +260,27 @@ def generate_country_index(framework_dir: Path, framework_name: str = None) -> D
         framework = framework_name
     else:
         # Try to get from first YAML file
-        first_yaml = list(framework_dir.glob("*.yaml"))[0]
-        data = load_yaml_file(first_yaml)
-        framework = data.get('framework', framework_dir.name.upper())
+        first_yaml = load_framework_jurisdictions(framework_dir)[0]
+        framework = first_yaml.get('framework', framework_dir.name.upper())
     
     # Determine region
     region = determine_region(framework, countries)
     
-    # Remove category_count from output (used only for status determination)
+    # The index is as recent as its newest file, so regenerating unchanged
+    # data reproduces the same bytes
+    last_updated = max(country['last_updated'] for country in countries)
+    
+    # Remove category_count and last_updated from output (used only for
+    # status and the index date)
     for country in countries:
-        if 'category_count' in country:
-            del country['category_count']
+        country.pop('category_count', None)
+        country.pop('last_updated', None)
     
     # Generate index structure
     index = {
         "framework": framework,
         "region": region,
-        "last_updated": datetime.now().strftime("%Y-%m-%d"),
+        "last_updated": last_updated,
         "countries": countries
     }
     
@@ -288,10 +304,13 @@ def write_country_index(framework_dir: Path, index_data: Dict[str, Any], dry_run
         return
     
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(index_data, f, indent=2, ensure_ascii=False)
-            f.write('\n')  # Add trailing newline
-        print(f"✅ Generated: {output_path}")
+        # Trailing newline; an unchanged index is not rewritten
+        with profiler.phase("write", file=f"data/{framework_dir.name}/{output_path.name}"):
+            written = write_if_changed(output_path, json.dumps(index_data, indent=2, ensure_ascii=False) + '\n')
+        if written:
+            print(f"✅ Generated: {output_path}")
+        else:
+            print(f"✅ Unchanged: {output_path}")
     except Exception as e:
         print(f"❌ Error writing {output_path}: {e}")
 
@@ -357,6 +376,13 @@ def main():
         action='store_true',
         help="Verify existing indexes match generated ones"
     )
+    parser.add_argument(
+        '--profile',
+        nargs='?',
+        const=DEFAULT_TRACE_PATH,
+        metavar='PATH',
+        help=f"Print per-phase timings and write a Chrome trace (default: {DEFAULT_TRACE_PATH})"
+    )
     
     args = parser.parse_args()
     
@@ -377,33 +403,35 @@ def main():
             print(f"❌ Framework directory not found: {framework_dirs[0]}")
             sys.exit(1)
     else:
-        framework_dirs = [d for d in data_dir.iterdir() if d.is_dir()]
+        framework_dirs = sorted(d for d in data_dir.iterdir() if d.is_dir())
     
     # Process each framework directory
     success_count = 0
     error_count = 0
     verified_count = 0
     
-    for framework_dir in sorted(framework_dirs):
-        print(f"\n📁 Processing: {framework_dir.name}")
+    with profiled(args.profile):
+        for framework_dir in sorted(framework_dirs):
+            print(f"\n📁 Processing: {framework_dir.name}")
         
-        # Generate index
-        index_data = generate_country_index(framework_dir)
+            # Generate index
+            with profiler.step("country-index", file=f"data/{framework_dir.name}"):
+                index_data = generate_country_index(framework_dir)
         
-        if not index_data:
-            error_count += 1
-            continue
+            if not index_data:
+                error_count += 1
+                continue
         
-        if args.verify:
-            # Verify mode
-            if verify_country_index(framework_dir, index_data):
-                verified_count += 1
+            if args.verify:
+                # Verify mode
+                if verify_country_index(framework_dir, index_data):
+                    verified_count += 1
+                else:
+                    error_count += 1
             else:
-                error_count += 1
-        else:
-            # Generate mode
-            write_country_index(framework_dir, index_data, args.dry_run)
-            success_count += 1
+                # Generate mode
+                write_country_index(framework_dir, index_data, args.dry_run)
+                success_count += 1
     
     # Summary
     print("\n" + "=" * 60)
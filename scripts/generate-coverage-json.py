@@ -1,9 +1,12 @@
 import os
 import json
 
+from output_writer import write_if_changed
+
 def collect_country_indexes(base_path='data'):
     coverage = {}
-    for root, _, files in os.walk(base_path):
+    for root, dirs, files in os.walk(base_path):
+        dirs.sort()
         if "country-index.json" in files:
             framework = os.path.basename(root)
             with open(os.path.join(root, "country-index.json"), "r", encoding="utf-8") as f:
@@ -11,13 +14,16 @@ def collect_country_indexes(base_path='data'):
                 if "countries" in index and "framework" in index:
                     countries = [c["name"] for c in index["countries"]]
                     coverage[index["framework"]] = sorted(countries)
-    return coverage
+    return {framework: coverage[framework] for framework in sorted(coverage)}
 
 def write_coverage_file(output_path="coverage.json"):
     coverage = collect_country_indexes()
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(coverage, f, indent=2, ensure_ascii=False)
+    write_if_changed(output_path, json.dumps(coverage, indent=2, ensure_ascii=False))
     print(f"✅ coverage.json written with {len(coverage)} frameworks.")
 
-if __name__ == "__main__":
+def main():
     write_coverage_file()
+    return 0
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import os
 import json
-from jinja2 import Environment, FileSystemLoader
+from output_writer import write_if_changed
+from templating import get_environment
 
 # Paths
 JSON_ROOT = "./site/json"                     # Source directory of JSON files
@@ -11,16 +12,16 @@ TEMPLATE_DIR = "scripts/templates"         # Where your Jinja template lives
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 # Prepare Jinja2 environment
-env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+env = get_environment(TEMPLATE_DIR)
 template = env.get_template("country_template.html")
 
 # Loop through all frameworks and country JSONs
-for framework in os.listdir(JSON_ROOT):
+for framework in sorted(os.listdir(JSON_ROOT)):
     framework_path = os.path.join(JSON_ROOT, framework)
     if not os.path.isdir(framework_path):
         continue
 
-    for filename in os.listdir(framework_path):
+    for filename in sorted(os.listdir(framework_path)):
         if not filename.endswith(".json"):
             continue
 
@@ -31,14 +32,16 @@ for framework in os.listdir(JSON_ROOT):
         with open(json_path, "r", encoding="utf-8") as f:
             data = json.load(f)
 
+        json_text = json.dumps(data, indent=2, ensure_ascii=False)
         html = template.render(
             country=data.get("country", base_name),
             framework=data.get("framework", framework),
             categories=data.get("categories", []),
-            json_data=json.dumps(data, indent=2, ensure_ascii=False)
+            json_data=json_text,
+            json_size=len(json_text),
+            json_url=f"../json/{framework}/{base_name}.json"
         )
 
-        with open(html_path, "w", encoding="utf-8") as f:
-            f.write(html)
+        write_if_changed(html_path, html)
 
 print("✅ All HTML country pages generated in 'site/countries'")
\ No newline at end of file
@@ -1,5 +1,7 @@
 import os
 
+from output_writer import write_if_changed
+
 COUNTRIES_DIR = "./site/countries"
 OUTPUT_PATH = "./site/index.html"
 
@@ -51,8 +53,6 @@ index_html = f"""<!DOCTYPE html>
 """
 
 # Write to file
-os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
-with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-    f.write(index_html)
+write_if_changed(OUTPUT_PATH, index_html)
 
 print("✅ index.html generated in 'site/'")
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Change timeline of the corpus, read from git history in one pass.
+
+The hand-edited last_updated of a YAML says when someone last remembered to
+bump it; git says when the file actually changed. load_timeline() runs a
+single `git log --patch --unified=0` over the YAML files under data/ and
+derives, per jurisdiction:
+
+- when it was added, last changed and (if so) removed, and in how many commits
+- for every commit, the categories it added and removed (from the
+  `- name:` lines of the diff, so no revision is ever checked out or parsed)
+- for every current category, the commit and date that added it
+
+The result is cached in .openpiimap-cache/git-timeline.json together with
+the HEAD it describes. When HEAD has not moved nothing but `git rev-parse`
+runs; when it moved forward only the new commits are read and applied; on a
+rewritten history the timeline is rebuilt. Outside a git checkout (or
+without git) load_timeline() returns None and callers fall back to
+last_updated.
+
+Only the first-parent history is followed, with merges diffed against their
+first parent, so changes arrive in the order they landed on the branch.
+Shallow clones see their oldest commit as adding every file; fetch the full
+history (e.g. fetch-depth: 0) for accurate dates.
+
+Timeline Structure:
+    {
+      "version": 1,
+      "head": "<sha>",
+      "jurisdictions": {
+        "gdpr/france": {
+          "path": "data/gdpr/france.yaml",
+          "added": "2025-06-26T09:12:00+00:00",
+          "last_changed": "2025-08-14T16:40:00+00:00",
+          "removed": null,
+          "commits": 3,
+          "categories": {"Email Address": {"added": "2025-06-26T...", "commit": "<sha>"}},
+          "history": [
+            {"commit": "<sha>", "time": "...", "subject": "...", "status": "M",
+             "added": ["Biometric Data"], "removed": []}
+          ]
+        }
+      }
+    }
+"""
+
+import json
+import re
+import subprocess
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+from corpus import CACHE_DIR, DATA_DIR, YAML_SUFFIXES, parse_yaml
+from output_writer import write_if_changed
+from profiling import profiler
+
+TIMELINE_VERSION = 1
+TIMELINE_CACHE_NAME = "git-timeline.json"
+
+# Start of a commit in the log output: NUL, hash, commit time, subject
+COMMIT_FORMAT = "%x00%H%x09%ct%x09%s"
+_NAME_RE = re.compile(r"^[+-]\s*- name:\s*(.*?)\s*$")
+
+
+def run_git(repo: Path, *args: str, check: bool = True, input: Optional[bytes] = None) -> subprocess.CompletedProcess:
+    """Run git in repo and capture its output as bytes."""
+    return subprocess.run(["git", "-C", str(repo), *args], input=input, capture_output=True, check=check)
+
+
+def _category_name(value: str) -> str:
+    """Scalar of a `- name:` line, unquoted the way YAML would."""
+    try:
+        parsed = parse_yaml(value)
+    except yaml.YAMLError:
+        return value
+    return str(parsed) if parsed is not None else ""
+
+
+def _iso(timestamp: str) -> str:
+    return datetime.fromtimestamp(int(timestamp), timezone.utc).isoformat()
+
+
+def parse_log(output: str) -> Iterator[Dict[str, Any]]:
+    """
+    Split `git log --patch --unified=0` output into commits.
+
+    Yields:
+        {"commit", "time", "subject", "files": [{"status", "path", "old_path",
+        "added": Counter, "removed": Counter}]}
+    """
+    commit = None
+    current = None
+    in_hunk = False
+    for line in output.split("\n"):
+        if line.startswith("\0"):
+            if commit is not None:
+                yield commit
+            sha, timestamp, subject = (line[1:].split("\t", 2) + ["", ""])[:3]
+            commit = {"commit": sha, "time": _iso(timestamp), "subject": subject, "files": []}
+            current = None
+            continue
+        if commit is None:
+            continue
+        if line.startswith("diff --git "):
+            # The a/ and b/ paths are taken from the ---/+++ and rename lines below
+            current = {"status": "M", "path": None, "old_path": None, "added": Counter(), "removed": Counter()}
+            commit["files"].append(current)
+            in_hunk = False
+            continue
+        if current is None:
+            continue
+        if not in_hunk:
+            if line.startswith("new file mode"):
+                current["status"] = "A"
+            elif line.startswith("deleted file mode"):
+                current["status"] = "D"
+            elif line.startswith("rename from "):
+                current["status"] = "R"
+                current["old_path"] = line[len("rename from "):]
+            elif line.startswith("rename to "):
+                current["path"] = line[len("rename to "):]
+            elif line.startswith("--- ") and line != "--- /dev/null":
+                current["old_path"] = current["old_path"] or line[len("--- a/"):]
+            elif line.startswith("+++ ") and line != "+++ /dev/null":
+                current["path"] = line[len("+++ b/"):]
+            elif line.startswith("@@"):
+                in_hunk = True
+            continue
+        if line.startswith("@@"):
+            continue
+        match = _NAME_RE.match(line)
+        if match:
+            (current["added"] if line[0] == "+" else current["removed"])[_category_name(match.group(1))] += 1
+    if commit is not None:
+        yield commit
+
+
+class Timeline:
+    """Per-jurisdiction change history up to one commit."""
+
+    def __init__(self, data_prefix: str, head: Optional[str] = None,
+                 jurisdictions: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Args:
+            data_prefix: data/ relative to the repository root, e.g. "data/"
+            head: Commit the timeline describes
+            jurisdictions: Records by key ("gdpr/france")
+        """
+        self.data_prefix = data_prefix
+        self.head = head
+        self.jurisdictions = jurisdictions or {}
+
+    def key(self, path: Optional[str]) -> Optional[str]:
+        """Jurisdiction key of a repository path, or None outside data/."""
+        if not path or not path.startswith(self.data_prefix):
+            return None
+        rel = Path(path[len(self.data_prefix):])
+        if rel.suffix not in YAML_SUFFIXES:
+            return None
+        return rel.with_suffix("").as_posix()
+
+    def apply(self, commit: Dict[str, Any]):
+        """Extend the timeline by one commit, in history order."""
+        for change in commit["files"]:
+            key = self.key(change["path"] or change["old_path"])
+            status = change["status"]
+            if status == "R" and key is None:
+                # Moved out of data/
+                key, status = self.key(change["old_path"]), "D"
+            if key is None:
+                continue
+            if status == "R":
+                old_key = self.key(change["old_path"])
+                if old_key in self.jurisdictions:
+                    # The history moves with the file
+                    self.jurisdictions[key] = self.jurisdictions.pop(old_key)
+
+            record = self.jurisdictions.get(key)
+            if record is None or (status == "A" and record["removed"]):
+                record = self.jurisdictions[key] = {
+                    "path": None, "added": commit["time"], "last_changed": None, "removed": None,
+                    "commits": 0, "categories": {}, "history": [],
+                }
+            record["path"] = change["old_path"] if status == "D" else change["path"] or change["old_path"]
+            record["last_changed"] = commit["time"]
+            record["commits"] += 1
+            record["removed"] = commit["time"] if status == "D" else None
+
+            added = sorted((change["added"] - change["removed"]).elements())
+            removed = sorted((change["removed"] - change["added"]).elements())
+            for name in removed:
+                record["categories"].pop(name, None)
+            for name in added:
+                record["categories"].setdefault(name, {"added": commit["time"], "commit": commit["commit"]})
+            if status == "D":
+                record["categories"] = {}
+            record["history"].append({
+                "commit": commit["commit"],
+                "time": commit["time"],
+                "subject": commit["subject"],
+                "status": status,
+                "added": added,
+                "removed": removed,
+            })
+        self.head = commit["commit"]
+
+    def freshness(self, key: str) -> Optional[Dict[str, Any]]:
+        """First-added and last-changed dates (YYYY-MM-DD) and commit count of a live jurisdiction."""
+        record = self.jurisdictions.get(key)
+        if record is None or record["removed"]:
+            return None
+        return {
+            "added": record["added"][:10],
+            "last_changed": record["last_changed"][:10],
+            "commits": record["commits"],
+        }
+
+    def recent_changes(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """The latest per-jurisdiction changes, newest first."""
+        changes = [
+            dict(change, jurisdiction=key)
+            for key, record in self.jurisdictions.items()
+            for change in record["history"]
+        ]
+        changes.sort(key=lambda c: (c["time"], c["jurisdiction"]), reverse=True)
+        return changes[:limit]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": TIMELINE_VERSION,
+            "data_prefix": self.data_prefix,
+            "head": self.head,
+            "jurisdictions": {key: self.jurisdictions[key] for key in sorted(self.jurisdictions)},
+        }
+
+
+def _read_log(repo: Path, data_prefix: str, revisions: str) -> Iterator[Dict[str, Any]]:
+    pathspecs = [f":(glob){data_prefix}**/*{suffix}" for suffix in sorted(YAML_SUFFIXES)]
+    result = run_git(
+        repo, "-c", "core.quotePath=false", "log", "--reverse", "--first-parent",
+        "--diff-merges=first-parent", "--patch", "--unified=0", "--find-renames", "--no-color",
+        f"--format={COMMIT_FORMAT}", revisions, "--", *pathspecs,
+    )
+    return parse_log(result.stdout.decode("utf-8", "replace"))
+
+
+def repository(data_dir: Path) -> Optional[Tuple[Path, str, str]]:
+    """(repository root, data/ prefix, HEAD) or None outside a git checkout."""
+    try:
+        result = run_git(data_dir, "rev-parse", "--show-toplevel", "--show-prefix", "HEAD", check=False)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    root, prefix, head = result.stdout.decode("utf-8").splitlines()[:3]
+    return Path(root), prefix, head
+
+
+def load_timeline(data_dir: Path = DATA_DIR, cache_dir: Path = CACHE_DIR) -> Optional[Timeline]:
+    """
+    Return the timeline of data_dir at HEAD, reading only commits the cache lacks.
+
+    Returns None when data_dir is not in a git checkout or git is unavailable.
+    """
+    with profiler.phase("git-timeline", "step"):
+        located = repository(Path(data_dir))
+        if located is None:
+            return None
+        repo, data_prefix, head = located
+        cache_path = Path(cache_dir) / TIMELINE_CACHE_NAME
+
+        timeline = None
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+            if raw.get("version") == TIMELINE_VERSION and raw.get("data_prefix") == data_prefix:
+                timeline = Timeline(data_prefix, raw.get("head"), raw.get("jurisdictions"))
+        except (OSError, ValueError):
+            pass
+
+        if timeline is not None and timeline.head == head:
+            return timeline
+        if timeline is not None and timeline.head:
+            ancestor = run_git(repo, "merge-base", "--is-ancestor", timeline.head, head, check=False)
+            revisions = f"{timeline.head}..{head}" if ancestor.returncode == 0 else None
+        else:
+            revisions = None
+        if revisions is None:
+            # No cache, or history was rewritten: start over
+            timeline, revisions = Timeline(data_prefix), head
+
+        try:
+            for commit in _read_log(repo, data_prefix, revisions):
+                timeline.apply(commit)
+        except subprocess.CalledProcessError:
+            return None
+        timeline.head = head
+
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(cache_path, json.dumps(timeline.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n")
+        return timeline
@@ -1,42 +1,57 @@
-import os
-import yaml
+from corpus import DATA_DIR, load_corpus
+from profiling import profiler
  
 REQUIRED_KEYS_ORDER = [
     "name", "type", "subtype", "required_masking", "tags", "citations"
 ]
 
-def lint_yaml_file(file_path):
+SEVERITY_MARKERS = {"warning": "⚠️", "error": "❌"}
+
+def find_lint_issues(data):
+    """Return (location, severity, message) tuples for one parsed document"""
     issues = []
-    with open(file_path, 'r', encoding='utf-8') as f:
-        try:
-            data = yaml.safe_load(f)
-            categories = data.get("categories", [])
-            for idx, category in enumerate(categories):
-                keys = list(category.keys())
-                # Warn if keys are out of order
-                if keys != sorted(keys, key=lambda k: REQUIRED_KEYS_ORDER.index(k) if k in REQUIRED_KEYS_ORDER else 999):
-                    issues.append(f"{file_path} - category {idx+1}: ⚠️ field order mismatch")
-                # Warn if tags are missing or empty
-                if "tags" not in category or not category["tags"]:
-                    issues.append(f"{file_path} - category {idx+1}: ⚠️ missing or empty tags")
-                # Warn if citations missing expected fields
-                for cidx, citation in enumerate(category.get("citations", [])):
-                    if not any(k in citation for k in ["regulation", "national_law", "authority"]):
-                        issues.append(f"{file_path} - category {idx+1}, citation {cidx+1}: ❌ missing 'regulation' or national equivalent")
-        except yaml.YAMLError as e:
-            issues.append(f"{file_path} - YAML error: {str(e)}")
+    categories = data.get("categories", [])
+    # Malformed structure is reported rather than linted
+    if not isinstance(categories, list):
+        return [("categories", "error", "'categories' is not a list")]
+    for idx, category in enumerate(categories):
+        location = f"category {idx+1}"
+        if not isinstance(category, dict):
+            issues.append((location, "error", "category is not a mapping"))
+            continue
+        keys = list(category.keys())
+        # Warn if keys are out of order
+        if keys != sorted(keys, key=lambda k: REQUIRED_KEYS_ORDER.index(k) if k in REQUIRED_KEYS_ORDER else 999):
+            issues.append((location, "warning", "field order mismatch"))
+        # Warn if tags are missing or empty
+        if "tags" not in category or not category["tags"]:
+            issues.append((location, "warning", "missing or empty tags"))
+        # Warn if citations missing expected fields
+        citations = category.get("citations", [])
+        for cidx, citation in enumerate(citations if isinstance(citations, list) else []):
+            if not isinstance(citation, dict) or not any(k in citation for k in ["regulation", "national_law", "authority"]):
+                issues.append((f"{location}, citation {cidx+1}", "error", "missing 'regulation' or national equivalent"))
     return issues
 
-def lint_all_yamls(base_path="data"):
+def lint_document(file_path, data):
+    return [
+        f"{file_path} - {location}: {SEVERITY_MARKERS[severity]} {message}"
+        for location, severity, message in find_lint_issues(data)
+    ]
+
+def lint_jurisdiction(jurisdiction):
+    if jurisdiction.error is not None:
+        return [f"{jurisdiction.rel_path} - YAML error: {jurisdiction.error}"]
+    return lint_document(jurisdiction.rel_path, jurisdiction.data)
+
+def lint_all_yamls(base_path=DATA_DIR):
     all_issues = []
-    for root, _, files in os.walk(base_path):
-        for file in files:
-            if file.endswith(".yaml"):
-                full_path = os.path.join(root, file)
-                all_issues.extend(lint_yaml_file(full_path))
+    for jurisdiction in load_corpus(base_path):
+        with profiler.phase("validate", file=jurisdiction.rel_path, check="lint"):
+            all_issues.extend(lint_jurisdiction(jurisdiction))
     return all_issues
 
-if __name__ == "__main__":
+def main():
     issues = lint_all_yamls()
     if not issues:
         print("✅ All YAML files passed lint checks.")
@@ -44,3 +59,8 @@ if __name__ == "__main__":
         print(f"❌ {len(issues)} issue(s) found:\n")
         for issue in issues:
             print(issue)
+    # Lint findings are warnings and don't fail the run
+    return 0
+
+if __name__ == "__main__":
+    main()
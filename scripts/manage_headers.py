@@ -6,37 +6,34 @@ Provides easy commands for managing consistent headers across the site.
 
 import sys
 import argparse
-import subprocess
 import os
+import traceback
 
 def run_header_update():
-    """Run the header update script"""
+    """Run the header update script in-process"""
     print("🔄 Running header update...")
-    result = subprocess.run([sys.executable, "scripts/update_headers.py"], 
-                          capture_output=True, text=True)
-    
-    if result.returncode == 0:
-        print(result.stdout)
-        print("✅ Headers updated successfully!")
-    else:
+    try:
+        # Imported lazily so `check`/`help` don't load jinja2
+        import update_headers
+        update_headers.main()
+    except Exception:
         print("❌ Header update failed:")
-        print(result.stderr)
+        traceback.print_exc()
         return False
+    print("✅ Headers updated successfully!")
     return True
 
 def run_build():
-    """Run the full site build"""
+    """Run the full site build in-process"""
     print("🚀 Running full site build...")
-    result = subprocess.run([sys.executable, "scripts/build_static_site.py"], 
-                          capture_output=True, text=True)
-    
-    if result.returncode == 0:
-        print(result.stdout)
-        print("✅ Site built successfully!")
-    else:
+    try:
+        import build_static_site
+        build_static_site.main([])
+    except (Exception, SystemExit):
         print("❌ Site build failed:")
-        print(result.stderr)
+        traceback.print_exc()
         return False
+    print("✅ Site built successfully!")
     return True
 
 def check_template():
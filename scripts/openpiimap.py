@@ -1,34 +1,328 @@
+#!/usr/bin/env python3
+"""
+OpenPIIMap CLI Toolkit
+
+Runs every subcommand in-process. The scripts behind each command are only
+imported when that command runs, so `--help` never pays for yaml, jsonschema
+or jinja2, and commands that run several scripts (validate-all) share one
+parsed corpus instead of re-parsing data/ per script.
+
+Usage:
+    python scripts/openpiimap.py validate
+    python scripts/openpiimap.py validate-all
+    python scripts/openpiimap.py lint
+
+    # Schema, lint, paths and type audit in one pass over data/
+    python scripts/openpiimap.py check
+    python scripts/openpiimap.py check --only schema lint --json check-report.json
+
+    # Label warehouse column names with PII categories
+    python scripts/openpiimap.py classify cust_email dob ssn_last4 --framework GDPR
+    python scripts/openpiimap.py classify --file columns.txt --format json
+
+    # Report which categories of a jurisdiction a CSV/JSONL file contains
+    python scripts/openpiimap.py scan customers.csv --jurisdiction data/gdpr/france.yaml
+    python scripts/openpiimap.py scan events.jsonl --jurisdiction hipaa/usa --sample-rate 0.1
+
+    # Serve the corpus over HTTP on localhost
+    python scripts/openpiimap.py serve --port 8080
+
+    # What changed between two corpus versions (git revisions or directories)
+    python scripts/openpiimap.py delta v1.2.0
+    python scripts/openpiimap.py delta HEAD~1 HEAD --json delta.json --feed site/json/feed
+
+    # Time any command per phase and per file (summary + Chrome trace)
+    python scripts/openpiimap.py --profile trace.json check
+"""
+
 import argparse
+import json
 import sys
-from subprocess import run
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from script_loader import load_script
+
+
+def run_script(name, *args):
+    """Run a script's main() in-process and return its exit code."""
+    main = load_script(name).main
+    return (main(list(args)) if args else main()) or 0
+
+
+def run_check(args):
+    """Run the selected check passes over one corpus load and report the result."""
+    from checks import PASSES, print_summary, run_checks
+    from corpus import load_corpus
+
+    unknown = [name for name in args.only or [] if name not in PASSES]
+    if unknown:
+        print(f"❌ Unknown check(s): {', '.join(unknown)} (available: {', '.join(PASSES)})")
+        return 2
+
+    report = run_checks(load_corpus(), args.only)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    if args.format == 'json':
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        print_summary(report, verbose=args.verbose)
+        if args.json:
+            print(f"📁 Report written to {args.json}")
+
+    return 1 if report["summary"]["errors"] else 0
+
+
+def run_classify(args):
+    """Classify column names given on the command line or in a file."""
+    from column_classifier import ColumnClassifier, load_synonyms
+    from corpus import load_corpus
+
+    columns = list(args.columns)
+    if args.file:
+        handle = sys.stdin if args.file == '-' else open(args.file, 'r', encoding='utf-8')
+        with handle:
+            columns.extend(line.strip() for line in handle if line.strip())
+    if not columns:
+        print("❌ No column names given (pass them as arguments or with --file)")
+        return 2
+
+    synonyms = load_synonyms(args.synonyms) if args.synonyms else None
+    classifier = ColumnClassifier(load_corpus(), framework=args.framework, country=args.country,
+                                  synonyms=synonyms, top_k=args.top, min_score=args.min_score)
+    results = classifier.classify_many(columns)
 
-def main():
+    if args.format == 'json':
+        report = [
+            {"column": column, "matches": [m.to_dict() for m in matches]}
+            for column, matches in zip(columns, results)
+        ]
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return 0
+
+    for column, matches in zip(columns, results):
+        if not matches:
+            print(f"  {column}: no PII match")
+            continue
+        best = matches[0]
+        masking = "masking required" if best.required_masking else "no masking"
+        print(f"🔍 {column}: {best.name} ({best.score:.2f}) - {best.type}, {masking}")
+        for other in matches[1:]:
+            print(f"     also: {other.name} ({other.score:.2f})")
+    return 0
+
+
+def run_scan(args):
+    """Scan a CSV/JSONL dataset for the categories of one jurisdiction."""
+    from corpus import load_corpus
+    from dataset_scanner import print_report, resolve_jurisdiction, scan_file
+
+    corpus = load_corpus()
+    try:
+        jurisdiction = resolve_jurisdiction(corpus, args.jurisdiction)
+        report = scan_file(Path(args.file), corpus, jurisdiction, fmt=args.format,
+                           sample_rate=args.sample_rate, jobs=args.jobs,
+                           chunk_size=args.chunk_size * 1024 * 1024,
+                           min_hit_rate=args.min_hit_rate, max_values=args.max_values,
+                           min_score=args.min_score, seed=args.seed)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 2
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    if args.output == 'json':
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        print_report(report, verbose=args.verbose)
+        if args.json:
+            print(f"📁 Report written to {args.json}")
+    return 0
+
+
+def run_serve(args):
+    """Load the corpus once and serve the HTTP API until interrupted."""
+    from api_server import Api, serve
+    from corpus import load_corpus
+    from git_timeline import load_timeline
+
+    api = Api(load_corpus(), load_timeline())
+    try:
+        serve(api, host=args.host, port=args.port, workers=args.workers,
+              ready=lambda address: print(f"🌐 Serving OpenPIIMap API on http://{address[0]}:{address[1]} "
+                                          f"({args.workers} worker(s), Ctrl+C to stop)", flush=True))
+    except OSError as e:
+        print(f"❌ {e}")
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def run_delta(args):
+    """Diff two corpus snapshots and print, save or publish the delta."""
+    from corpus import DATA_DIR
+    from corpus_delta import compute_delta, directory_snapshot, load_snapshot, print_delta, write_feed
+
+    try:
+        old = load_snapshot(args.old)
+        new = load_snapshot(args.new) if args.new else directory_snapshot(DATA_DIR, "working tree")
+        delta = compute_delta(old, new)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 2
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(delta, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+    if args.format == 'json':
+        json.dump(delta, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+    else:
+        print_delta(delta, verbose=args.verbose)
+        if args.json:
+            print(f"📁 Delta written to {args.json}")
+
+    if args.feed:
+        if delta['from']['id'] == delta['to']['id']:
+            print(f"⚠️  Snapshots hold the same files, nothing published to {args.feed}")
+        else:
+            entry = write_feed(delta, Path(args.feed))
+            print(f"📦 Published {entry['path']} ({entry['bytes']:,} bytes) to {args.feed}", file=sys.stderr
+                  if args.format == 'json' else sys.stdout)
+    return 0
+
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description='OpenPIIMap CLI Toolkit')
+    parser.add_argument('--profile', nargs='?', const='profile-trace.json', metavar='PATH',
+                        help="Print per-phase timings and peak RSS, and write a Chrome trace "
+                             "(default: profile-trace.json)")
     subparsers = parser.add_subparsers(dest='command')
 
-    subparsers.add_parser('validate', help='Run YAML schema validation')
-    subparsers.add_parser('validate-all', help='Run all validations (schema + paths)')
+    for name, help_text in [('validate', 'Run YAML schema validation'),
+                            ('validate-all', 'Run all validations (schema + paths)')]:
+        validate_parser = subparsers.add_parser(name, help=help_text)
+        validate_parser.add_argument('--jobs', '-j', type=int, default=1,
+                                     help="Worker processes for schema validation (0 = one per CPU)")
     subparsers.add_parser('validate-paths', help='Run country index path validation')
     subparsers.add_parser('lint', help='Run YAML lint checks')
+    subparsers.add_parser('format', help='Reformat YAML files into the recommended field order')
     subparsers.add_parser('generate-coverage', help='Regenerate coverage.json')
 
-    args = parser.parse_args()
+    check_parser = subparsers.add_parser('check', help='Run schema, lint, path and type checks in a single pass')
+    check_parser.add_argument('--only', nargs='+', metavar='CHECK',
+                              help="Run only these checks (schema, lint, paths, types)")
+    check_parser.add_argument('--json', metavar='PATH', help="Also write the full report to PATH as JSON")
+    check_parser.add_argument('--format', choices=['text', 'json'], default='text',
+                              help="Print a human summary (default) or the JSON report")
+    check_parser.add_argument('--verbose', '-v', action='store_true',
+                              help="List warnings as well as errors in the summary")
+
+    classify_parser = subparsers.add_parser('classify', help='Match column names to PII categories')
+    classify_parser.add_argument('columns', nargs='*', help="Column names to classify")
+    classify_parser.add_argument('--file', metavar='PATH', help="Read column names from PATH, one per line ('-' for stdin)")
+    classify_parser.add_argument('--framework', help="Only match categories from this framework")
+    classify_parser.add_argument('--country', help="Only match categories from this country")
+    classify_parser.add_argument('--synonyms', metavar='PATH', help="YAML mapping of extra abbreviations to expansions")
+    classify_parser.add_argument('--top', type=int, default=3, help="Matches to report per column (default: 3)")
+    classify_parser.add_argument('--min-score', type=float, default=0.35, help="Drop matches scoring below this (default: 0.35)")
+    classify_parser.add_argument('--format', choices=['text', 'json'], default='text', help="Output format")
+
+    scan_parser = subparsers.add_parser('scan', help='Report the PII categories present in a CSV/JSONL file')
+    scan_parser.add_argument('file', help="CSV, TSV or JSONL file to scan")
+    scan_parser.add_argument('--jurisdiction', required=True,
+                             help="Jurisdiction file or framework/country, e.g. data/gdpr/france.yaml or hipaa/usa")
+    scan_parser.add_argument('--format', choices=['csv', 'tsv', 'jsonl'],
+                             help="Input format (default: from the file suffix)")
+    scan_parser.add_argument('--sample-rate', type=float, default=1.0,
+                             help="Share of rows whose values are checked (default: 1.0)")
+    scan_parser.add_argument('--min-hit-rate', type=float, default=0.05,
+                             help="Share of a column's values that must match before it counts (default: 0.05)")
+    scan_parser.add_argument('--max-values', type=int, default=5000,
+                             help="Values checked per column in each chunk, 0 = all (default: 5000)")
+    scan_parser.add_argument('--min-score', type=float, default=0.75,
+                             help="Lowest column-name match score reported (default: 0.75)")
+    scan_parser.add_argument('--jobs', '-j', type=int, default=0, help="Worker processes (default: one per CPU)")
+    scan_parser.add_argument('--chunk-size', type=int, default=32, metavar='MB',
+                             help="Approximate size of each work unit in MB (default: 32)")
+    scan_parser.add_argument('--seed', type=int, default=0, help="Sampling seed")
+    scan_parser.add_argument('--json', metavar='PATH', help="Also write the full report to PATH as JSON")
+    scan_parser.add_argument('--output', choices=['text', 'json'], default='text',
+                             help="Print a human summary (default) or the JSON report")
+    scan_parser.add_argument('--verbose', '-v', action='store_true',
+                             help="List every column and uncovered value patterns")
+
+    serve_parser = subparsers.add_parser('serve', help='Serve the corpus over a local HTTP API')
+    serve_parser.add_argument('--host', default='127.0.0.1', help="Interface to listen on (default: 127.0.0.1)")
+    serve_parser.add_argument('--port', type=int, default=8080, help="Port to listen on (default: 8080)")
+    serve_parser.add_argument('--workers', type=int, default=1,
+                              help="Processes sharing the socket (default: 1; more than 1 needs fork)")
+
+    delta_parser = subparsers.add_parser('delta', help='Semantic diff between two corpus versions')
+    delta_parser.add_argument('old', help="Git revision, data directory or checkout to compare from")
+    delta_parser.add_argument('new', nargs='?',
+                              help="Git revision, data directory or checkout to compare to (default: data/)")
+    delta_parser.add_argument('--json', metavar='PATH', help="Also write the delta to PATH as JSON")
+    delta_parser.add_argument('--feed', metavar='DIR',
+                              help="Publish the delta to a feed directory (DIR/feed.json and DIR/deltas/)")
+    delta_parser.add_argument('--format', choices=['text', 'json'], default='text',
+                              help="Print a human summary (default) or the delta")
+    delta_parser.add_argument('--verbose', '-v', action='store_true', help="List every changed jurisdiction")
+
+    args = parser.parse_args(argv)
+    if args.profile and args.command:
+        from profiling import profiled
+        with profiled(args.profile):
+            return run_command(parser, args)
+    return run_command(parser, args)
+
 
+def run_command(parser, args):
     if args.command == 'validate':
-        run([sys.executable, 'scripts/validate-yamls.py'])
+        return run_script('validate-yamls', '--jobs', str(args.jobs))
     elif args.command == 'validate-all':
         print("Running all validations...")
-        result1 = run([sys.executable, 'scripts/validate-yamls.py'])
-        result2 = run([sys.executable, 'scripts/validate-paths.py'])
-        sys.exit(max(result1.returncode, result2.returncode))
+        result1 = run_script('validate-yamls', '--jobs', str(args.jobs))
+        result2 = run_script('validate-paths')
+        return max(result1, result2)
     elif args.command == 'validate-paths':
-        run([sys.executable, 'scripts/validate-paths.py'])
+        return run_script('validate-paths')
     elif args.command == 'lint':
-        run([sys.executable, 'scripts/lint-yamls.py'])
+        return run_script('lint-yamls')
+    elif args.command == 'format':
+        return run_script('reformat-yamls')
     elif args.command == 'generate-coverage':
-        run([sys.executable, 'scripts/generate-coverage-json.py'])
+        return run_script('generate-coverage-json')
+    elif args.command == 'check':
+        return run_check(args)
+    elif args.command == 'classify':
+        return run_classify(args)
+    elif args.command == 'scan':
+        return run_scan(args)
+    elif args.command == 'serve':
+        return run_serve(args)
+    elif args.command == 'delta':
+        return run_delta(args)
     else:
         parser.print_help()
+        return 0
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Deterministic output layer shared by the generators.
+
+Generated files only change when their bytes change. Unchanged outputs keep
+their mtimes, so rsync, CDN syncs, precompression and git see only real
+changes.
+
+- write_if_changed() replaces a single file atomically, and only when the new
+  bytes differ from what is on disk.
+- StagedOutput collects a whole build in a staging directory next to the
+  output tree. Nothing in the tree is touched until commit(), which moves in
+  only the files whose bytes changed and applies deletions. A build that
+  fails part-way leaves the previous tree as it was.
+
+Staged files are plain files, so worker processes can write into the same
+staging directory (see StagedOutput.attach()). Staging directories left
+behind by a killed build are removed by the next one once they are older
+than STALE_STAGING_AGE.
+
+Usage:
+    with StagedOutput("site") as output:
+        output.write_text("site/index.html", html)
+        with output.open_text("site/json/big.json") as f:
+            f.writelines(chunks)
+        output.remove("site/old.html")
+        stats = output.commit()
+"""
+
+import filecmp
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+PathLike = Union[str, os.PathLike]
+
+TMP_SUFFIX = ".tmp"
+
+
+def _same_bytes(path: Path, data: bytes) -> bool:
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return path.read_bytes() == data
+    except OSError:
+        return False
+
+
+def _same_file(path: Path, staged: Path) -> bool:
+    # Compared in chunks; shards of a large corpus can be bigger than the
+    # rest of the build's working set
+    try:
+        return filecmp.cmp(staged, path, shallow=False)
+    except OSError:
+        return False
+
+
+def write_if_changed(path: PathLike, content: Union[str, bytes]) -> bool:
+    """
+    Write content to path unless the file already holds exactly those bytes.
+
+    Returns:
+        True when the file was written
+    """
+    path = Path(path)
+    data = content.encode("utf-8") if isinstance(content, str) else content
+    if _same_bytes(path, data):
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + TMP_SUFFIX)
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+    return True
+
+
+# Seconds after which another build's staging directory counts as abandoned;
+# far longer than a build takes, so a concurrent build's directory is left alone
+STALE_STAGING_AGE = 3600
+
+
+def remove_stale_staging(root: PathLike, max_age: float = STALE_STAGING_AGE) -> int:
+    """
+    Remove staging directories of root left behind by killed builds.
+
+    Args:
+        root: Output tree whose sibling staging directories to check
+        max_age: Minimum age in seconds (by mtime) of a directory to remove
+
+    Returns:
+        Number of directories removed
+    """
+    root = Path(root).resolve()
+    if not root.parent.is_dir():
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in root.parent.glob(f".{root.name}-staging-*"):
+        try:
+            if not path.is_dir() or path.stat().st_mtime > cutoff:
+                continue
+        except OSError:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        removed += 1
+    return removed
+
+
+class StagedOutput:
+    """Stage the files of one build and apply only the changed ones."""
+
+    def __init__(self, root: PathLike, staging_dir: Optional[PathLike] = None):
+        """
+        Args:
+            root: Output tree the staged files belong to
+            staging_dir: Existing staging directory to write into (workers);
+                a fresh one next to root is created when omitted
+        """
+        self.root = Path(root)
+        self.owner = staging_dir is None
+        if staging_dir is None:
+            parent = self.root.resolve().parent
+            parent.mkdir(parents=True, exist_ok=True)
+            remove_stale_staging(self.root)
+            # Same filesystem as root, so commit() can rename
+            staging_dir = tempfile.mkdtemp(prefix=f".{self.root.name}-staging-", dir=parent)
+        self.staging_dir = Path(staging_dir)
+        self.removals = set()
+        self.committed = False
+
+    @classmethod
+    def attach(cls, root: PathLike, staging_dir: PathLike) -> "StagedOutput":
+        """Write into another process's staging directory; only the owner commits."""
+        return cls(root, staging_dir)
+
+    def __enter__(self) -> "StagedOutput":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.owner and not self.committed:
+            self.discard()
+
+    def relpath(self, path: PathLike) -> str:
+        """Path relative to root, as used inside the staging directory."""
+        rel = Path(os.path.relpath(path, self.root))
+        if rel.parts and rel.parts[0] == os.pardir:
+            raise ValueError(f"{path} is outside {self.root}")
+        return rel.as_posix()
+
+    def staged_path(self, path: PathLike) -> Path:
+        return self.staging_dir / self.relpath(path)
+
+    def write_text(self, path: PathLike, text: str):
+        self.write_bytes(path, text.encode("utf-8"))
+
+    def write_bytes(self, path: PathLike, data: bytes):
+        staged = self.staged_path(path)
+        staged.parent.mkdir(parents=True, exist_ok=True)
+        staged.write_bytes(data)
+        self.removals.discard(self.relpath(path))
+
+    def open_text(self, path: PathLike):
+        """Open the staged copy of path for writing, to stream a large output."""
+        staged = self.staged_path(path)
+        staged.parent.mkdir(parents=True, exist_ok=True)
+        self.removals.discard(self.relpath(path))
+        return open(staged, "w", encoding="utf-8", newline="")
+
+    def remove(self, path: PathLike):
+        """Delete path from the tree on commit (and drop a staged copy)."""
+        rel = self.relpath(path)
+        staged = self.staging_dir / rel
+        if staged.exists():
+            staged.unlink()
+        self.removals.add(rel)
+
+    def read_text(self, path: PathLike) -> str:
+        """Content of path as this build leaves it: staged if written, else on disk."""
+        staged = self.staged_path(path)
+        return (staged if staged.exists() else Path(path)).read_text(encoding="utf-8")
+
+    def commit(self) -> Dict[str, int]:
+        """
+        Apply the build to the tree.
+
+        Staged files are moved in (in sorted order) only where the bytes
+        differ; identical files are left alone with their mtimes.
+
+        Returns:
+            {"written": n, "unchanged": n, "removed": n}
+        """
+        stats = {"written": 0, "unchanged": 0, "removed": 0}
+        staged_files = []
+        for dirpath, dirs, names in os.walk(self.staging_dir):
+            dirs.sort()
+            staged_files += [Path(dirpath) / name for name in names]
+
+        for staged in sorted(staged_files, key=lambda p: p.relative_to(self.staging_dir).as_posix()):
+            target = self.root / staged.relative_to(self.staging_dir)
+            if _same_file(target, staged):
+                stats["unchanged"] += 1
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged, target)
+            stats["written"] += 1
+
+        for rel in sorted(self.removals):
+            target = self.root / rel
+            if target.exists():
+                target.unlink()
+                stats["removed"] += 1
+
+        self.committed = True
+        self.discard()
+        return stats
+
+    def discard(self):
+        """Drop everything staged."""
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
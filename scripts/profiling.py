@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Per-phase timings for the build and validation scripts.
+
+Code marks its phases on the shared profiler; while profiling is off (the
+default) a phase costs one attribute check:
+
+    from profiling import profiler
+
+    with profiler.phase("parse", file=rel_path):
+        data = parse_yaml(raw)
+
+Entry points wrap a run in profiled(), which turns the profiler on, prints a
+summary table (calls, total, mean and max per phase, the slowest file and
+peak RSS) and writes a Chrome trace-event file. Open the trace in
+chrome://tracing or https://ui.perfetto.dev to see every phase per file, per
+process, on a timeline.
+
+Worker processes profile into their own profiler and hand the recorded spans
+back to the parent with drain(); the parent adds them with extend().
+Timestamps come from the monotonic clock, which all processes of a machine
+share, so worker spans line up with the parent's.
+
+Phases:
+    discovery   finding the YAML files under data/
+    parse       reading one YAML file (or its cached parse)
+    validate    schema/lint checks of one file, or a whole validation run
+    serialize   JSON of one jurisdiction
+    render      Jinja rendering of one page
+    minify      HTML minification of one page
+    write       writing one output
+    step        one step of a build (pages, indexes, dashboard, ...)
+"""
+
+import functools
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_TRACE_PATH = "profile-trace.json"
+
+
+def peak_rss_kb(children: bool = False) -> Optional[int]:
+    """Peak resident set size of this process (or its reaped children) in KB."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is in bytes on macOS and KB elsewhere
+    return usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("profiler", "name", "category", "args", "start")
+
+    def __init__(self, profiler, name, category, args):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.profiler.events.append({
+            "name": self.name,
+            "cat": self.category,
+            "start": self.start,
+            "end": end,
+            "pid": os.getpid(),
+            "args": self.args,
+        })
+        if self.category == "step":
+            self.profiler.sample_rss(end)
+        return False
+
+
+class Profiler:
+    """Collects timed spans for one process."""
+
+    def __init__(self):
+        self.enabled = False
+        self.events: List[Dict[str, Any]] = []
+        self.rss: List[Dict[str, Any]] = []
+        self.origin = 0
+
+    def enable(self):
+        self.enabled = True
+        self.origin = time.perf_counter_ns()
+
+    def phase(self, name: str, category: Optional[str] = None, **args):
+        """
+        Time a block as one span.
+
+        Args:
+            name: Phase name (see the module docstring)
+            category: Defaults to the name; "step" spans also sample RSS
+            **args: Shown in the trace and the summary, e.g. file=rel_path
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, category or name, args)
+
+    def step(self, name: str, **args):
+        """Time one build step."""
+        return self.phase(name, "step", **args)
+
+    def timed(self, name: str, category: str = "step"):
+        """Decorator timing every call of a function as one span."""
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.phase(name, category):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def forget(self):
+        """Drop spans inherited from the parent in a forked child."""
+        self.events, self.rss = [], []
+
+    def sample_rss(self, timestamp: Optional[int] = None):
+        kb = peak_rss_kb()
+        if kb is not None:
+            self.rss.append({"ts": timestamp or time.perf_counter_ns(), "pid": os.getpid(), "kb": kb})
+
+    def drain(self) -> Dict[str, Any]:
+        """Hand this process's spans to the parent and forget them."""
+        recorded = {"events": self.events, "rss": self.rss, "pid": os.getpid(), "peak_kb": peak_rss_kb()}
+        self.events, self.rss = [], []
+        return recorded
+
+    def extend(self, recorded: Optional[Dict[str, Any]]):
+        """Add the spans a worker returned from drain()."""
+        if not recorded:
+            return
+        self.events.extend(recorded["events"])
+        self.rss.extend(recorded["rss"])
+        if recorded["pid"] != os.getpid() and recorded["peak_kb"] is not None:
+            self.rss.append({"ts": time.perf_counter_ns(), "pid": recorded["pid"], "kb": recorded["peak_kb"]})
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-phase totals and peak RSS."""
+        phases: Dict[str, Dict[str, Any]] = defaultdict(lambda: {"calls": 0, "total": 0, "max": 0, "slowest": None})
+        for event in self.events:
+            key = event["name"] if event["cat"] != "step" else f"step:{event['name']}"
+            row = phases[key]
+            duration = event["end"] - event["start"]
+            row["calls"] += 1
+            row["total"] += duration
+            if duration >= row["max"]:
+                row["max"] = duration
+                row["slowest"] = event["args"].get("file")
+
+        wall = (max(e["end"] for e in self.events) - self.origin) if self.events else 0
+        workers = {}
+        for sample in self.rss:
+            if sample["pid"] != os.getpid():
+                workers[sample["pid"]] = max(workers.get(sample["pid"], 0), sample["kb"])
+        return {
+            "wall_seconds": wall / 1e9,
+            "peak_rss_kb": peak_rss_kb(),
+            "peak_worker_rss_kb": max(workers.values(), default=None),
+            "workers": len(workers),
+            "phases": {
+                name: {
+                    "calls": row["calls"],
+                    "total_seconds": row["total"] / 1e9,
+                    "mean_seconds": row["total"] / row["calls"] / 1e9,
+                    "max_seconds": row["max"] / 1e9,
+                    "slowest": row["slowest"],
+                }
+                for name, row in sorted(phases.items(), key=lambda item: -item[1]["total"])
+            },
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        memory = ""
+        if summary["peak_rss_kb"] is not None:
+            memory = f", peak RSS {summary['peak_rss_kb'] / 1024:.1f} MB"
+            if summary["peak_worker_rss_kb"] is not None:
+                memory += f" (largest of {summary['workers']} worker(s): {summary['peak_worker_rss_kb'] / 1024:.1f} MB)"
+        print(f"\n⏱️  Profile: {summary['wall_seconds']:.2f}s wall{memory}")
+        print(f"  {'phase':<24} {'calls':>6} {'total':>9} {'mean':>9} {'max':>9}  slowest")
+        for name, row in summary["phases"].items():
+            print(f"  {name:<24} {row['calls']:>6} {_ms(row['total_seconds']):>9} {_ms(row['mean_seconds']):>9} "
+                  f"{_ms(row['max_seconds']):>9}  {row['slowest'] or ''}")
+
+    def trace(self) -> Dict[str, Any]:
+        """Chrome trace-event document (complete events plus RSS counters)."""
+        main_pid = os.getpid()
+        events = []
+        for pid in sorted({e["pid"] for e in self.events} | {s["pid"] for s in self.rss}):
+            name = "main" if pid == main_pid else f"worker {pid}"
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": name}})
+        for event in sorted(self.events, key=lambda e: (e["start"], -e["end"])):
+            events.append({
+                "name": event["args"].get("file") or event["name"],
+                "cat": event["cat"],
+                "ph": "X",
+                "ts": (event["start"] - self.origin) / 1000,
+                "dur": (event["end"] - event["start"]) / 1000,
+                "pid": event["pid"],
+                "tid": 0,
+                "args": dict(event["args"], phase=event["name"]),
+            })
+        for sample in sorted(self.rss, key=lambda s: s["ts"]):
+            events.append({
+                "name": "peak RSS (MB)",
+                "ph": "C",
+                "ts": (sample["ts"] - self.origin) / 1000,
+                "pid": sample["pid"],
+                "tid": 0,
+                "args": {"MB": round(sample["kb"] / 1024, 1)},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.trace(), f)
+            f.write("\n")
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}ms" if seconds < 10 else f"{seconds:.2f}s"
+
+
+# Shared by every module of this process
+profiler = Profiler()
+
+if hasattr(os, "register_at_fork"):
+    # Forked workers start with the parent's spans, which the parent keeps
+    os.register_at_fork(after_in_child=profiler.forget)
+
+
+@contextmanager
+def profiled(trace_path: Optional[str]):
+    """
+    Profile the enclosed run when trace_path is set, then print the summary
+    and write the Chrome trace to trace_path.
+    """
+    if not trace_path:
+        yield
+        return
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.print_summary()
+        profiler.write_trace(trace_path)
+        print(f"📁 Chrome trace written to {trace_path} (open in chrome://tracing or ui.perfetto.dev)")
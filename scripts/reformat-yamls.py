@@ -1,5 +1,6 @@
-import os
-import yaml
+import copy
+
+from corpus import DATA_DIR, dump_yaml, load_corpus
 
 RECOMMENDED_ORDER = ["name", "type", "subtype", "required_masking", "tags", "citations"]
 
@@ -13,35 +14,34 @@ def reorder_fields(category):
             ordered[key] = category[key]
     return ordered
 
-def reformat_yaml_file(file_path):
-    with open(file_path, 'r', encoding='utf-8') as f:
-        try:
-            data = yaml.safe_load(f)
-            categories = data.get("categories", [])
-            reformatted = [reorder_fields(cat) for cat in categories]
-            data["categories"] = reformatted
-            with open(file_path, 'w', encoding='utf-8') as out:
-                yaml.dump(data, out, allow_unicode=True, sort_keys=False, width=100)
-            return True, None
-        except yaml.YAMLError as e:
-            return False, str(e)
+def reformat_jurisdiction(jurisdiction):
+    if jurisdiction.error is not None:
+        return False, jurisdiction.error
+    data = copy.deepcopy(jurisdiction.data)
+    categories = data.get("categories", [])
+    reformatted = [reorder_fields(cat) for cat in categories]
+    data["categories"] = reformatted
+    with open(jurisdiction.path, 'w', encoding='utf-8') as out:
+        dump_yaml(data, out, width=100)
+    return True, None
 
-def reformat_all_yamls(base_path="data"):
+def reformat_all_yamls(base_path=DATA_DIR):
     failures = []
-    for root, _, files in os.walk(base_path):
-        for file in files:
-            if file.endswith(".yaml"):
-                full_path = os.path.join(root, file)
-                success, error = reformat_yaml_file(full_path)
-                if not success:
-                    failures.append((full_path, error))
+    for jurisdiction in load_corpus(base_path):
+        success, error = reformat_jurisdiction(jurisdiction)
+        if not success:
+            failures.append((jurisdiction.rel_path, error))
     return failures
 
-if __name__ == "__main__":
+def main():
     failures = reformat_all_yamls()
     if not failures:
         print("✅ All YAML files reformatted successfully.")
-    else:
-        print(f"❌ {len(failures)} file(s) failed to reformat:")
-        for path, err in failures:
-            print(f"{path}: {err}")
+        return 0
+    print(f"❌ {len(failures)} file(s) failed to reformat:")
+    for path, err in failures:
+        print(f"{path}: {err}")
+    return 1
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Incremental rollups of the corpus for the dashboard.
+
+Every jurisdiction contributes counts to five dimensions:
+
+    framework    jurisdictions and categories per framework
+    region       jurisdictions and categories per region
+    type         categories of each type, and the jurisdictions having any
+    risk_level   categories of each risk level, and the jurisdictions having any
+    tag          categories carrying each tag (tags or category_tags)
+
+The site build computes a jurisdiction's contribution once, when its page is
+rendered, and keeps it in the build summary. RollupStore holds the running
+totals together with the contribution and fingerprint of every jurisdiction
+behind them, and persists both in site/.build-rollups.json. sync()
+subtracts the contributions of changed and removed files and adds the new
+ones, so an incremental build only touches the changed-file set. A missing
+or outdated store is rebuilt from the summaries in one pass.
+
+dashboard_document() turns the totals into site/json/dashboard_data.json,
+which the dashboard page embeds as is. "Recent" figures come from the data:
+jurisdictions whose last_updated falls within RECENT_DAYS of the newest
+last_updated in the corpus, so rebuilding the same data reproduces the same
+file. When the build has a git timeline, with_freshness() replaces
+last_updated by the date of the file's last commit and records when it was
+first added, which "growth" counts per year (the year of last_updated
+stands in without history).
+
+Store Structure:
+    {
+      "version": 1,
+      "overall": {"jurisdictions": 58, "categories": 1120},
+      "totals": {"framework": {"GDPR": {"jurisdictions": 27, "categories": 540}}, ...},
+      "members": {"gdpr/france": {"fingerprint": "<sha256>", "contribution": {...}}}
+    }
+"""
+
+import json
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from output_writer import write_if_changed
+
+ROLLUPS_VERSION = 2
+ROLLUPS_NAME = ".build-rollups.json"
+
+DIMENSIONS = ("framework", "region", "type", "risk_level", "tag")
+# Dimensions counted per category rather than per jurisdiction
+CATEGORY_DIMENSIONS = ("type", "risk_level", "tag")
+
+RECENT_DAYS = 90
+LATEST_CHANGES = 10
+
+
+def contribution(country_info: Dict[str, Any], rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Counts one jurisdiction adds to the rollups.
+
+    Args:
+        country_info: The jurisdiction's country_info from its build summary
+        rows: Its category rows (site_indexes.category_rows)
+    """
+    counts = {dimension: Counter() for dimension in CATEGORY_DIMENSIONS}
+    for row in rows:
+        for dimension in ("type", "risk_level"):
+            if row.get(dimension) not in (None, ""):
+                counts[dimension][str(row[dimension])] += 1
+        for tag in row.get("tags", []):
+            counts["tag"][str(tag)] += 1
+    return {
+        "name": str(country_info["name"]),
+        "framework": str(country_info["framework"]),
+        "region": str(country_info["region"]),
+        "file": country_info["file"],
+        "last_updated": str(country_info.get("last_updated") or ""),
+        "added": "",
+        "categories": len(rows),
+        **{dimension: dict(sorted(counter.items())) for dimension, counter in counts.items()},
+    }
+
+
+def with_freshness(member: Dict[str, Any], freshness: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    A contribution dated from git history.
+
+    Args:
+        member: The contribution kept in the build summary
+        freshness: git_timeline.Timeline.freshness() of the jurisdiction, or None
+    """
+    if not freshness:
+        return member
+    return dict(member, last_updated=freshness["last_changed"], added=freshness["added"])
+
+
+def _cells(member: Dict[str, Any]) -> Iterator[Tuple[str, str, int]]:
+    """(dimension, value, categories) for every cell a contribution counts in."""
+    yield "framework", member["framework"], member["categories"]
+    yield "region", member["region"], member["categories"]
+    for dimension in CATEGORY_DIMENSIONS:
+        for value, count in member[dimension].items():
+            yield dimension, value, count
+
+
+def _parse_date(value: str) -> Optional[date]:
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
+
+
+class RollupStore:
+    """Running per-dimension totals, kept in step with the build manifest."""
+
+    def __init__(self, site_dir, members: Optional[Dict[str, Dict[str, Any]]] = None,
+                 totals: Optional[Dict[str, Dict[str, Dict[str, int]]]] = None,
+                 overall: Optional[Dict[str, int]] = None):
+        self.path = Path(site_dir) / ROLLUPS_NAME
+        self.members = members or {}
+        if totals is None or overall is None:
+            # Derive the totals from the members in one pass
+            self.totals = {dimension: {} for dimension in DIMENSIONS}
+            self.overall = {"jurisdictions": 0, "categories": 0}
+            for member in self.members.values():
+                self._apply(member["contribution"], 1)
+        else:
+            self.totals = totals
+            self.overall = overall
+
+    @classmethod
+    def load(cls, site_dir) -> "RollupStore":
+        """
+        Load the store from site_dir, or start empty if it is missing,
+        unreadable or written by an incompatible version.
+        """
+        path = Path(site_dir) / ROLLUPS_NAME
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return cls(site_dir)
+        if raw.get("version") != ROLLUPS_VERSION or set(raw.get("totals", {})) != set(DIMENSIONS):
+            return cls(site_dir)
+        return cls(site_dir, raw.get("members", {}), raw["totals"], raw.get("overall"))
+
+    def _apply(self, member: Dict[str, Any], sign: int):
+        self.overall["jurisdictions"] += sign
+        self.overall["categories"] += sign * member["categories"]
+        for dimension, value, count in _cells(member):
+            cell = self.totals[dimension].setdefault(value, {"jurisdictions": 0, "categories": 0})
+            cell["jurisdictions"] += sign
+            cell["categories"] += sign * count
+            if cell["jurisdictions"] == 0:
+                del self.totals[dimension][value]
+
+    def sync(self, current: Dict[str, str], contribution_of: Callable[[str], Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Bring the totals up to date with this build's jurisdictions.
+
+        Args:
+            current: Fingerprint of every jurisdiction in the build, by manifest key
+            contribution_of: Returns the contribution of a key whose fingerprint changed
+
+        Returns:
+            {"added": n, "updated": n, "removed": n, "unchanged": n}
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        for key in [key for key in self.members if key not in current]:
+            self._apply(self.members.pop(key)["contribution"], -1)
+            stats["removed"] += 1
+
+        for key, digest in current.items():
+            member = self.members.get(key)
+            if member and member["fingerprint"] == digest:
+                stats["unchanged"] += 1
+                continue
+            if member:
+                self._apply(member["contribution"], -1)
+                stats["updated"] += 1
+            else:
+                stats["added"] += 1
+            member = {"fingerprint": digest, "contribution": contribution_of(key)}
+            self._apply(member["contribution"], 1)
+            self.members[key] = member
+        return stats
+
+    def dashboard_document(self) -> Dict[str, Any]:
+        """The dashboard_data.json document for the current totals."""
+        members = [self.members[key]["contribution"] for key in sorted(self.members)]
+        jurisdictions = self.overall["jurisdictions"]
+        # Frameworks are counted by data/ directory (the key's first part), like
+        # Corpus.frameworks() and the rest of the site; the framework rollup
+        # itself is keyed by display name, which a directory may have several of
+        framework_dirs = {key: key.split("/", 1)[0] for key in self.members}
+
+        rollups = {}
+        for dimension in DIMENSIONS:
+            cells = sorted(self.totals[dimension].items(),
+                           key=lambda item: (-item[1]["jurisdictions"], -item[1]["categories"], item[0]))
+            rollups[dimension] = {}
+            for value, cell in cells:
+                # Fixed key order, whether the cell was loaded or created in this build
+                cell = {"jurisdictions": cell["jurisdictions"], "categories": cell["categories"]}
+                if dimension in ("framework", "region"):
+                    cell["avg_categories"] = round(cell["categories"] / cell["jurisdictions"])
+                rollups[dimension][value] = cell
+
+        dated = [(m["last_updated"], _parse_date(m["last_updated"]), m) for m in members]
+        newest = max((d for _, d, _ in dated if d is not None), default=None)
+        since = newest - timedelta(days=RECENT_DAYS) if newest else None
+        recent_keys = [
+            key for key, (_, d, _) in zip(sorted(self.members), dated)
+            if since is not None and d is not None and d >= since
+        ]
+        recent = [self.members[key]["contribution"] for key in recent_keys]
+        latest = sorted(dated, key=lambda item: item[0], reverse=True)[:LATEST_CHANGES]
+
+        # Jurisdictions by the year they were added, cumulative
+        added = Counter((m.get("added") or m["last_updated"])[:4] for m in members)
+        added.pop("", None)
+        growth, running = [], 0
+        for year in sorted(added):
+            running += added[year]
+            growth.append({"year": year, "jurisdictions": running})
+
+        frameworks = rollups["framework"]
+        comprehensive = min(frameworks, key=lambda v: (-frameworks[v]["avg_categories"], v), default=None)
+        regions = rollups["region"]
+        best_region = next(iter(regions), None)
+
+        return {
+            "version": ROLLUPS_VERSION,
+            "totals": {
+                "jurisdictions": jurisdictions,
+                "frameworks": len(set(framework_dirs.values())),
+                "regions": len(regions),
+                "categories": self.overall["categories"],
+                "avg_categories": round(self.overall["categories"] / jurisdictions) if jurisdictions else 0,
+                # Newest data date rather than the build date
+                "last_updated": max((m["last_updated"] for m in members), default=""),
+            },
+            "rollups": rollups,
+            "recent": {
+                "days": RECENT_DAYS,
+                "since": since.isoformat() if since else None,
+                "jurisdictions": len(recent),
+                "frameworks": len({framework_dirs[key] for key in recent_keys}),
+                "categories": sum(m["categories"] for m in recent),
+                "latest": [
+                    {key: m[key] for key in ("name", "framework", "region", "categories", "last_updated", "file")}
+                    for _, _, m in latest
+                ],
+            },
+            "growth": growth,
+            "insights": {
+                "most_comprehensive_framework": comprehensive,
+                "most_comprehensive_avg": frameworks[comprehensive]["avg_categories"] if comprehensive else 0,
+                "best_covered_region": best_region,
+                "best_region_count": regions[best_region]["jurisdictions"] if best_region else 0,
+            },
+        }
+
+    def save(self):
+        """Write the store atomically, leaving it untouched when nothing changed."""
+        data = {
+            "version": ROLLUPS_VERSION,
+            "overall": self.overall,
+            "totals": self.totals,
+            "members": self.members,
+        }
+        write_if_changed(self.path, json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":")) + "\n")
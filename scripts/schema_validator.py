@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Compiled JSON schema validation for corpus documents.
+
+jsonschema.validate() checks the schema and builds a new validator on every
+call, then stops at the first error. Here the schema is checked and compiled
+once per process (keyed by its fingerprint) and every error in a document is
+collected with a JSON pointer to the offending value, e.g.
+
+    /categories/3/citations/0: {'url': '...'} is not valid under any of the given schemas
+
+jsonschema's generic validator costs a few milliseconds per jurisdiction
+file, so schemas that only use the keywords our schemas need (type,
+properties, required, items, anyOf) are also compiled into a tree of plain
+Python checks. Valid documents - nearly all of them - are accepted by that
+fast check alone; jsonschema only runs to explain documents that fail it.
+
+Independent documents can be validated across a process pool; each worker
+compiles the schema once in its initializer.
+
+Usage:
+    from schema_validator import validate_many
+
+    errors = validate_many(file_schema, documents, jobs=4)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from build_manifest import fingerprint
+
+_compiled: Dict[str, Any] = {}
+_fast_checks: Dict[str, Optional[Callable[[Any], bool]]] = {}
+_worker_state: Dict[str, Any] = {}
+
+FAST_KEYWORDS = {"type", "properties", "required", "items", "anyOf"}
+
+JSON_TYPES = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "boolean": lambda v: isinstance(v, bool),
+    "integer": lambda v: not isinstance(v, bool) and (
+        isinstance(v, int) or (isinstance(v, float) and v.is_integer())
+    ),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def get_validator(schema: Dict[str, Any]):
+    """
+    Return a compiled validator for schema, building it on first use.
+
+    The schema itself is checked against its metaschema only once; an
+    invalid schema raises jsonschema.SchemaError.
+    """
+    key = fingerprint(schema)
+    if key not in _compiled:
+        # Imported on first use: jsonschema is slow to import and commands
+        # that never validate (openpiimap --help, build) don't need it
+        from jsonschema.validators import validator_for
+        cls = validator_for(schema)
+        cls.check_schema(schema)
+        _compiled[key] = cls(schema)
+    return _compiled[key]
+
+
+def compile_fast_check(schema: Dict[str, Any]) -> Optional[Callable[[Any], bool]]:
+    """
+    Compile a schema into a function returning True for valid documents.
+
+    Returns:
+        The check, or None if the schema uses a keyword or type the fast
+        path does not implement (callers then rely on jsonschema alone)
+    """
+    if not isinstance(schema, dict) or set(schema) - FAST_KEYWORDS:
+        return None
+
+    checks = []
+    if "type" in schema:
+        type_check = JSON_TYPES.get(schema["type"]) if isinstance(schema["type"], str) else None
+        if type_check is None:
+            return None
+        checks.append(type_check)
+
+    if "required" in schema:
+        required = tuple(schema["required"])
+        checks.append(lambda v: not isinstance(v, dict) or all(k in v for k in required))
+
+    if "properties" in schema:
+        properties = {}
+        for key, subschema in schema["properties"].items():
+            properties[key] = compile_fast_check(subschema)
+            if properties[key] is None:
+                return None
+        checks.append(lambda v: not isinstance(v, dict) or all(
+            properties[k](v[k]) for k in properties if k in v
+        ))
+
+    if "items" in schema:
+        item_check = compile_fast_check(schema["items"])
+        if item_check is None:
+            return None
+        checks.append(lambda v: not isinstance(v, list) or all(item_check(item) for item in v))
+
+    if "anyOf" in schema:
+        alternatives = [compile_fast_check(sub) for sub in schema["anyOf"]]
+        if any(alt is None for alt in alternatives):
+            return None
+        checks.append(lambda v: any(alt(v) for alt in alternatives))
+
+    return lambda v: all(check(v) for check in checks)
+
+
+def get_fast_check(schema: Dict[str, Any]) -> Optional[Callable[[Any], bool]]:
+    """Return the cached fast check for schema, or None if it can't be compiled."""
+    key = fingerprint(schema)
+    if key not in _fast_checks:
+        _fast_checks[key] = compile_fast_check(schema)
+    return _fast_checks[key]
+
+
+def json_pointer(path: Sequence[Any]) -> str:
+    """Format a jsonschema error path as an RFC 6901 JSON pointer."""
+    return "".join("/" + str(part).replace("~", "~0").replace("/", "~1") for part in path)
+
+
+def collect_errors(validator, document: Any, fast_check: Optional[Callable[[Any], bool]] = None) -> List[Dict[str, str]]:
+    """
+    Return every schema error in a document.
+
+    Args:
+        validator: Compiled jsonschema validator
+        document: Parsed document
+        fast_check: Optional compiled fast check; documents it accepts are
+                    not passed to jsonschema at all
+
+    Returns:
+        List of {"path": <JSON pointer>, "message": <error>} sorted by path;
+        empty when the document is valid
+    """
+    if fast_check is not None and fast_check(document):
+        return []
+    errors = [
+        {"path": json_pointer(error.absolute_path), "message": error.message}
+        for error in validator.iter_errors(document)
+    ]
+    return sorted(errors, key=lambda e: (e["path"], e["message"]))
+
+
+def _init_worker(schema):
+    _worker_state['validator'] = get_validator(schema)
+    _worker_state['fast_check'] = get_fast_check(schema)
+
+
+def _validate_one(document):
+    return collect_errors(_worker_state['validator'], document, _worker_state['fast_check'])
+
+
+def validate_many(schema: Dict[str, Any], documents: List[Any], jobs: int = 1) -> List[List[Dict[str, str]]]:
+    """
+    Validate documents against schema, serially or across a process pool.
+
+    Args:
+        schema: JSON schema every document must match
+        documents: Parsed documents
+        jobs: Worker processes; 1 validates in this process
+
+    Returns:
+        One error list per document, in input order
+    """
+    if not documents:
+        # Nothing to validate: don't import jsonschema
+        return []
+    if jobs > 1 and len(documents) > 1:
+        chunksize = max(1, len(documents) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(schema,)) as pool:
+            return list(pool.map(_validate_one, documents, chunksize=chunksize))
+    _init_worker(schema)
+    return [_validate_one(document) for document in documents]
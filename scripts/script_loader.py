@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Import scripts from scripts/ by file name.
+
+Most scripts have hyphenated file names (validate-yamls.py, lint-yamls.py)
+and can't be imported with a plain import statement. load_script() imports
+them under an underscored module name and caches them in sys.modules, so
+loading the same script twice is free.
+
+Usage:
+    from script_loader import load_script
+
+    lint = load_script('lint-yamls')
+    issues = lint.find_lint_issues(data)
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
+
+def load_script(name):
+    """
+    Import a script from scripts/ by file name.
+
+    Args:
+        name: File name without the .py suffix, e.g. 'validate-yamls'
+
+    Returns:
+        The imported module
+    """
+    module_name = name.replace('-', '_')
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
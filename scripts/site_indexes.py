@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Derived JSON indexes for the static site.
+
+site/json/<fw>/<country>.json holds one jurisdiction; views that cut across
+jurisdictions (compare, dashboard, "who treats biometrics as special
+category?") would otherwise have to download all of them. These indexes are
+derived from the per-jurisdiction build summaries instead:
+
+    json/countries.json                 one row per jurisdiction file
+    json/frameworks.json                one row per framework
+    json/map_data.json                  totals and per-country coverage for map.html
+    json/index/index.json               catalog of every shard below
+    json/index/type/<value>.json        categories of one type
+    json/index/subtype/<value>.json     categories of one subtype
+    json/index/tag/<value>.json         categories carrying a tag (tags or category_tags)
+    json/index/regulation/<value>.json  categories citing a regulation
+
+Each shard lists (framework, country, category) entries with a link to the
+jurisdiction's JSON, so a front end fetches the catalog once and then only
+the shard it needs.
+
+Dates come from the git timeline (git_timeline.py) when the build passes
+its freshness, and from each file's last_updated otherwise.
+
+Streamed builds (build_static_site.py --stream) add categories to a
+ShardSpool one jurisdiction at a time instead; it writes the same files.
+
+Shard Structure:
+    {
+      "field": "subtype",
+      "value": "biometric",
+      "count": 54,
+      "entries": [
+        {"framework": "GDPR", "framework_id": "gdpr", "country": "France",
+         "country_id": "france", "category": "Biometric Data (...)",
+         "required_masking": true, "json": "json/gdpr/france.json"}
+      ]
+    }
+"""
+
+import json
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from site_packaging import dump_json, iter_json_list
+
+# Index field -> key of the category rows it is built from
+SHARD_FIELDS = {
+    "type": "type",
+    "subtype": "subtype",
+    "tag": "tags",
+    "regulation": "regulations",
+}
+
+INDEX_DIR = "index"
+
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def category_rows(jurisdiction) -> List[Dict[str, Any]]:
+    """Compact per-category rows kept in the build summary of a jurisdiction."""
+    rows = []
+    for category in jurisdiction.categories:
+        if not category.name:
+            continue
+        rows.append({
+            "name": category.name,
+            "type": category.type,
+            "subtype": category.subtype,
+            "tags": sorted(set(category.tags) | set(category.category_tags)),
+            "regulations": sorted({c.source for c in category.citations if c.source}),
+            "required_masking": category.required_masking,
+            "risk_level": category.risk_level,
+        })
+    return rows
+
+
+def shard_slug(value: Any) -> str:
+    """File name (without .json) for a field value."""
+    return _SLUG_RE.sub("-", str(value).casefold()).strip("-") or "_"
+
+
+def _values(row: Dict[str, Any], key: str) -> Iterable[Any]:
+    value = row.get(key)
+    if isinstance(value, list):
+        return value
+    return [] if value in (None, "") else [value]
+
+
+def _json_path(summary: Dict[str, Any]) -> str:
+    return f"json/{summary['framework_dir']}/{summary['slug']}.json"
+
+
+def summary_key(summary: Dict[str, Any]) -> str:
+    """Manifest key ("gdpr/france") of a jurisdiction's build summary."""
+    return f"{summary['framework_dir']}/{summary['slug']}"
+
+
+def _freshness(summary: Dict[str, Any], freshness: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return ((freshness or {}).get(summary_key(summary))) or {}
+
+
+def shard_entries(summary: Dict[str, Any], rows: List[Dict[str, Any]]) -> Iterator[Tuple[str, Any, Dict[str, Any]]]:
+    """Yield (field, value, entry) for every shard a jurisdiction's categories belong to."""
+    info = summary["country_info"]
+    for row in rows:
+        entry = {
+            "framework": info["framework"],
+            "framework_id": summary["framework_dir"],
+            "country": info["name"],
+            "country_id": summary["slug"],
+            "category": row["name"],
+            "required_masking": row["required_masking"],
+            "json": _json_path(summary),
+        }
+        for field, key in SHARD_FIELDS.items():
+            for value in dict.fromkeys(_values(row, key)):
+                yield field, value, entry
+
+
+def shard_paths(values: Iterable[Any], field: str) -> Iterator[Tuple[Any, str]]:
+    """Yield (value, path relative to json/) for the shards of a field, in file order."""
+    used = set()
+    for value in sorted(values, key=lambda v: (str(v).casefold(), str(v))):
+        # Values that slugify alike ("Art. 9" / "art-9") get numbered files
+        slug = base = shard_slug(value)
+        n = 2
+        while slug in used:
+            slug, n = f"{base}-{n}", n + 1
+        used.add(slug)
+        yield value, f"{INDEX_DIR}/{field}/{slug}.json"
+
+
+def build_shards(summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build every shard and the catalog.
+
+    Returns:
+        Mapping of path relative to json/ to the document to write there
+    """
+    grouped: Dict[str, Dict[Any, List[Dict[str, Any]]]] = {field: defaultdict(list) for field in SHARD_FIELDS}
+    for summary in summaries:
+        for field, value, entry in shard_entries(summary, summary.get("categories", [])):
+            grouped[field][value].append(entry)
+
+    files: Dict[str, Any] = {}
+    catalog: Dict[str, Dict[str, Any]] = {}
+    for field, by_value in grouped.items():
+        catalog[field] = {}
+        for value, path in shard_paths(by_value, field):
+            entries = by_value[value]
+            files[path] = {"field": field, "value": value, "count": len(entries), "entries": entries}
+            catalog[field][str(value)] = {"count": len(entries), "path": f"json/{path}"}
+
+    files[f"{INDEX_DIR}/index.json"] = {"fields": list(SHARD_FIELDS), "shards": catalog}
+    return files
+
+
+class ShardSpool:
+    """
+    Build the shards of a streamed site build on disk.
+
+    Entries are added one jurisdiction at a time and spilled to one spool
+    file per shard whenever buffer_limit entries are held, so memory grows
+    with the number of distinct field values rather than with the corpus.
+    write() then streams every shard out in the same bytes build_shards()
+    would produce.
+    """
+
+    def __init__(self, spool_dir, minify: bool = False, buffer_limit: int = 20000):
+        self.spool_dir = Path(spool_dir)
+        self.minify = minify
+        self.buffer_limit = buffer_limit
+        # (field, value) -> [spool file number, entry count]
+        self.shards: Dict[Tuple[str, Any], List[int]] = {}
+        self.buffer: Dict[Tuple[str, Any], List[str]] = defaultdict(list)
+        self.buffered = 0
+
+    def add(self, summary: Dict[str, Any], rows: List[Dict[str, Any]]):
+        """Add the categories of one jurisdiction, in discovery order."""
+        for field, value, entry in shard_entries(summary, rows):
+            shard = self.shards.setdefault((field, value), [len(self.shards), 0])
+            shard[1] += 1
+            # One compact entry per line; pretty-printed output is re-serialized on write
+            self.buffer[(field, value)].append(json.dumps(entry, ensure_ascii=False, separators=(",", ":")))
+            self.buffered += 1
+        if self.buffered >= self.buffer_limit:
+            self.flush()
+
+    def flush(self):
+        """Append the buffered entries to their spool files."""
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        for shard, lines in self.buffer.items():
+            with open(self._spool_path(shard), "a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+        self.buffer.clear()
+        self.buffered = 0
+
+    def _spool_path(self, shard: Tuple[str, Any]) -> Path:
+        return self.spool_dir / f"{self.shards[shard][0]}.jsonl"
+
+    def _entries(self, shard: Tuple[str, Any]) -> Iterator[str]:
+        with open(self._spool_path(shard), "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.rstrip("\n")
+                yield line if self.minify else dump_json(json.loads(line))
+
+    def write(self, open_output: Callable[[str], TextIO]) -> List[str]:
+        """
+        Write every shard and the catalog.
+
+        Args:
+            open_output: Opens a path relative to json/ for writing
+
+        Returns:
+            Paths written, relative to json/
+        """
+        self.flush()
+        values: Dict[str, List[Any]] = {field: [] for field in SHARD_FIELDS}
+        for field, value in self.shards:
+            values[field].append(value)
+
+        written = []
+        catalog: Dict[str, Dict[str, Any]] = {}
+        for field in SHARD_FIELDS:
+            catalog[field] = {}
+            for value, path in shard_paths(values[field], field):
+                count = self.shards[(field, value)][1]
+                head = {"field": field, "value": value, "count": count}
+                with open_output(path) as f:
+                    f.writelines(iter_json_list(self._entries((field, value)), self.minify, head, "entries"))
+                    f.write("\n")
+                written.append(path)
+                catalog[field][str(value)] = {"count": count, "path": f"json/{path}"}
+
+        path = f"{INDEX_DIR}/index.json"
+        with open_output(path) as f:
+            f.write(dump_json({"fields": list(SHARD_FIELDS), "shards": catalog}, self.minify) + "\n")
+        written.append(path)
+        return written
+
+
+def category_count(summary: Dict[str, Any]) -> int:
+    """Categories of a jurisdiction, from a full or a streamed (compact) summary."""
+    if "category_count" in summary:
+        return summary["category_count"]
+    return len(summary.get("categories", []))
+
+
+def build_countries(summaries: List[Dict[str, Any]],
+                    freshness: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Rows of countries.json, one per jurisdiction file.
+
+    lastUpdated is the date of the file's last commit when freshness (see
+    git_timeline.Timeline.freshness) knows it, else its last_updated.
+    """
+    countries = []
+    for summary in summaries:
+        fresh = _freshness(summary, freshness)
+        countries.append({
+            "id": summary["slug"],
+            "name": summary["country_info"]["name"],
+            "framework": summary["country_info"]["framework"],
+            "framework_id": summary["framework_dir"],
+            "region": summary["country_info"]["region"],
+            "categories": category_count(summary),
+            "lastUpdated": fresh.get("last_changed") or summary["country_info"]["last_updated"],
+            "firstAdded": fresh.get("added"),
+            "commits": fresh.get("commits"),
+            "file": summary["country_info"]["file"],
+            "json": _json_path(summary),
+        })
+    return countries
+
+
+def build_frameworks(summaries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Rows of frameworks.json, one per framework directory."""
+    by_framework: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for summary in summaries:
+        by_framework[summary["framework_dir"]].append(summary)
+
+    frameworks = []
+    for framework_dir in sorted(by_framework):
+        members = by_framework[framework_dir]
+        names = Counter(s["country_info"]["framework"] for s in members)
+        regions = Counter(s["country_info"]["region"] for s in members)
+        name = names.most_common(1)[0][0]
+        frameworks.append({
+            "id": framework_dir,
+            "name": name,
+            "abbreviation": name,
+            "region": regions.most_common(1)[0][0],
+            "countries": [s["country_info"]["name"] for s in members],
+            "jurisdictions": len(members),
+            "categories": sum(category_count(s) for s in members),
+        })
+    return frameworks
+
+
+def build_map_data(summaries: List[Dict[str, Any]], total_categories: Optional[int] = None,
+                   freshness: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Totals and per-country coverage read by map.html.
+
+    total_categories is the number of distinct category names; it is counted
+    from the summaries when omitted. A country's lastUpdated is the newest
+    date of its jurisdiction files, as in build_countries().
+    """
+    if total_categories is None:
+        total_categories = len({name for s in summaries for name in s["category_names"]})
+    countries: Dict[str, Dict[str, Any]] = {}
+    for summary in summaries:
+        info = summary["country_info"]
+        country = countries.setdefault(
+            info["name"], {"region": info["region"], "frameworks": [], "categories": 0, "lastUpdated": ""}
+        )
+        country["frameworks"].append(info["framework"])
+        country["categories"] += category_count(summary)
+        updated = str(_freshness(summary, freshness).get("last_changed") or info["last_updated"] or "")
+        country["lastUpdated"] = max(country["lastUpdated"], updated)
+
+    return {
+        "totalCountries": len({s["slug"] for s in summaries}),
+        "totalFrameworks": len({s["framework_dir"] for s in summaries}),
+        "totalCategories": total_categories,
+        "countries": {name: countries[name] for name in sorted(countries)},
+    }
+
+
+def build_site_indexes(summaries: List[Dict[str, Any]],
+                       freshness: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build every derived JSON document of the site.
+
+    Args:
+        summaries: Per-jurisdiction build summaries, in discovery order
+        freshness: Git freshness by manifest key, or None without a timeline
+
+    Returns:
+        Mapping of path relative to site/json/ to the document to write there
+    """
+    files = {
+        "countries.json": build_countries(summaries, freshness),
+        "frameworks.json": build_frameworks(summaries),
+        "map_data.json": build_map_data(summaries, freshness=freshness),
+    }
+    files.update(build_shards(summaries))
+    return files
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Output shaping for the static site: minification, precompression and a
+reproducible archive.
+
+- dump_json() writes indented JSON for a readable tree, or compact JSON when
+  minifying; iter_json_list() produces the same bytes for a list streamed
+  one element at a time.
+- minify_html() strips comments, collapses whitespace outside <pre> and
+  <textarea>, and drops the indentation of inline <script>/<style> lines.
+- precompress_tree() writes .gz (and .br when the `brotli` package is
+  installed) next to every text asset, so static hosts that serve
+  precompressed files (nginx gzip_static/brotli_static, Netlify, S3 with
+  Content-Encoding metadata) never compress on the fly.
+- write_site_zip() packs the site with sorted entries, fixed timestamps and
+  permissions, so the same tree always produces a byte-identical zip.
+- asset_manifest() hashes every shipped file; render_service_worker() injects
+  that manifest into sw.js, so returning visitors download only the files
+  whose hash changed.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Files worth precompressing; images and fonts are already compressed
+COMPRESSIBLE_SUFFIXES = {".html", ".json", ".css", ".js", ".svg", ".txt", ".xml", ".webmanifest"}
+COMPRESSED_SUFFIXES = (".gz", ".br")
+# Build bookkeeping that is neither compressed nor shipped
+EXCLUDED_NAMES = {".build-manifest.json", ".build-rollups.json"}
+
+# The service worker and the manifest it embeds are not listed in it
+SERVICE_WORKER_NAME = "sw.js"
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+# Notes kept in the tree that no page links to
+ASSET_EXCLUDED_SUFFIXES = (".md",)
+ASSET_HASH_LENGTH = 16
+ASSET_MANIFEST_PLACEHOLDER = "__ASSET_MANIFEST__"
+
+# 1980-01-01, the earliest timestamp a zip entry can hold
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+_PROTECTED_RE = re.compile(r"<(pre|textarea|script|style)\b[^>]*>.*?</\1\s*>", re.S | re.I)
+# Conditional comments (<!--[if IE]>) are kept
+_COMMENT_RE = re.compile(r"<!--(?!\[if).*?-->", re.S)
+_SPACE_RE = re.compile(r"\s+")
+_INDENT_RE = re.compile(r"\n[ \t]+")
+
+
+def dump_json(document: Any, minify: bool = False, default=None) -> str:
+    """Serialize a document as the site writes it."""
+    if minify:
+        return json.dumps(document, ensure_ascii=False, separators=(",", ":"), default=default)
+    return json.dumps(document, indent=2, ensure_ascii=False, default=default)
+
+
+def iter_json_list(items: Iterable[str], minify: bool = False, head: Optional[Dict[str, Any]] = None,
+                   key: Optional[str] = None) -> Iterator[str]:
+    """
+    Yield dump_json() output of a list chunk by chunk, without holding the list.
+
+    Args:
+        items: Each element already serialized with dump_json(element, minify)
+        minify: Must match the mode the items were serialized in
+        head: Wrap the list in this dict, as its last key `key`
+
+    The chunks join to exactly dump_json(list) or dump_json({**head, key: list}).
+    """
+    if head is None:
+        prefix, suffix, depth = "", "", 1
+    else:
+        # The list is the last key, so the document ends in "[]}" / "[]\n}"
+        wrapper = dump_json({**head, key: []}, minify)
+        suffix = "}" if minify else "\n}"
+        prefix, depth = wrapper[:-len("[]" + suffix)], 2
+
+    yield prefix + "["
+    indent = "\n" + "  " * depth
+    first = True
+    for text in items:
+        if minify:
+            yield text if first else "," + text
+        else:
+            # Pretty-printed JSON only has structural newlines, so nesting
+            # one level deeper is a re-indent of every line
+            yield ("" if first else ",") + indent + text.replace("\n", indent)
+        first = False
+    if not first and not minify:
+        yield "\n" + "  " * (depth - 1)
+    yield "]" + suffix
+
+
+def _collapse(match) -> str:
+    # Keep one newline where the source had one, so minified pages still
+    # diff line by line
+    return "\n" if "\n" in match.group() else " "
+
+
+def minify_html(html: str) -> str:
+    """Return html with comments removed and insignificant whitespace collapsed."""
+    out = []
+    pos = 0
+    for block in _PROTECTED_RE.finditer(html):
+        text = _COMMENT_RE.sub("", html[pos:block.start()])
+        out.append(_SPACE_RE.sub(_collapse, text))
+        content = block.group()
+        if block.group(1).lower() in ("script", "style") and "<pre" not in content:
+            content = _INDENT_RE.sub("\n", content)
+        out.append(content)
+        pos = block.end()
+    out.append(_SPACE_RE.sub(_collapse, _COMMENT_RE.sub("", html[pos:])))
+    return "".join(out).strip() + "\n"
+
+
+def _site_files(site_dir: Path) -> List[Path]:
+    """Shippable files under site_dir, sorted by relative path."""
+    files = []
+    for root, dirs, names in os.walk(site_dir):
+        dirs.sort()
+        for name in sorted(names):
+            if name in EXCLUDED_NAMES or name.endswith(COMPRESSED_SUFFIXES + (".tmp",)):
+                continue
+            files.append(Path(root) / name)
+    return sorted(files, key=lambda p: p.relative_to(site_dir).as_posix())
+
+
+def _compress(data: bytes, suffix: str) -> bytes:
+    if suffix == ".br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def precompress_tree(site_dir) -> Tuple[int, int, int]:
+    """
+    Write .gz/.br siblings for every compressible file that changed.
+
+    A sibling is rewritten when it is missing or older than its source, and
+    siblings whose source is gone (or no longer smaller than it) are removed.
+
+    Returns:
+        (siblings written, siblings kept, siblings removed)
+    """
+    site_dir = Path(site_dir)
+    suffixes = (".gz", ".br") if brotli is not None else (".gz",)
+    written = kept = removed = 0
+    wanted = set()
+
+    for path in _site_files(site_dir):
+        if path.suffix.lower() not in COMPRESSIBLE_SUFFIXES:
+            continue
+        source_mtime = path.stat().st_mtime_ns
+        data = None
+        for suffix in suffixes:
+            sibling = path.with_name(path.name + suffix)
+            if sibling.exists() and sibling.stat().st_mtime_ns >= source_mtime:
+                wanted.add(sibling)
+                kept += 1
+                continue
+            if data is None:
+                data = path.read_bytes()
+            compressed = _compress(data, suffix)
+            if len(compressed) >= len(data):
+                continue
+            tmp_path = sibling.with_name(sibling.name + ".tmp")
+            tmp_path.write_bytes(compressed)
+            os.replace(tmp_path, sibling)
+            wanted.add(sibling)
+            written += 1
+
+    for root, _, names in os.walk(site_dir):
+        for name in names:
+            sibling = Path(root) / name
+            if name.endswith(COMPRESSED_SUFFIXES) and sibling not in wanted:
+                sibling.unlink()
+                removed += 1
+    return written, kept, removed
+
+
+def remove_precompressed(site_dir) -> int:
+    """Delete every .gz/.br sibling under site_dir; returns how many."""
+    removed = 0
+    for root, _, names in os.walk(site_dir):
+        for name in names:
+            if name.endswith(COMPRESSED_SUFFIXES):
+                (Path(root) / name).unlink()
+                removed += 1
+    return removed
+
+
+def write_site_zip(site_dir, zip_path, prefix: str = "site") -> int:
+    """
+    Pack site_dir into zip_path reproducibly.
+
+    Entries are sorted, stamped ZIP_EPOCH with fixed permissions, and
+    precompressed siblings and build bookkeeping are left out.
+
+    Returns:
+        Number of files archived
+    """
+    site_dir = Path(site_dir)
+    files = _site_files(site_dir)
+    directories = sorted({
+        parent.as_posix()
+        for path in files
+        for parent in path.relative_to(site_dir).parents
+    } - {"."})
+
+    tmp_path = Path(str(zip_path) + ".tmp")
+    with zipfile.ZipFile(tmp_path, "w") as archive:
+        names = [(f"{prefix}/", None)]
+        names += [(f"{prefix}/{d}/", None) for d in directories]
+        names += [(f"{prefix}/{p.relative_to(site_dir).as_posix()}", p) for p in files]
+        for arcname, path in sorted(names, key=lambda item: item[0]):
+            info = zipfile.ZipInfo(arcname, date_time=ZIP_EPOCH)
+            info.create_system = 3
+            if path is None:
+                info.external_attr = (0o40755 << 16) | 0x10
+                archive.writestr(info, b"")
+            else:
+                info.external_attr = 0o100644 << 16
+                info.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(info, path.read_bytes(), compresslevel=9)
+    os.replace(tmp_path, zip_path)
+    return len(files)
+
+
+def asset_manifest(site_dir) -> Dict[str, Any]:
+    """
+    Hash every file the service worker should cache.
+
+    Returns:
+        {"version": <hash of all entries>, "assets": {relative path: content hash}}
+    """
+    site_dir = Path(site_dir)
+    assets = {}
+    for path in _site_files(site_dir):
+        rel_path = path.relative_to(site_dir).as_posix()
+        if rel_path in (SERVICE_WORKER_NAME, ASSET_MANIFEST_NAME) or rel_path.endswith(ASSET_EXCLUDED_SUFFIXES):
+            continue
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            # Chunked, so large index shards are never read whole
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        assets[rel_path] = digest.hexdigest()[:ASSET_HASH_LENGTH]
+    listing = json.dumps(assets, sort_keys=True, separators=(",", ":"))
+    version = hashlib.sha256(listing.encode("utf-8")).hexdigest()[:ASSET_HASH_LENGTH]
+    return {"version": version, "assets": assets}
+
+
+def render_service_worker(template: str, manifest: Dict[str, Any]) -> str:
+    """Return the service worker source with the asset manifest injected."""
+    if ASSET_MANIFEST_PLACEHOLDER not in template:
+        raise ValueError(f"service worker template has no {ASSET_MANIFEST_PLACEHOLDER} placeholder")
+    return template.replace(ASSET_MANIFEST_PLACEHOLDER, json.dumps(manifest, separators=(",", ":")), 1)
+
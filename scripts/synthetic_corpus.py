@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Generate a synthetic, schema-valid jurisdiction corpus for benchmarks.
+
+Files look like data/: every category has a type, subtype, masking flag,
+tags, category_tags and citations; a share also carry processing_purposes,
+risk_level and retention. Each framework directory gets a country-index.json
+that validate-paths accepts.
+
+Content is derived from (seed, file number) only, so the first 100 files of
+a 10,000-file corpus are the same as a 100-file corpus, and regenerating
+with the same options reproduces the same bytes.
+
+Usage:
+    # 1,000 files with 10-500 categories each under /tmp/synthetic/data
+    python scripts/synthetic_corpus.py /tmp/synthetic/data --files 1000 --categories 10 500
+
+Options:
+    --files N             Jurisdiction files to write (default: 100)
+    --categories MIN MAX  Categories per file (default: 10 50)
+    --per-framework N     Files per framework directory (default: 40)
+    --seed N              Random seed (default: 0)
+"""
+
+import argparse
+import json
+import random
+import re
+import shutil
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# (name, type, subtype, tags, category_tags) the synthetic categories are drawn from
+BASE_CATEGORIES = [
+    ("Full Name", "direct_identifier", "personal_name", ["pii"], ["core", "identity"]),
+    ("Email Address", "direct_identifier", "digital_contact", ["pii"], ["core", "contact"]),
+    ("Phone Number", "direct_identifier", "telecom_contact", ["pii"], ["core", "contact"]),
+    ("Postal Address", "direct_identifier", "physical_location", ["pii"], ["contact", "location"]),
+    ("Date of Birth", "quasi_identifier", "date", ["pii"], ["identity"]),
+    ("National ID Number", "national_identifier", "government_id", ["pii", "sensitive"], ["government", "national_id"]),
+    ("Passport Number", "national_identifier", "government_id", ["pii", "sensitive"], ["government"]),
+    ("Tax Identification Number", "financial_identifier", "tax_identifier", ["pii", "financial"], ["tax_id"]),
+    ("Bank Account Number", "financial_identifier", "bank_account", ["pii", "financial"], ["finance", "bank_account"]),
+    ("Credit Card Number", "financial_identifier", "financial_instrument", ["pii", "financial"], ["finance"]),
+    ("IP Address", "indirect_identifier", "network_identifier", ["tracking"], ["network", "online_identifier"]),
+    ("Device Identifier", "indirect_identifier", "device_id", ["tracking"], ["technical"]),
+    ("Cookie Identifier", "indirect_identifier", "digital_identifier", ["tracking"], ["online_identifier"]),
+    ("Precise Geolocation", "special_category", "geolocation", ["sensitive", "tracking"], ["location"]),
+    ("Health Records", "special_category", "health", ["phi", "sensitive"], ["health"]),
+    ("Medical Record Number", "special_category", "healthcare_id", ["phi", "sensitive"], ["health_id"]),
+    ("Genetic Data", "special_category", "genetic", ["sensitive"], ["genetic"]),
+    ("Fingerprint Template", "special_category", "biometric", ["sensitive"], ["biometric"]),
+    ("Facial Image", "special_category", "biometric", ["sensitive"], ["biometric", "image"]),
+    ("Racial or Ethnic Origin", "special_category", "demographic", ["sensitive"], ["sensitive"]),
+    ("Political Opinions", "special_category", "opinions", ["sensitive"], ["sensitive"]),
+    ("Religious Beliefs", "special_category", "opinions", ["sensitive"], ["sensitive"]),
+    ("Criminal Records", "special_category", "legal", ["sensitive"], ["criminal"]),
+    ("Employee ID", "direct_identifier", "employment", ["pii"], ["employment", "hr_data"]),
+    ("Salary Information", "quasi_identifier", "compensation", ["financial"], ["employment", "compensation"]),
+    ("Education History", "quasi_identifier", "education", ["pii"], ["education"]),
+    ("Vehicle Registration", "indirect_identifier", "vehicle_identifier", ["pii"], ["transport"]),
+    ("Insurance Policy Number", "financial_identifier", "insurance_id", ["pii", "financial"], ["insurance"]),
+    ("Browsing History", "behavioral", "digital_identity", ["tracking"], ["behavioral", "digital"]),
+    ("Purchase History", "behavioral", "financial", ["tracking"], ["behavioral"]),
+]
+
+# Appended to base names so files can hold more categories than the base list
+QUALIFIERS = [
+    "", "of Minor", "of Employee", "of Patient", "of Customer", "of Applicant",
+    "(Historical)", "(Derived)", "(Hashed)", "(Partial)", "of Beneficiary", "of Guarantor",
+    "of Contractor", "of Student", "of Tenant", "(Inferred)", "(Aggregated)",
+]
+
+PURPOSES = {
+    "allowed": ["service_delivery", "contract_fulfillment", "communication", "customer_support",
+                "authentication", "legal_obligation", "fraud_prevention", "security"],
+    "restricted": ["profiling_without_consent", "automated_decision_making", "third_party_sharing",
+                   "behavioral_advertising", "cross_context_tracking", "research"],
+    "prohibited": ["sale_without_consent", "discrimination", "surveillance", "re_identification"],
+}
+
+REGIONS = ["EU", "North America", "Latin America", "Asia-Pacific", "Middle East", "Africa"]
+RISK_LEVELS = ["low", "medium", "high", "critical"]
+DESCRIPTIONS = [
+    "Defines personal data as any information relating to an identified or identifiable person",
+    "Requires explicit consent before processing",
+    "Restricts processing to what is necessary for the stated purpose",
+    "Requires appropriate technical and organisational security measures",
+    "Grants data subjects a right of access and rectification",
+]
+
+DEFAULT_CATEGORIES = (10, 50)
+DEFAULT_PER_FRAMEWORK = 40
+
+
+def framework_of(number: int, per_framework: int = DEFAULT_PER_FRAMEWORK) -> int:
+    return number // per_framework
+
+
+def jurisdiction(number: int, seed: int = 0, categories=DEFAULT_CATEGORIES,
+                 per_framework: int = DEFAULT_PER_FRAMEWORK) -> Dict[str, Any]:
+    """Build the document of synthetic file `number`."""
+    rng = random.Random(f"{seed}:{number}")
+    fw = framework_of(number, per_framework)
+    regulation = f"SDPA-{fw:03d}"
+    count = rng.randint(*categories)
+
+    names = set()
+    category_list = []
+    while len(category_list) < count:
+        name, ctype, subtype, tags, category_tags = rng.choice(BASE_CATEGORIES)
+        qualifier = rng.choice(QUALIFIERS)
+        full_name = f"{name} {qualifier}".strip()
+        if full_name in names:
+            # Past the distinct combinations, number the duplicates
+            full_name = f"{full_name} #{len(category_list)}"
+        names.add(full_name)
+
+        category = {
+            "name": full_name,
+            "type": ctype,
+            "subtype": subtype,
+            "required_masking": ctype != "behavioral" or rng.random() < 0.3,
+            "tags": list(tags),
+            "citations": [
+                {
+                    "regulation": regulation,
+                    "article": f"{rng.randint(1, 99)}({rng.randint(1, 9)})",
+                    "description": rng.choice(DESCRIPTIONS),
+                }
+                for _ in range(rng.randint(1, 3))
+            ],
+            "category_tags": list(category_tags),
+        }
+        if rng.random() < 0.3:
+            category["citations"].append({
+                "authority": f"Synthetic Authority {fw:03d}",
+                "guideline": f"Guideline {rng.randint(1, 40)}/{rng.randint(2018, 2025)}",
+                "url": f"https://example.org/sdpa-{fw:03d}/guidelines/{rng.randint(1, 999)}",
+            })
+        if rng.random() < 0.4:
+            category["processing_purposes"] = {
+                kind: rng.sample(options, rng.randint(1, len(options) // 2 + 1))
+                for kind, options in PURPOSES.items()
+            }
+        if rng.random() < 0.3:
+            category["risk_level"] = rng.choice(RISK_LEVELS)
+            category["retention"] = {"max_days": rng.choice([30, 90, 365, 730, 2555])}
+        category_list.append(category)
+
+    return {
+        "country": f"Synthland {number:05d}",
+        "framework": regulation,
+        "region": REGIONS[fw % len(REGIONS)],
+        "language": "en",
+        "version": "2025-01",
+        "status": "published",
+        "last_updated": f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "source_verified": rng.random() < 0.8,
+        "authority": f"Synthetic Authority {fw:03d}",
+        "notes": [f"Synthetic jurisdiction {number} generated for benchmarks."],
+        "categories": category_list,
+    }
+
+
+# Strings that read back as the same string when written unquoted
+_PLAIN_RE = re.compile(r"[A-Za-z][A-Za-z0-9 _().#/,-]*")
+_RESERVED = {"yes", "no", "on", "off", "true", "false", "null", "y", "n", "~"}
+
+
+def _scalar(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if _PLAIN_RE.fullmatch(value) and value.lower() not in _RESERVED and not value.endswith(" ") and " #" not in value:
+        return value
+    # JSON strings are valid double-quoted YAML scalars
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _emit(value: Any, indent: int, lines: List[str]):
+    pad = " " * indent
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, (dict, list)) and item:
+                lines.append(f"{pad}{key}:")
+                # Lists sit at their key's indentation, as PyYAML writes them
+                _emit(item, indent + 2 if isinstance(item, dict) else indent, lines)
+            else:
+                lines.append(f"{pad}{key}: {'[]' if item == [] else '{}' if item == {} else _scalar(item)}")
+    else:
+        for item in value:
+            if isinstance(item, dict):
+                start = len(lines)
+                _emit(item, indent + 2, lines)
+                lines[start] = f"{pad}- {lines[start][indent + 2:]}"
+            else:
+                lines.append(f"{pad}- {_scalar(item)}")
+
+
+def to_yaml(document: Dict[str, Any]) -> str:
+    """
+    Block-style YAML in the layout of data/ files.
+
+    A small emitter for the shapes jurisdiction() produces; PyYAML's dumper
+    (even libyaml-backed) takes minutes for a 10,000-file corpus.
+    """
+    lines: List[str] = []
+    _emit(document, 0, lines)
+    return "\n".join(lines) + "\n"
+
+
+def generate_corpus(data_dir, files: int, categories=DEFAULT_CATEGORIES, seed: int = 0,
+                    per_framework: int = DEFAULT_PER_FRAMEWORK) -> Dict[str, int]:
+    """
+    Write a synthetic corpus into data_dir, replacing what is there.
+
+    Returns:
+        {"files": n, "frameworks": n, "categories": n, "bytes": n}
+    """
+    data_dir = Path(data_dir)
+    if data_dir.exists():
+        shutil.rmtree(data_dir)
+    by_framework: Dict[int, List[Dict[str, Any]]] = {}
+    total_categories = total_bytes = 0
+
+    for number in range(files):
+        document = jurisdiction(number, seed, categories, per_framework)
+        fw = framework_of(number, per_framework)
+        fw_dir = data_dir / f"sdpa{fw:03d}"
+        fw_dir.mkdir(parents=True, exist_ok=True)
+        slug = f"synthland-{number:05d}"
+        text = to_yaml(document)
+        (fw_dir / f"{slug}.yaml").write_text(text, encoding="utf-8")
+        total_categories += len(document["categories"])
+        total_bytes += len(text.encode("utf-8"))
+        by_framework.setdefault(fw, []).append({
+            "name": document["country"],
+            "slug": slug,
+            "path": f"data/sdpa{fw:03d}/{slug}.yaml",
+            "status": "complete",
+        })
+
+    for fw, countries in by_framework.items():
+        index = {
+            "framework": f"SDPA-{fw:03d}",
+            "region": REGIONS[fw % len(REGIONS)],
+            "last_updated": "2025-01-01",
+            "countries": countries,
+        }
+        with open(data_dir / f"sdpa{fw:03d}" / "country-index.json", "w", encoding="utf-8") as f:
+            json.dump(index, f, indent=2)
+            f.write("\n")
+
+    return {"files": files, "frameworks": len(by_framework), "categories": total_categories, "bytes": total_bytes}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic jurisdiction corpus")
+    parser.add_argument('data_dir', help="Directory to write (replaced if it exists)")
+    parser.add_argument('--files', type=int, default=100, help="Jurisdiction files to write")
+    parser.add_argument('--categories', type=int, nargs=2, default=list(DEFAULT_CATEGORIES),
+                        metavar=('MIN', 'MAX'), help="Categories per file")
+    parser.add_argument('--per-framework', type=int, default=DEFAULT_PER_FRAMEWORK,
+                        help="Files per framework directory")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    args = parser.parse_args(argv)
+
+    stats = generate_corpus(args.data_dir, args.files, tuple(args.categories), args.seed, args.per_framework)
+    print(f"✅ Wrote {stats['files']:,} file(s) in {stats['frameworks']} framework(s), "
+          f"{stats['categories']:,} categories, {stats['bytes'] / 1e6:.1f} MB to {args.data_dir}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,6 @@
-import os
-import yaml
+import copy
+
+from corpus import DATA_DIR, dump_yaml, load_corpus
 
 def infer_tags(cat):
     tags = set()
@@ -36,33 +37,34 @@ def reorder_fields(cat):
             ordered[k] = cat[k]
     return ordered
 
-def tag_all_yamls(base_path="data"):
+def tag_all_yamls(base_path=DATA_DIR):
     failures = []
     modified = 0
-    for root, _, files in os.walk(base_path):
-        for file in files:
-            if file.endswith(".yaml"):
-                full_path = os.path.join(root, file)
-                try:
-                    with open(full_path, "r", encoding="utf-8") as f:
-                        data = yaml.safe_load(f)
+    for jurisdiction in load_corpus(base_path):
+        full_path = jurisdiction.rel_path
+        if jurisdiction.error is not None:
+            failures.append((full_path, jurisdiction.error))
+            continue
+        try:
+            # Work on a copy so the shared corpus keeps the on-disk content
+            data = copy.deepcopy(jurisdiction.data)
 
-                    categories = data.get("categories", [])
-                    changed = False
-                    new_cats = []
-                    for cat in categories:
-                        old_tags = cat.get("tags", [])
-                        new_cat = reorder_fields(cat)
-                        if not old_tags or old_tags != new_cat["tags"]:
-                            changed = True
-                        new_cats.append(new_cat)
-                    if changed:
-                        data["categories"] = new_cats
-                        with open(full_path, "w", encoding="utf-8") as f:
-                            yaml.dump(data, f, sort_keys=False, allow_unicode=True)
-                        modified += 1
-                except Exception as e:
-                    failures.append((full_path, str(e)))
+            categories = data.get("categories", [])
+            changed = False
+            new_cats = []
+            for cat in categories:
+                old_tags = cat.get("tags", [])
+                new_cat = reorder_fields(cat)
+                if not old_tags or old_tags != new_cat["tags"]:
+                    changed = True
+                new_cats.append(new_cat)
+            if changed:
+                data["categories"] = new_cats
+                with open(jurisdiction.path, "w", encoding="utf-8") as f:
+                    dump_yaml(data, f)
+                modified += 1
+        except Exception as e:
+            failures.append((full_path, str(e)))
     return modified, failures
 
 if __name__ == "__main__":
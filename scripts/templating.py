@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Shared Jinja2 setup for the site generators.
+
+Each process gets a single Environment per template directory, backed by an
+on-disk bytecode cache under .openpiimap-cache/jinja/ (or
+$OPENPIIMAP_CACHE_DIR/jinja/). Templates are compiled once and later runs,
+including build worker processes, load the compiled bytecode instead of
+re-parsing the template sources. Jinja invalidates cached bytecode itself
+when a template file changes.
+
+Header variants are rendered once and memoized for the rest of the process.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+from corpus import CACHE_DIR, PROJECT_ROOT
+
+TEMPLATE_DIR = PROJECT_ROOT / "scripts" / "templates"
+BYTECODE_CACHE_DIR = CACHE_DIR / "jinja"
+
+
+@lru_cache(maxsize=None)
+def get_environment(template_dir=TEMPLATE_DIR) -> Environment:
+    """Return the process-wide Environment for a template directory."""
+    os.makedirs(BYTECODE_CACHE_DIR, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(str(Path(template_dir))),
+        bytecode_cache=FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR)),
+    )
+
+
+@lru_cache(maxsize=None)
+def render_header(active_page="", in_country_page=False, template_dir=TEMPLATE_DIR) -> str:
+    """Render the shared header once per (active_page, in_country_page) variant."""
+    template = get_environment(template_dir).get_template("header_template.html")
+    return template.render(active_page=active_page, in_country_page=in_country_page)
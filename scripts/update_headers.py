@@ -7,7 +7,8 @@ Updates all HTML pages with consistent header from template.
 import os
 import re
 from pathlib import Path
-from jinja2 import Environment, FileSystemLoader
+from output_writer import write_if_changed
+from templating import get_environment, render_header as render_cached_header
 
 # Paths
 SITE_DIR = "./site"
@@ -23,14 +24,12 @@ PAGE_CONFIGS = {
 }
 
 def setup_jinja():
-    """Setup Jinja2 environment"""
-    return Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+    """Return the shared Jinja2 environment"""
+    return get_environment(TEMPLATE_DIR)
 
 def render_header(active_page="", in_country_page=False):
-    """Render header template with active page and country page flag"""
-    env = setup_jinja()
-    template = env.get_template("header_template.html")
-    return template.render(active_page=active_page, in_country_page=in_country_page)
+    """Render header template with active page and country page flag (memoized)"""
+    return render_cached_header(active_page, in_country_page, TEMPLATE_DIR)
 
 def update_header_in_file(file_path, new_header):
     """Update header section in HTML file"""
@@ -58,9 +57,8 @@ def update_header_in_file(file_path, new_header):
                 print(f"Could not find header or body tag in {file_path}")
                 return False
         
-        # Write updated content
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(updated_content)
+        # Write updated content (pages that already carry this header keep their mtime)
+        write_if_changed(file_path, updated_content)
             
         return True
         
@@ -117,7 +115,7 @@ def update_country_pages():
     # Render header with country page flag for country pages
     header_html = render_header(in_country_page=True)
     
-    for filename in os.listdir(countries_dir):
+    for filename in sorted(os.listdir(countries_dir)):
         if filename.endswith('.html'):
             file_path = os.path.join(countries_dir, filename)
             
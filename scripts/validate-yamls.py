@@ -1,18 +1,12 @@
+import argparse
 import os
-import yaml
-import json
-from jsonschema import validate, ValidationError
-from yaml.loader import SafeLoader
+import sys
 
-# Disable PyYAML date parsing
-class NoDatesSafeLoader(SafeLoader):
-    pass
+import yaml
 
-for first_letter, resolvers in list(NoDatesSafeLoader.yaml_implicit_resolvers.items()):
-    NoDatesSafeLoader.yaml_implicit_resolvers[first_letter] = [
-        (tag, regexp) for tag, regexp in resolvers
-        if tag != 'tag:yaml.org,2002:timestamp'
-    ]
+from corpus import DATA_DIR, load_corpus, parse_yaml
+from profiling import DEFAULT_TRACE_PATH, profiled, profiler
+from schema_validator import collect_errors, get_fast_check, get_validator, validate_many
 
 # Citation entry must include at least one of: regulation, national_law, authority
 citation_schema = {
@@ -76,32 +70,69 @@ file_schema = {
     "required": ["country", "framework", "categories"]
 }
 
+def validate_document(content):
+    """Return (valid, errors) with every schema error in a parsed document"""
+    errors = collect_errors(get_validator(file_schema), content, get_fast_check(file_schema))
+    return not errors, errors
+
 def validate_yaml_file(file_path):
     with open(file_path, 'r', encoding='utf-8') as f:
         try:
-            content = yaml.load(f, Loader=NoDatesSafeLoader)
-            validate(instance=content, schema=file_schema)
-            return True, None
-        except (yaml.YAMLError, ValidationError) as e:
-            return False, str(e)
+            content = parse_yaml(f)
+        except yaml.YAMLError as e:
+            return False, [{"path": "", "message": str(e)}]
+    return validate_document(content)
 
-def scan_and_validate_all_yamls(base_path='data'):
-    failures = []
-    for root, _, files in os.walk(base_path):
-        for file in files:
-            if file.endswith(".yaml"):
-                full_path = os.path.join(root, file)
-                valid, error = validate_yaml_file(full_path)
-                if not valid:
-                    failures.append((full_path, error))
-    return failures
+def validate_jurisdiction(jurisdiction):
+    """Return (valid, errors) for one loaded jurisdiction"""
+    if jurisdiction.error is not None:
+        return False, [{"path": "", "message": jurisdiction.error}]
+    return validate_document(jurisdiction.data)
 
-# Execute
-if __name__ == '__main__':
-    failures = scan_and_validate_all_yamls()
+def validate_jurisdictions(jurisdictions, jobs=1):
+    """
+    Validate many jurisdictions, spreading them across `jobs` worker processes.
+
+    Returns:
+        List of (jurisdiction, errors) in input order
+    """
+    parsed = [j for j in jurisdictions if j.error is None]
+    with profiler.phase("validate", files=len(parsed), jobs=jobs):
+        fresh = validate_many(file_schema, [j.data for j in parsed], jobs)
+    fresh = iter(fresh)
+    return [
+        (j, next(fresh) if j.error is None else [{"path": "", "message": j.error}])
+        for j in jurisdictions
+    ]
+
+def scan_and_validate_all_yamls(base_path=DATA_DIR, jobs=1):
+    """Return (rel_path, errors) for every file that fails validation"""
+    results = validate_jurisdictions(list(load_corpus(base_path)), jobs)
+    return [(j.rel_path, errors) for j, errors in results if errors]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate data/ YAML files against the schema")
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="Worker processes to validate with (0 = one per CPU)")
+    parser.add_argument('--profile', nargs='?', const=DEFAULT_TRACE_PATH, metavar='PATH',
+                        help=f"Print per-phase timings and write a Chrome trace (default: {DEFAULT_TRACE_PATH})")
+    args = parser.parse_args(argv)
+    jobs = args.jobs or os.cpu_count() or 1
+
+    with profiled(args.profile):
+        failures = scan_and_validate_all_yamls(jobs=jobs)
     if not failures:
         print("✅ All YAML files passed schema validation.")
-    else:
-        print(f"❌ {len(failures)} file(s) failed validation:\n")
-        for path, error in failures:
-            print(f"{path}:\n  {error}\n")
+        return 0
+    error_count = sum(len(errors) for _, errors in failures)
+    print(f"❌ {len(failures)} file(s) failed validation ({error_count} error(s)):\n")
+    for path, errors in failures:
+        print(f"{path}:")
+        for error in errors:
+            print(f"  {error['path'] or '(root)'}: {error['message']}")
+        print()
+    return 1
+
+# Execute
+if __name__ == '__main__':
+    sys.exit(main())
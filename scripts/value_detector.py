@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""
+Value-level PII detection for the standard subtypes in docs/subtype-taxonomy.md.
+
+Each PatternDef maps a regular expression (and, where the identifier has
+one, a checksum validator) to a subtype such as digital_contact,
+government_id or bank_account. National identifiers are tied to the
+countries that issue them, so a detector built for GDPR jurisdictions does
+not report Brazilian CPFs.
+
+All active patterns are compiled into ONE regular expression - an
+alternation - so scanning a value is a single pass over the text no matter
+how many jurisdictions are active. Only where that pass finds a match are
+the individual patterns consulted, in order, to name it and run its
+checksum; one that fails its checksum (e.g. a 16-digit run that is not a
+valid card number) hands over to the next, so the extra work is
+proportional to matches, not to the number of patterns.
+
+As a prefilter, one cheap regex first finds the digit-bearing spans of a
+value ("NL91ABNA0417164300", "+31 20 123 4567") and the combined regex only
+runs inside those spans; emails are matched separately, and only when the
+value contains an "@". Text without digits or "@" costs two C-level scans.
+
+Usage:
+    from corpus import load_corpus
+    from value_detector import ValueDetector
+
+    detector = ValueDetector.for_corpus(load_corpus(), framework="GDPR")
+    for detection in detector.detect("Contact jan@example.nl, IBAN NL91ABNA0417164300"):
+        print(detection.pattern, detection.subtype, detection.value)
+"""
+
+import ipaddress
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+
+# Word boundaries. The start boundary is checked *after* the first character
+# (a two-character lookbehind) so every alternative of the combined regex
+# begins with a plain character class, which the regex engine rejects
+# cheaply at positions where nothing can start.
+_B = r"(?<!\w.)"
+_E = r"(?![\w])"
+
+
+def _digits(text: str) -> str:
+    return "".join(ch for ch in text if ch.isdigit())
+
+
+def _valid_date(year: int, month: int, day: int) -> bool:
+    try:
+        date(year, month, day)
+    except ValueError:
+        return False
+    return True
+
+
+def luhn_valid(number: str) -> bool:
+    """Luhn (mod 10) check used by payment cards and Swedish personnummer."""
+    digits = [int(d) for d in _digits(number)]
+    total = 0
+    for i, digit in enumerate(reversed(digits)):
+        if i % 2 == 1:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return bool(digits) and total % 10 == 0
+
+
+def card_valid(text: str) -> bool:
+    digits = _digits(text)
+    return 13 <= len(digits) <= 19 and digits[0] in "3456" and luhn_valid(digits)
+
+
+def iban_valid(text: str) -> bool:
+    """ISO 13616 mod-97 check."""
+    iban = text.replace(" ", "").upper()
+    if not 15 <= len(iban) <= 34:
+        return False
+    rearranged = iban[4:] + iban[:4]
+    numeric = "".join(str(int(ch, 36)) for ch in rearranged)
+    return int(numeric) % 97 == 1
+
+
+def ipv4_valid(text: str) -> bool:
+    return all(int(octet) <= 255 and (octet == "0" or not octet.startswith("0")) for octet in text.split("."))
+
+
+def ipv6_valid(text: str) -> bool:
+    if text.count(":") < 2 or not any(ch != ":" for ch in text):
+        return False
+    try:
+        ipaddress.IPv6Address(text)
+    except ValueError:
+        return False
+    return True
+
+
+def phone_valid(text: str) -> bool:
+    return 8 <= len(_digits(text)) <= 15
+
+
+def coordinates_valid(text: str) -> bool:
+    lat, lon = (float(part) for part in re.split(r"[,;]\s*", text))
+    return -90 <= lat <= 90 and -180 <= lon <= 180
+
+
+def ssn_valid(text: str) -> bool:
+    digits = _digits(text)
+    area, group, serial = digits[:3], digits[3:5], digits[5:]
+    return area not in ("000", "666") and area[0] != "9" and group != "00" and serial != "0000"
+
+
+def nino_valid(text: str) -> bool:
+    prefix = text[:2].upper()
+    return prefix not in ("BG", "GB", "NK", "KN", "TN", "NT", "ZZ")
+
+
+def bsn_valid(text: str) -> bool:
+    """Dutch BSN eleven-test."""
+    digits = [int(d) for d in _digits(text)]
+    total = sum(d * w for d, w in zip(digits[:8], range(9, 1, -1))) - digits[8]
+    return total % 11 == 0 and total > 0
+
+
+def pesel_valid(text: str) -> bool:
+    digits = [int(d) for d in text]
+    weights = (1, 3, 7, 9, 1, 3, 7, 9, 1, 3)
+    check = (10 - sum(d * w for d, w in zip(digits, weights)) % 10) % 10
+    return check == digits[10]
+
+
+def dni_valid(text: str) -> bool:
+    """Spanish DNI/NIE control letter."""
+    value = text.upper().replace("-", "")
+    value = value.replace("X", "0", 1) if value[0] == "X" else value
+    value = value.replace("Y", "1", 1) if value[0] == "Y" else value
+    value = value.replace("Z", "2", 1) if value[0] == "Z" else value
+    return "TRWAGMYFPDXBNJZSQVHLCKE"[int(value[:-1]) % 23] == value[-1]
+
+
+_CF_ODD = [1, 0, 5, 7, 9, 13, 15, 17, 19, 21, 2, 4, 18, 20, 11, 3, 6, 8, 12, 14, 16, 10, 22, 25, 24, 23]
+
+
+def codice_fiscale_valid(text: str) -> bool:
+    """Italian codice fiscale check character."""
+    code = text.upper()
+    total = 0
+    for i, ch in enumerate(code[:15]):
+        value = int(ch) if ch.isdigit() else ord(ch) - ord("A")
+        total += _CF_ODD[value] if i % 2 == 0 else value
+    return chr(ord("A") + total % 26) == code[15]
+
+
+def nir_valid(text: str) -> bool:
+    """French NIR (numéro de sécurité sociale) key."""
+    value = text.replace(" ", "").upper()
+    body, key = value[:13], int(value[13:])
+    body = body.replace("2A", "19").replace("2B", "18")
+    return 97 - int(body) % 97 == key
+
+
+def personnummer_valid(text: str) -> bool:
+    digits = _digits(text)[-10:]
+    return _valid_date(2000 + int(digits[0:2]), int(digits[2:4]), int(digits[4:6]) % 60) and luhn_valid(digits)
+
+
+def hetu_valid(text: str) -> bool:
+    """Finnish henkilötunnus check character."""
+    value = text.upper()
+    number = int(value[:6] + value[7:10])
+    return "0123456789ABCDEFHJKLMNPRSTUVWXY"[number % 31] == value[10]
+
+
+def cpr_valid(text: str) -> bool:
+    digits = _digits(text)
+    return _valid_date(2000 + int(digits[4:6]), int(digits[2:4]), int(digits[0:2]))
+
+
+def fodselsnummer_valid(text: str) -> bool:
+    """Norwegian fødselsnummer, two mod-11 check digits."""
+    digits = [int(d) for d in text]
+    for weights, position in (((3, 7, 6, 1, 8, 9, 4, 5, 2), 9), ((5, 4, 3, 2, 7, 6, 5, 4, 3, 2), 10)):
+        check = 11 - sum(d * w for d, w in zip(digits, weights)) % 11
+        check = 0 if check == 11 else check
+        if check == 10 or check != digits[position]:
+            return False
+    return True
+
+
+def belgian_nn_valid(text: str) -> bool:
+    """Belgian national register number mod-97 (pre- and post-2000 births)."""
+    digits = _digits(text)
+    body, key = int(digits[:9]), int(digits[9:])
+    return 97 - body % 97 == key or 97 - int("2" + digits[:9]) % 97 == key
+
+
+def isikukood_valid(text: str) -> bool:
+    """Estonian/Lithuanian personal code check digit."""
+    digits = [int(d) for d in text]
+    for weights in ((1, 2, 3, 4, 5, 6, 7, 8, 9, 1), (3, 4, 5, 6, 7, 8, 9, 1, 2, 3)):
+        check = sum(d * w for d, w in zip(digits, weights)) % 11
+        if check != 10:
+            return check == digits[10]
+    return digits[10] == 0
+
+
+def cpf_valid(text: str) -> bool:
+    """Brazilian CPF, two mod-11 check digits."""
+    digits = [int(d) for d in _digits(text)]
+    if len(set(digits)) == 1:
+        return False
+    for length in (9, 10):
+        total = sum(d * w for d, w in zip(digits[:length], range(length + 1, 1, -1)))
+        check = total * 10 % 11 % 10
+        if check != digits[length]:
+            return False
+    return True
+
+
+_VERHOEFF_D = [
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9], [1, 2, 3, 4, 0, 6, 7, 8, 9, 5],
+    [2, 3, 4, 0, 1, 7, 8, 9, 5, 6], [3, 4, 0, 1, 2, 8, 9, 5, 6, 7],
+    [4, 0, 1, 2, 3, 9, 5, 6, 7, 8], [5, 9, 8, 7, 6, 0, 4, 3, 2, 1],
+    [6, 5, 9, 8, 7, 1, 0, 4, 3, 2], [7, 6, 5, 9, 8, 2, 1, 0, 4, 3],
+    [8, 7, 6, 5, 9, 3, 2, 1, 0, 4], [9, 8, 7, 6, 5, 4, 3, 2, 1, 0],
+]
+_VERHOEFF_P = [
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9], [1, 5, 7, 6, 2, 8, 3, 0, 9, 4],
+    [5, 8, 0, 3, 7, 9, 6, 1, 4, 2], [8, 9, 1, 6, 0, 4, 3, 5, 2, 7],
+    [9, 4, 5, 3, 1, 2, 6, 8, 7, 0], [4, 2, 8, 6, 5, 7, 3, 9, 0, 1],
+    [2, 7, 9, 3, 8, 0, 6, 4, 1, 5], [7, 0, 4, 6, 9, 1, 3, 2, 5, 8],
+]
+
+
+def aadhaar_valid(text: str) -> bool:
+    """Indian Aadhaar Verhoeff check digit."""
+    check = 0
+    for i, digit in enumerate(reversed(_digits(text))):
+        check = _VERHOEFF_D[check][_VERHOEFF_P[i % 8][int(digit)]]
+    return check == 0
+
+
+def nric_valid(text: str) -> bool:
+    """Singapore NRIC/FIN check letter (S, T, F and G series)."""
+    value = text.upper()
+    total = sum(int(d) * w for d, w in zip(value[1:8], (2, 7, 6, 5, 4, 3, 2)))
+    if value[0] in "TG":
+        total += 4
+    letters = "JZIHGFEDCBA" if value[0] in "ST" else "XWUTRQPNMLK"
+    return letters[total % 11] == value[8]
+
+
+def china_id_valid(text: str) -> bool:
+    """Chinese resident identity number, ISO 7064 mod 11-2."""
+    value = text.upper()
+    weights = (7, 9, 10, 5, 8, 4, 2, 1, 6, 3, 7, 9, 10, 5, 8, 4, 2)
+    total = sum(int(d) * w for d, w in zip(value[:17], weights))
+    return "10X98765432"[total % 11] == value[17] and _valid_date(
+        int(value[6:10]), int(value[10:12]), int(value[12:14])
+    )
+
+
+def thai_id_valid(text: str) -> bool:
+    digits = [int(d) for d in _digits(text)]
+    total = sum(d * w for d, w in zip(digits[:12], range(13, 1, -1)))
+    return (11 - total % 11) % 10 == digits[12]
+
+
+@dataclass(frozen=True)
+class PatternDef:
+    """A value pattern for one kind of identifier."""
+
+    name: str
+    subtypes: Tuple[str, ...]
+    regex: str
+    validator: Optional[Callable[[str], bool]] = None
+    countries: Tuple[str, ...] = ()
+    # "0": the value contains a digit, so the pattern is only tried inside
+    # digit-bearing candidate spans; "@": tried over the whole value when it
+    # contains an "@"
+    trigger: str = "0"
+
+    @property
+    def subtype(self) -> str:
+        """Primary subtype reported for detections."""
+        return self.subtypes[0]
+
+
+@dataclass(frozen=True)
+class Detection:
+    """One PII value found in a string."""
+
+    pattern: str
+    subtype: str
+    start: int
+    end: int
+    value: str
+
+
+# Ordered from most to least specific: when two patterns can match at the
+# same position, the earlier one is tried first
+PATTERNS: Tuple[PatternDef, ...] = (
+    PatternDef("email", ("digital_contact",),
+               r"(?<![\w.+-])[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}(?![\w-])",
+               trigger="@"),
+    PatternDef("iban", ("bank_account", "financial_identifier", "financial_account"),
+               r"[A-Z]" + _B + r"[A-Z]\d{2}(?: ?[A-Z0-9]{4}){2,7}(?: ?[A-Z0-9]{1,3})?" + _E, iban_valid),
+    PatternDef("mac_address", ("device_id",),
+               r"[0-9A-Fa-f]" + _B + r"[0-9A-Fa-f](?:[:-][0-9A-Fa-f]{2}){5}" + _E),
+    PatternDef("ipv6", ("network_identifier",),
+               r"(?<![\w:])(?:[0-9A-Fa-f]{0,4}:){2,7}[0-9A-Fa-f]{0,4}(?![\w:])", ipv6_valid),
+    PatternDef("ipv4", ("network_identifier",),
+               # Not part of a longer dotted number (version strings, OIDs)
+               r"\d" + _B + r"(?<!\d\.\d)\d{0,2}(?:\.\d{1,3}){3}(?!\w|\.\d)", ipv4_valid),
+    PatternDef("coordinates", ("geolocation", "physical_location"),
+               r"[-+\d](?<![\w.].)(?:(?<=[-+])\d)?\d?\.\d{4,},\s?[-+]?\d{1,3}\.\d{4,}(?![\w.])", coordinates_valid),
+    PatternDef("china_resident_id", ("government_id",),
+               r"\d" + _B + r"\d{16}[\dXx]" + _E, china_id_valid, ("China",)),
+    PatternDef("credit_card", ("financial_identifier", "financial_instrument", "financial_account"),
+               r"\d" + _B + r"\d{3}(?:[ -]?\d{4}){2}[ -]?\d{1,7}" + _E, card_valid),
+    PatternDef("fr_nir", ("government_id", "social_security"),
+               r"[12]" + _B + r" ?\d{2} ?(?:0[1-9]|1[0-2]|[2-9]\d) ?(?:\d{2}|2[AB]) ?\d{3} ?\d{3} ?\d{2}" + _E,
+               nir_valid, ("France",)),
+    PatternDef("th_national_id", ("government_id",),
+               r"\d" + _B + r"-?\d{4}-?\d{5}-?\d{2}-?\d" + _E, thai_id_valid, ("Thailand",)),
+    PatternDef("se_personnummer", ("government_id",),
+               r"\d" + _B + r"\d{5}(?:\d{2})?[-+]?\d{4}" + _E, personnummer_valid, ("Sweden",)),
+    PatternDef("in_aadhaar", ("government_id",),
+               r"[2-9]" + _B + r"\d{3} ?\d{4} ?\d{4}" + _E, aadhaar_valid, ("India",)),
+    PatternDef("pl_pesel", ("government_id",),
+               r"\d" + _B + r"\d{10}" + _E, pesel_valid, ("Poland",)),
+    PatternDef("no_fodselsnummer", ("government_id",),
+               r"\d" + _B + r"\d{10}" + _E, fodselsnummer_valid, ("Norway",)),
+    PatternDef("ee_isikukood", ("government_id",),
+               r"[1-6]" + _B + r"\d{10}" + _E, isikukood_valid, ("Estonia", "Lithuania")),
+    PatternDef("br_cpf", ("government_id",),
+               r"\d" + _B + r"\d{2}\.?\d{3}\.?\d{3}-?\d{2}" + _E, cpf_valid, ("Brazil",)),
+    PatternDef("be_national_number", ("government_id",),
+               r"\d" + _B + r"\d\.?\d{2}\.?\d{2}-?\d{3}\.?\d{2}" + _E, belgian_nn_valid, ("Belgium",)),
+    PatternDef("dk_cpr", ("government_id",),
+               r"\d" + _B + r"\d{5}-\d{4}" + _E, cpr_valid, ("Denmark",)),
+    PatternDef("us_ssn", ("government_id", "social_security"),
+               r"\d" + _B + r"\d{2}-\d{2}-\d{4}" + _E, ssn_valid, ("United States",)),
+    PatternDef("nl_bsn", ("government_id",),
+               r"\d" + _B + r"\d{8}" + _E, bsn_valid, ("Netherlands",)),
+    # International numbers need a +country prefix; bare digit groups are only
+    # accepted in the North American layouts, so dates and amounts don't match
+    PatternDef("phone", ("telecom_contact",),
+               r"[+(\d](?<![\w+].)(?:(?<=\+)\d{1,3}[\s.-]?(?:\(\d{1,4}\)[\s.-]?)?\d{1,4}(?:[\s.-]?\d{2,4}){1,4}"
+               r"|(?<=\()\d{3}\)\s?\d{3}[\s.-]\d{4}|(?<=\d)\d{2}[.-]\d{3}[.-]\d{4})" + _E,
+               phone_valid),
+    PatternDef("it_codice_fiscale", ("government_id", "tax_identifier"),
+               r"[A-Za-z]" + _B + r"[A-Za-z]{5}\d{2}[A-Za-z]\d{2}[A-Za-z]\d{3}[A-Za-z]" + _E,
+               codice_fiscale_valid, ("Italy",)),
+    PatternDef("fi_hetu", ("government_id",),
+               r"\d" + _B + r"\d{5}[-+A-FU-Y]\d{3}[0-9A-Ya-y]" + _E, hetu_valid, ("Finland",)),
+    PatternDef("es_dni", ("government_id",),
+               r"[XYZxyz\d]" + _B + r"\d{6,8}-?[A-Za-z]" + _E, dni_valid, ("Spain",)),
+    PatternDef("uk_nino", ("government_id", "social_security"),
+               r"[A-CEGHJ-PR-TW-Za-ceghj-pr-tw-z]" + _B
+               + r"[A-CEGHJ-NPR-TW-Za-ceghj-npr-tw-z] ?\d{2} ?\d{2} ?\d{2} ?[A-Da-d]" + _E,
+               nino_valid, ("United Kingdom",)),
+    PatternDef("sg_nric", ("government_id",),
+               r"[STFGstfg]" + _B + r"\d{7}[A-Za-z]" + _E, nric_valid, ("Singapore",)),
+)
+
+_HAS_DIGIT = re.compile(r"\d")
+# Spans that can hold a digit-triggered identifier: a run of identifier
+# characters containing a digit, continued across single spaces/commas while
+# the next word has a digit or is a short group like an IBAN's bank code
+# ("NL91 ABNA 0417 1643 00", "52.37403, 4.88969"); the patterns and their
+# validators reject whatever in the run isn't a value, and prose words end it
+_CANDIDATE = re.compile(
+    r"(?<![\w.:+()-])[\w.:+()-]*\d"
+    r"(?:[\w.:+(),-]|[ ,](?=[\w.:+()-]*\d|[\w.:+()-]{1,4}(?![\w.:+()-])))*"
+)
+
+
+def _country_matches(pattern_countries: Sequence[str], countries: Iterable[str]) -> bool:
+    """Match pattern countries against jurisdiction countries like 'United States - Utah'."""
+    for country in countries:
+        for name in pattern_countries:
+            if country == name or country.startswith(name + " - "):
+                return True
+    return False
+
+
+class ValueDetector:
+    """Single-pass matcher over every active value pattern."""
+
+    def __init__(self, patterns: Sequence[PatternDef] = PATTERNS,
+                 subtypes: Optional[Iterable[str]] = None, countries: Optional[Iterable[str]] = None):
+        """
+        Args:
+            patterns: Pattern definitions, most specific first
+            subtypes: Only use patterns for these subtypes (default: all)
+            countries: Only use country-specific patterns for these countries
+                       (default: all); patterns without countries always apply
+        """
+        subtypes = set(subtypes) if subtypes is not None else None
+        countries = list(countries) if countries is not None else None
+        self.patterns: List[PatternDef] = [
+            p for p in patterns
+            if (subtypes is None or subtypes.intersection(p.subtypes))
+            and (countries is None or not p.countries or _country_matches(p.countries, countries))
+        ]
+        # Patterns sharing a regex become one alternative with several validators
+        self._shapes: List[Tuple[str, List[PatternDef]]] = []
+        by_regex: Dict[str, List[PatternDef]] = {}
+        for pattern in self.patterns:
+            if pattern.regex not in by_regex:
+                by_regex[pattern.regex] = []
+                self._shapes.append((pattern.regex, by_regex[pattern.regex]))
+            by_regex[pattern.regex].append(pattern)
+
+        self._singles = [re.compile(regex) for regex, _ in self._shapes]
+        self._digit_shapes = [i for i, (_, group) in enumerate(self._shapes) if group[0].trigger == "0"]
+        self._email_shapes = [i for i, (_, group) in enumerate(self._shapes) if group[0].trigger == "@"]
+        self._combined = self._compile(self._digit_shapes)
+        self._emails = self._compile(self._email_shapes)
+
+    def _compile(self, shape_ids: List[int]) -> Optional[Pattern]:
+        if not shape_ids:
+            return None
+        # Non-capturing: the engine only has to find where *something*
+        # matches; which alternative it was is worked out at that position
+        return re.compile("|".join(f"(?:{self._shapes[i][0]})" for i in shape_ids))
+
+    @classmethod
+    def for_corpus(cls, corpus, framework: Optional[str] = None, country: Optional[str] = None) -> "ValueDetector":
+        """
+        Build a detector for the subtypes and countries of part of the corpus.
+
+        Args:
+            corpus: Loaded Corpus
+            framework: Restrict to one framework (case-insensitive)
+            country: Restrict to one country (case-insensitive)
+        """
+        criteria = {k: v for k, v in (("framework", framework), ("country", country)) if v}
+        entries = corpus.query(**criteria)
+        subtypes = {e.category.subtype for e in entries if e.category.subtype}
+        countries = {e.jurisdiction.country for e in entries}
+        return cls(subtypes=subtypes, countries=countries)
+
+    def _validate(self, shape: int, text: str) -> Optional[PatternDef]:
+        for pattern in self._shapes[shape][1]:
+            if pattern.validator is None:
+                return pattern
+            try:
+                if pattern.validator(text):
+                    return pattern
+            except (ValueError, IndexError):
+                continue
+        return None
+
+    def _scan(self, combined: Pattern, shape_ids: List[int], text: str,
+              pos: int, endpos: int, detections: List[Detection]):
+        """Append detections of combined's patterns within text[pos:endpos]."""
+        search = combined.search
+        while True:
+            match = search(text, pos, endpos)
+            if match is None:
+                return
+            start = match.start()
+            # Try the alternatives in order at this position; one whose
+            # checksum fails hands over to the next, as in the alternation
+            found = None
+            for shape in shape_ids:
+                candidate = self._singles[shape].match(text, start, endpos)
+                if candidate is not None:
+                    found = self._validate(shape, candidate.group())
+                    if found is not None:
+                        end = candidate.end()
+                        break
+            if found is not None:
+                detections.append(Detection(found.name, found.subtype, start, end, text[start:end]))
+                pos = end
+            else:
+                pos = start + 1
+
+    def detect(self, text: str) -> List[Detection]:
+        """Return every PII value in text, left to right."""
+        if not text:
+            return []
+        emails: List[Detection] = []
+        if self._emails is not None and "@" in text:
+            self._scan(self._emails, self._email_shapes, text, 0, len(text), emails)
+        if self._combined is None:
+            return emails
+
+        detections: List[Detection] = []
+        if _HAS_DIGIT.search(text) is None:
+            return emails
+        for span in _CANDIDATE.finditer(text):
+            self._scan(self._combined, self._digit_shapes, text, span.start(), span.end(), detections)
+        if emails:
+            # Digits inside an email address belong to the address
+            detections = [
+                d for d in detections
+                if not any(e.start < d.end and d.start < e.end for e in emails)
+            ]
+            detections = sorted(emails + detections, key=lambda d: d.start)
+        return detections
+
+    def contains_pii(self, text: str) -> bool:
+        """True if text contains at least one detectable PII value."""
+        return bool(self.detect(text))
+
+    def detect_many(self, values: Iterable[str]) -> List[List[Detection]]:
+        """Detect PII in each of a batch of values."""
+        detect = self.detect
+        return [detect(value) for value in values]
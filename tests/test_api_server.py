@@ -0,0 +1,47 @@
+import json
+
+import pytest
+
+from api_server import MAX_TOP, Api
+from corpus import load_corpus
+
+
+@pytest.fixture(scope="module")
+def api():
+    return Api(load_corpus())
+
+
+@pytest.mark.parametrize("query", ["tag=consent&tag=health", "tag=consent&tags=health"])
+def test_repeated_filter_is_rejected(api, query):
+    response = api.handle("GET", f"/categories?{query}", b"")
+    assert response.status == 400
+
+
+@pytest.mark.parametrize("top", [0, MAX_TOP + 1, True, "3"])
+def test_top_out_of_range_is_rejected(api, top):
+    body = json.dumps({"columns": ["cust_email"], "top": top}).encode()
+    assert api.handle("POST", "/classify", body).status == 400
+
+
+def test_top_up_to_limit_is_served(api):
+    body = json.dumps({"columns": ["cust_email"], "top": MAX_TOP}).encode()
+    response = api.handle("POST", "/classify", body)
+    assert response.status == 200
+    assert json.loads(response.body)["results"][0]["matches"]
+
+
+@pytest.mark.parametrize("body", [
+    {"columns": ["dob"], "framework": {"name": "GDPR"}},
+    {"columns": ["dob"], "country": ["Germany"]},
+    {"columns": ["dob"], "framework": 1},
+    {"columns": "dob"},
+    {"columns": ["dob", 7]},
+    {"columns": [["dob"]]},
+])
+def test_malformed_classify_request_is_rejected(api, body):
+    assert api.handle("POST", "/classify", json.dumps(body).encode()).status == 400
+
+
+def test_null_filters_are_accepted(api):
+    body = json.dumps({"columns": ["dob"], "framework": None, "country": None}).encode()
+    assert api.handle("POST", "/classify", body).status == 200
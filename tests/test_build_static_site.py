@@ -0,0 +1,51 @@
+import re
+import shutil
+from pathlib import Path
+
+import pytest
+
+import build_static_site
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    for framework in ("privacyact", "uk-gdpr"):
+        shutil.copytree(ROOT / "data" / framework, tmp_path / "data" / framework)
+    shutil.copytree(ROOT / "scripts" / "templates", tmp_path / "scripts" / "templates")
+    # The checked-in homepage: without it the first build writes a basic index
+    (tmp_path / "site").mkdir()
+    shutil.copy(ROOT / "site" / "index.html", tmp_path / "site" / "index.html")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OPENPIIMAP_NO_CACHE", "1")
+    return tmp_path
+
+
+def _build(capsys):
+    build_static_site.build_site()
+    out = capsys.readouterr().out
+    written = int(re.search(r"Wrote (\d+) changed file", out).group(1))
+    rebuilt, total = map(int, re.search(r"Rebuilt (\d+) of (\d+) country pages", out).groups())
+    return written, rebuilt, total
+
+
+def test_noop_rebuild_writes_nothing(project, capsys):
+    assert _build(capsys)[1:] == (4, 4)
+    assert _build(capsys) == (0, 0, 4)
+
+
+def test_one_file_edit_rebuilds_one_page(project, capsys):
+    _build(capsys)
+    page = project / "site" / "countries" / "privacyact-bahamas.html"
+    other = project / "site" / "countries" / "privacyact-australia.html"
+    before = other.stat().st_mtime_ns
+
+    yaml_path = project / "data" / "privacyact" / "bahamas.yaml"
+    yaml_path.write_text(yaml_path.read_text().replace("Bahamas", "The Bahamas", 1))
+    written, rebuilt, total = _build(capsys)
+
+    assert (rebuilt, total) == (1, 4)
+    assert written >= 1
+    assert "The Bahamas" in page.read_text()
+    assert other.stat().st_mtime_ns == before
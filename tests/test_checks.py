@@ -0,0 +1,25 @@
+from checks import run_checks
+from corpus import load_corpus
+
+MALFORMED = {
+    "strings.yaml": "country: X\nframework: GDPR\ncategories: [just a string]\n",
+    "scalar.yaml": "country: Y\nframework: GDPR\ncategories: nope\n",
+    "fields.yaml": "country: Z\nframework: GDPR\ncategories:\n  - name: A\n    tags: 5\n    citations: [x]\n",
+}
+
+
+def test_malformed_categories_are_reported(tmp_path):
+    framework = tmp_path / "gdpr"
+    framework.mkdir()
+    for name, text in MALFORMED.items():
+        (framework / name).write_text(text, encoding="utf-8")
+
+    report = run_checks(load_corpus(tmp_path, use_cache=False))
+
+    lint = {(f["path"].rsplit("/", 1)[-1], f["location"]): f["message"]
+            for f in report["findings"] if f["check"] == "lint" and f["severity"] == "error"}
+    assert lint[("strings.yaml", "category 1")] == "category is not a mapping"
+    assert lint[("scalar.yaml", "categories")] == "'categories' is not a list"
+    assert ("fields.yaml", "category 1, citation 1") in lint
+    schema_paths = {f["path"].rsplit("/", 1)[-1] for f in report["findings"] if f["check"] == "schema"}
+    assert schema_paths == set(MALFORMED)
@@ -0,0 +1,69 @@
+import pytest
+
+from column_classifier import ColumnClassifier
+from corpus import load_corpus
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return ColumnClassifier(load_corpus())
+
+
+@pytest.mark.parametrize("column", ["customer_id", "user_id", "status", "order_number", "product_code"])
+def test_generic_columns_match_nothing(classifier, column):
+    assert classifier.classify(column) == ()
+
+
+@pytest.mark.parametrize("column, name", [
+    ("national_id", "National ID"),
+    ("immigration_status", "Citizenship or Immigration Status"),
+    ("account_number", "Account Numbers"),
+    ("cust_email", "Email Address"),
+    ("dob", "Date of Birth"),
+])
+def test_distinctive_columns_match(classifier, column, name):
+    assert classifier.classify(column)[0].name == name
+
+
+@pytest.mark.parametrize("column, tokens", [
+    ("first_name", ["full", "name", "firstname"]),
+    ("ssnLast4", ["social", "security", "number", "ssn", "last"]),
+    ("emailAddress_2", ["email", "address"]),
+])
+def test_column_tokens(classifier, column, tokens):
+    assert classifier.column_tokens(column) == tokens
+
+
+def test_unseen_names_reuse_token_set_scoring():
+    classifier = ColumnClassifier(load_corpus())
+    first = classifier.classify("cust_email_1")
+    assert classifier.classify("user_email_2") is first
+    assert classifier.classify("EMAIL") is first
+
+
+@pytest.mark.parametrize("column", ["home_address", "billing_address", "zip", "street"])
+def test_shared_noun_alone_matches_nothing(column):
+    # Germany's only address categories are Email Address and IP Address
+    classifier = ColumnClassifier(load_corpus(), framework="GDPR", country="Germany")
+    assert classifier.classify(column) == ()
+
+
+@pytest.mark.parametrize("column, name", [
+    ("email_address", "Email Address"),
+    ("ip_address", "IP Address"),
+    ("home_address", "Home Address"),
+    ("billing_address", "Address"),
+    ("national_insurance_number", "National Insurance Number"),
+])
+def test_modified_nouns_still_match(classifier, column, name):
+    assert classifier.classify(column)[0].name == name
+
+
+def test_match_reports_each_jurisdiction(classifier):
+    # IP addresses need masking in some jurisdictions but not in others
+    match = classifier.classify("ip_address")[0].to_dict()
+    jurisdictions = match["jurisdictions"]
+    assert {j["required_masking"] for j in jurisdictions} == {True, False}
+    assert match["required_masking"] is True
+    for jurisdiction in jurisdictions:
+        assert {"framework", "country", "type", "required_masking", "risk_level"} <= set(jurisdiction)
@@ -0,0 +1,98 @@
+import json
+
+import yaml
+
+from corpus_delta import FEED_NAME, apply_delta, compute_delta, directory_snapshot, git_snapshot, write_feed
+from git_timeline import run_git
+
+
+def _write(data_dir, key, document, comment=""):
+    path = data_dir / f"{key}.yaml"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(comment + yaml.safe_dump(document, sort_keys=False))
+
+
+def _document(country, categories, **fields):
+    return {
+        "country": country,
+        "framework": "GDPR",
+        **fields,
+        "categories": [{"name": name, "type": "PII", "risk_level": risk} for name, risk in categories],
+    }
+
+
+def _versions(tmp_path):
+    old, new = tmp_path / "old", tmp_path / "new"
+    _write(old, "gdpr/france", _document("France", [("Email Address", "medium"), ("Phone Number", "medium")],
+                                         last_updated="2025-06-01"))
+    _write(old, "gdpr/spain", _document("Spain", [("Email Address", "medium")]))
+    _write(old, "gdpr/austria", _document("Austria", [("Email Address", "medium")]))
+
+    _write(new, "gdpr/france", _document("France", [("Email Address", "high"), ("Voice Recording", "high")],
+                                         last_updated="2025-09-01"))
+    _write(new, "gdpr/italy", _document("Italy", [("Email Address", "medium")]))
+    _write(new, "gdpr/austria", _document("Austria", [("Email Address", "medium")]), comment="# Reviewed\n")
+    return old, new
+
+
+def test_delta_lists_added_removed_and_modified(tmp_path):
+    old, new = _versions(tmp_path)
+    delta = compute_delta(directory_snapshot(old), directory_snapshot(new))
+
+    assert [(c["jurisdiction"], c["status"]) for c in delta["changes"]] == [
+        ("gdpr/france", "modified"), ("gdpr/italy", "added"), ("gdpr/spain", "removed"),
+    ]
+    assert delta["summary"] == {
+        "jurisdictions": {"added": 1, "removed": 1, "modified": 1, "reformatted": 1},
+        "categories": {"added": 2, "removed": 2, "modified": 1},
+        "fields": {"risk_level": 1},
+    }
+    france = delta["changes"][0]
+    assert france["fields"] == {"last_updated": {"old": "2025-06-01", "new": "2025-09-01"}}
+    assert france["categories"]["removed"] == ["Phone Number"]
+    assert [c["name"] for c in france["categories"]["added"]] == ["Voice Recording"]
+    assert france["categories"]["modified"] == [
+        {"name": "Email Address", "changes": {"risk_level": {"old": "medium", "new": "high"}}},
+    ]
+
+
+def test_delta_replays_onto_old_documents(tmp_path):
+    old, new = _versions(tmp_path)
+    delta = compute_delta(directory_snapshot(old), directory_snapshot(new))
+
+    def documents(data_dir):
+        return {p.relative_to(data_dir).with_suffix("").as_posix(): yaml.safe_load(p.read_text())
+                for p in data_dir.rglob("*.yaml")}
+
+    assert apply_delta(documents(old), delta) == documents(new)
+
+
+def test_git_and_directory_snapshots_share_ids(tmp_path, monkeypatch):
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_NAME", "Test")
+        monkeypatch.setenv(f"GIT_{var}_EMAIL", "test@example.com")
+    old, _ = _versions(tmp_path)
+    run_git(old, "init", "-q")
+    run_git(old, "add", ".")
+    run_git(old, "commit", "-q", "-m", "Initial")
+
+    snapshot = git_snapshot("HEAD", old)
+    assert snapshot.id == directory_snapshot(old).id
+    assert compute_delta(snapshot, directory_snapshot(old))["changes"] == []
+
+
+def test_feed_lists_latest_delta_first(tmp_path):
+    old, new = _versions(tmp_path)
+    forward = compute_delta(directory_snapshot(old), directory_snapshot(new))
+    backward = compute_delta(directory_snapshot(new), directory_snapshot(old))
+    feed = tmp_path / "feed"
+
+    write_feed(forward, feed)
+    write_feed(backward, feed)
+    entry = write_feed(forward, feed)
+
+    entries = json.loads((feed / FEED_NAME).read_text())["entries"]
+    assert [(e["from"], e["to"]) for e in entries] == [
+        (forward["from"]["id"], forward["to"]["id"]), (backward["from"]["id"], backward["to"]["id"]),
+    ]
+    assert json.loads((feed / entry["path"]).read_text()) == forward
@@ -0,0 +1,75 @@
+import pytest
+
+from corpus import load_corpus
+
+DOCUMENTS = {
+    "uk-gdpr/england.yaml": """\
+country: England
+framework: UK GDPR
+categories:
+- name: Email Address
+  type: direct_identifier
+  tags: [pii, contact]
+  risk_level: high
+- name: Health Data
+  type: special_category
+  subtype: health
+  tags: [phi]
+""",
+    "gdpr/germany.yaml": """\
+country: Germany
+framework: GDPR
+categories:
+- name: Email Address
+  type: direct_identifier
+  tags: [PII]
+""",
+}
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    for rel_path, text in DOCUMENTS.items():
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    return load_corpus(tmp_path, use_cache=False)
+
+
+def _names(entries):
+    return [(e.country, e.category.name) for e in entries]
+
+
+def test_query_intersects_fields_case_insensitively(corpus):
+    assert _names(corpus.query(tags="pii")) == [("Germany", "Email Address"), ("England", "Email Address")]
+    assert _names(corpus.query(tags="PII", framework="uk gdpr")) == [("England", "Email Address")]
+    assert _names(corpus.query(framework="UK-GDPR", type="special_category")) == [("England", "Health Data")]
+    assert corpus.query(country="england", tags="phi", risk_level="high") == ()
+
+
+def test_query_is_memoized(corpus):
+    assert corpus.query(tags="pii") is corpus.query(tags="pii")
+
+
+@pytest.mark.parametrize("criteria", [{"tags": ["pii"]}, {"tags": ("pii",)}, {"framework": {"name": "GDPR"}}])
+def test_query_rejects_non_scalar_values(corpus, criteria):
+    with pytest.raises(ValueError, match="single string or number"):
+        corpus.query(**criteria)
+
+
+def test_query_rejects_unknown_fields(corpus):
+    with pytest.raises(ValueError, match="Unknown field"):
+        corpus.query(colour="red")
+
+
+def test_values_count_one_key_per_framework(corpus):
+    # UK GDPR is indexed as both "UK GDPR" and "uk-gdpr" but counted once,
+    # and spellings that are one query key are one count
+    assert corpus.index.values("framework") == {"gdpr": 1, "uk-gdpr": 2}
+    assert corpus.index.values("country") == {"England": 2, "Germany": 1}
+    assert corpus.index.values("tags") == {"PII": 2, "contact": 1, "phi": 1}
+
+
+def test_framework_values_match_corpus_frameworks():
+    corpus = load_corpus()
+    assert list(corpus.index.values("framework")) == corpus.frameworks()
@@ -0,0 +1,50 @@
+from corpus import load_corpus
+from dataset_scanner import resolve_jurisdiction, scan_file
+
+IBANS = ["FR1420041010050500013M02606", "DE89370400440532013000", "NL91ABNA0417164300", "GB29NWBK60161331926819"]
+PHONES = ["+33 1 42 68 53 00", "+33 6 12 34 56 78", "+33 4 91 55 20 00", "+33 5 56 00 66 00"]
+
+
+def _scan(tmp_path, jurisdiction):
+    path = tmp_path / "accounts.csv"
+    rows = ["phone,iban"] + [f"{phone},{iban}" for phone, iban in zip(PHONES * 5, IBANS * 5)]
+    path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    corpus = load_corpus()
+    return scan_file(path, corpus, resolve_jurisdiction(corpus, jurisdiction), jobs=1)
+
+
+def test_pattern_without_category_is_not_covered(tmp_path):
+    # data/gdpr/france.yaml has no bank account category
+    report = _scan(tmp_path, "data/gdpr/france.yaml")
+
+    iban = next(c for c in report["columns"] if c["column"] == "iban")
+    assert [v["pattern"] for v in iban["values"]] == ["iban"]
+    assert iban["values"][0]["category"] is None
+    for category in report["categories"]:
+        assert "iban" not in category["columns"]
+    phone = next(c for c in report["categories"] if c["name"] == "Phone Number")
+    assert phone["columns"] == ["phone"]
+
+
+def test_pattern_with_category_is_covered(tmp_path):
+    report = _scan(tmp_path, "hipaa/usa")
+
+    iban = next(c for c in report["columns"] if c["column"] == "iban")
+    assert iban["values"][0]["category"] == "Account Numbers"
+
+
+def test_blank_lines_inside_quoted_fields_are_kept(tmp_path):
+    path = tmp_path / "tickets.csv"
+    path.write_text(
+        'notes,email\n'
+        '"first line\n\nthird line",alice@example.com\n'
+        '\n'
+        'short note,bob@example.com\n',
+        encoding="utf-8",
+    )
+    corpus = load_corpus()
+    report = scan_file(path, corpus, resolve_jurisdiction(corpus, "gdpr/france"), jobs=1)
+
+    assert (report["rows"], report["sampled_rows"], report["invalid_rows"]) == (2, 2, 0)
+    email = next(c for c in report["columns"] if c["column"] == "email")
+    assert [(v["pattern"], v["hits"]) for v in email["values"]] == [("email", 2)]
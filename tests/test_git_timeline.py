@@ -0,0 +1,77 @@
+import pytest
+
+from git_timeline import TIMELINE_CACHE_NAME, load_timeline, run_git
+
+
+def _yaml(country, categories):
+    lines = [f"country: {country}", "framework: GDPR", "categories:"]
+    lines += [f"  - name: {name}\n    type: personal" for name in categories]
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_NAME", "Test")
+        monkeypatch.setenv(f"GIT_{var}_EMAIL", "test@example.com")
+    root = tmp_path / "repo"
+    (root / "data" / "gdpr").mkdir(parents=True)
+    run_git(root, "init", "-q")
+    return root
+
+
+def _commit(repo, monkeypatch, day, subject, files=(), removed=()):
+    for path, text in files:
+        (repo / path).write_text(text)
+        run_git(repo, "add", path)
+    for path in removed:
+        run_git(repo, "rm", "-q", path)
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_DATE", f"2025-06-{day:02d}T12:00:00+00:00")
+    run_git(repo, "commit", "-q", "-m", subject)
+
+
+def test_timeline_follows_history(repo, tmp_path, monkeypatch):
+    _commit(repo, monkeypatch, 1, "Add France and Spain", [
+        ("data/gdpr/france.yaml", _yaml("France", ["Email Address", "Phone Number"])),
+        ("data/gdpr/spain.yaml", _yaml("Spain", ["Email Address"])),
+    ])
+    _commit(repo, monkeypatch, 5, "France: biometrics", [
+        ("data/gdpr/france.yaml", _yaml("France", ["Email Address", "Biometric Data"])),
+    ])
+    _commit(repo, monkeypatch, 9, "Drop Spain", removed=["data/gdpr/spain.yaml"])
+
+    timeline = load_timeline(repo / "data", tmp_path / "cache")
+
+    assert timeline.freshness("gdpr/france") == {"added": "2025-06-01", "last_changed": "2025-06-05", "commits": 2}
+    assert timeline.freshness("gdpr/spain") is None
+    france = timeline.jurisdictions["gdpr/france"]
+    assert sorted(france["categories"]) == ["Biometric Data", "Email Address"]
+    assert france["categories"]["Biometric Data"]["added"].startswith("2025-06-05")
+    assert [(c["status"], c["added"], c["removed"]) for c in france["history"]] == [
+        ("A", ["Email Address", "Phone Number"], []),
+        ("M", ["Biometric Data"], ["Phone Number"]),
+    ]
+    assert [(c["jurisdiction"], c["status"]) for c in timeline.recent_changes(2)] == [
+        ("gdpr/spain", "D"), ("gdpr/france", "M"),
+    ]
+
+
+def test_cached_timeline_is_extended(repo, tmp_path, monkeypatch):
+    _commit(repo, monkeypatch, 1, "Add France", [("data/gdpr/france.yaml", _yaml("France", ["Email Address"]))])
+    load_timeline(repo / "data", tmp_path / "cache")
+
+    _commit(repo, monkeypatch, 3, "France: phones", [
+        ("data/gdpr/france.yaml", _yaml("France", ["Email Address", "Phone Number"])),
+    ])
+    cached = load_timeline(repo / "data", tmp_path / "cache")
+    rebuilt = load_timeline(repo / "data", tmp_path / "empty-cache")
+
+    assert cached.to_dict() == rebuilt.to_dict()
+    assert cached.freshness("gdpr/france")["commits"] == 2
+    assert (tmp_path / "cache" / TIMELINE_CACHE_NAME).exists()
+
+
+def test_no_timeline_outside_git(tmp_path):
+    (tmp_path / "data").mkdir()
+    assert load_timeline(tmp_path / "data", tmp_path / "cache") is None
@@ -0,0 +1,23 @@
+import os
+import time
+
+from output_writer import STALE_STAGING_AGE, StagedOutput
+
+
+def test_stale_staging_is_removed(tmp_path):
+    root = tmp_path / "site"
+    stale = tmp_path / ".site-staging-killed"
+    (stale / "json").mkdir(parents=True)
+    old = time.time() - STALE_STAGING_AGE - 60
+    os.utime(stale, (old, old))
+    recent = tmp_path / ".site-staging-running"
+    recent.mkdir()
+
+    with StagedOutput(root) as output:
+        output.write_text(root / "index.html", "<html></html>")
+        output.commit()
+
+    assert not stale.exists()
+    assert recent.exists()
+    assert (root / "index.html").read_text() == "<html></html>"
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith(".site-staging-")] == [recent.name]
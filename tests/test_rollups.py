@@ -0,0 +1,27 @@
+from rollups import RollupStore
+
+
+def _member(name, framework, last_updated="2025-06-01"):
+    return {
+        "name": name, "framework": framework, "region": "Oceania", "file": f"{name}.yaml",
+        "last_updated": last_updated, "added": "", "categories": 3,
+        "type": {"direct_identifier": 3}, "risk_level": {}, "tag": {"pii": 3},
+    }
+
+
+def test_frameworks_are_counted_by_directory(tmp_path):
+    store = RollupStore(tmp_path)
+    contributions = {
+        "privacyact/australia": _member("Australia", "Privacy Act (Australia)"),
+        "privacyact/new-zealand": _member("New Zealand", "Privacy Act 2020 (New Zealand)"),
+        "gdpr/france": _member("France", "GDPR", "2024-01-01"),
+    }
+    store.sync({key: key for key in contributions}, contributions.__getitem__)
+
+    document = store.dashboard_document()
+    assert document["totals"]["frameworks"] == 2
+    # Only the two Privacy Act files fall within the recent window
+    assert document["recent"]["jurisdictions"] == 2
+    assert document["recent"]["frameworks"] == 1
+    # The framework chart still shows display names
+    assert len(document["rollups"]["framework"]) == 3
@@ -0,0 +1,74 @@
+import io
+
+import pytest
+
+from site_indexes import ShardSpool, build_shards, shard_paths
+from site_packaging import dump_json
+
+
+def _summary(framework_dir, slug, country, categories):
+    return {
+        "framework_dir": framework_dir,
+        "slug": slug,
+        "country_info": {"framework": framework_dir.upper(), "name": country},
+        "categories": [
+            {"name": name, "type": "personal", "subtype": None, "tags": [], "regulations": regulations,
+             "required_masking": True, "risk_level": "high"}
+            for name, regulations in categories
+        ],
+    }
+
+
+SUMMARIES = [
+    _summary("gdpr", "france", "France", [("Health Data", ["Art. 9"]), ("Email", ["art 9", "art-9-2"])]),
+    _summary("gdpr", "spain", "Spain", [("Health Data", ["Art. 9"])]),
+]
+
+
+def test_colliding_slugs_are_numbered():
+    paths = dict(shard_paths(["Art. 9", "art 9", "art-9-2"], "regulation"))
+    assert paths == {
+        "art 9": "index/regulation/art-9.json",
+        "art-9-2": "index/regulation/art-9-2.json",
+        "Art. 9": "index/regulation/art-9-3.json",
+    }
+
+
+def test_shards_and_catalog():
+    files = build_shards(SUMMARIES)
+
+    shard = files["index/regulation/art-9-3.json"]
+    assert (shard["value"], shard["count"]) == ("Art. 9", 2)
+    assert [(e["country_id"], e["category"]) for e in shard["entries"]] == [("france", "Health Data"), ("spain", "Health Data")]
+    assert shard["entries"][0]["json"] == "json/gdpr/france.json"
+
+    catalog = files["index/index.json"]["shards"]["regulation"]
+    assert catalog == {
+        "art 9": {"count": 1, "path": "json/index/regulation/art-9.json"},
+        "art-9-2": {"count": 1, "path": "json/index/regulation/art-9-2.json"},
+        "Art. 9": {"count": 2, "path": "json/index/regulation/art-9-3.json"},
+    }
+    assert files["index/type/personal.json"]["count"] == 3
+
+
+@pytest.mark.parametrize("minify", [False, True])
+def test_spool_writes_the_same_files(tmp_path, minify):
+    spool = ShardSpool(tmp_path / "spool", minify=minify, buffer_limit=2)
+    for summary in SUMMARIES:
+        spool.add(summary, summary["categories"])
+
+    written = {}
+
+    class Output(io.StringIO):
+        def __init__(self, path):
+            super().__init__()
+            self.path = path
+
+        def close(self):
+            written[self.path] = self.getvalue()
+            super().close()
+
+    paths = spool.write(Output)
+    expected = {path: dump_json(document, minify) + "\n" for path, document in build_shards(SUMMARIES).items()}
+    assert sorted(paths) == sorted(expected)
+    assert written == expected
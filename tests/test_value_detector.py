@@ -0,0 +1,32 @@
+import pytest
+
+from value_detector import ValueDetector
+
+
+@pytest.mark.parametrize("text", [
+    "NL91 ABNA 0417 1643 00",
+    "GB29 NWBK 6016 1331 9268 19",
+    "DE89 3704 0044 0532 0130 00",
+    "NL91ABNA0417164300",
+])
+def test_iban(text):
+    assert [(d.pattern, d.value) for d in ValueDetector().detect(text)] == [("iban", text)]
+
+
+def test_spaced_iban_in_text():
+    detections = ValueDetector().detect("Refund to GB29 NWBK 6016 1331 9268 19, thanks")
+    assert [(d.pattern, d.value) for d in detections] == [("iban", "GB29 NWBK 6016 1331 9268 19")]
+
+
+def test_iban_with_bad_checksum():
+    assert ValueDetector().detect("NL92 ABNA 0417 1643 00") == []
+
+
+@pytest.mark.parametrize("text", ["1.2.3.4.5", "10.0.0.1.2", "5.1.2.3.4", "release 10.0.0.1.2 is out"])
+def test_ipv4_inside_longer_dotted_number(text):
+    assert [d for d in ValueDetector().detect(text) if d.pattern == "ipv4"] == []
+
+
+@pytest.mark.parametrize("text", ["192.168.0.1", "from 192.168.0.1.", "10.0.0.1:8080"])
+def test_ipv4(text):
+    assert [d.pattern for d in ValueDetector().detect(text)] == ["ipv4"]